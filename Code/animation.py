@@ -0,0 +1,37 @@
+from collections import deque
+
+"""
+Animacje siłowników (ramię, chwytak, panele) jako generatory - każdy yield to jedna klatka,
+po której świat ma zrobić sim.step(). Dzięki temu Rover.tick może przesuwać animację
+o jedną klatkę na globalny krok symulacji, a wiele łazików animuje się równolegle.
+"""
+
+# play whole animation, stepping simulation after every frame (old blocking behaviour)
+def run_blocking(sim, frames):
+    for _ in frames:
+        sim.step()
+
+
+class AnimationQueue:
+    # animations played one after another, one frame per step()
+    def __init__(self):
+        self.queue_ = deque()
+
+    def add(self, frames):
+        self.queue_.append(frames)
+
+    def busy(self):
+        return bool(self.queue_)
+
+    def clear(self):
+        self.queue_.clear()
+
+    # advance current animation by one frame, returns False if there was nothing to play
+    def step(self):
+        while self.queue_:
+            try:
+                next(self.queue_[0])
+                return True
+            except StopIteration:
+                self.queue_.popleft()
+        return False
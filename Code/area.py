@@ -1,23 +1,52 @@
-import time 
+# create_areas.py is run from Code/ (prepare_sim.py), without package prefix
+try:
+    from Code.field_store import FieldStore
+except ImportError:
+    from field_store import FieldStore
+
+# attribute backed by column of FieldStore
+def _column(name):
+    def get(self):
+        return float(getattr(self.store_, name)[self.index_])
+
+    def set(self, value):
+        getattr(self.store_, name)[self.index_] = value
+
+    return property(get, set)
 
 class Area:
+    x = _column('x_')
+    y = _column('y_')
+    z = _column('z_')
+    humidity = _column('humidity_')
+    pH = _column('pH_')
+    temperature = _column('temperature_')
+    last_visited_time = _column('last_visited_time_')
+
     def __init__(self, x, y, z, humidity, pH, microbiome, temperature, mineral_composition,
-                 name=None, handle=None, last_visited_time=None): # Dodane opcjonalne parametry
-        self.x = x
-        self.y = y
-        self.z = z
-        self.humidity = humidity
-        self.pH = pH
+                 name=None, handle=None, last_visited_time=None, store=None): # Dodane opcjonalne parametry
+        # Parametry liczbowe w kolumnach FieldStore (wspólny magazyn Centrali albo własny)
+        self.store_ = store if store is not None else FieldStore(capacity=1)
+        self.index_ = self.store_.add(name, x, y, z, humidity, pH, temperature,
+                                      last_visited_time if last_visited_time is not None else 0.0, # czas ostatniej wizyty
+                                      handle != -1)
         self.microbiome = microbiome
-        self.temperature = temperature
         self.mineral_composition = mineral_composition
 
         # Atrybuty używane przez Centralę (lub inne moduły)
         self.name = name
         self.handle = handle # Handle obiektu w CoppeliaSim
-        self.last_visited_time = last_visited_time if last_visited_time is not None else 0.0 # czas ostatniej wizyty
         self.target_params = {} # Słownik na docelowe parametry zadania (np. {'target_humidity': 70})
 
+    @property
+    def handle(self):
+        return self.handle_
+
+    @handle.setter
+    def handle(self, value):
+        self.handle_ = value
+        self.store_.active_[self.index_] = value != -1
+
     def __str__(self):
         extra_info = ""
         if self.name:
@@ -26,12 +55,13 @@ class Area:
             extra_info += f"Handle: {self.handle}\n"
         if self.last_visited_time > 0:
 
-            extra_info += f"Last Visited: {time.ctime(self.last_visited_time)}\n"
-        
+            # clock time in seconds (simulation time with SimClock)
+            extra_info += f"Last Visited: {self.last_visited_time:.1f} s\n"
+
         return (f"Area ({self.x}, {self.y}, {self.z})\n"
                 f"{extra_info}"
                 f"Humidity: {self.humidity}%\n"
                 f"pH: {self.pH}\n"
                 f"Microbiome: {self.microbiome}\n"
                 f"Temperature: {self.temperature}°C\n"
-                f"Mineral Composition: {self.mineral_composition}")
\ No newline at end of file
+                f"Mineral Composition: {self.mineral_composition}")
@@ -0,0 +1,163 @@
+import argparse
+import math
+import random
+import time
+import numpy as np
+from Code.rrt_star import load_config, create_planner, plan_with_retries
+from Code.occupancy_map import OccupancyMap
+from Code.collision_checker import CollisionChecker
+
+"""
+Benchmark planera bez CoppeliaSim (sim=None). Dla zadanego ziarna scenariusze są
+powtarzalne, każdy to lista przeszkód [(x,y,r), ...] i kolejnych celów, łazik zaczyna
+przy centrali i jedzie od celu do celu jak przy kolejnych zadaniach:
+    fields      -> centrala i pola z siatki 3x3 (create_areas.generate_areas)
+    rocks       -> jak fields + losowo rozrzucone skały
+    exploration -> jak rocks, cele z siatki punktów ±4.4 m (initiate_remapping_procedure)
+Wynik: percentyle czasu planowania, skuteczność (ścieżka bez kolizji kończąca się przy celu),
+długość ścieżki i liczba węzłów.
+
+Uruchomienie: python -m Code.benchmark_planner --backend array informed --seed 0
+"""
+
+# same radii as in Centrala
+CENTRALA_RADIUS = 0.75
+FIELD_RADIUS = 0.7
+ROCK_RADIUS = 0.5
+
+# field centres like in create_areas.generate_areas (3x3 grid, centrala in the middle)
+def field_grid(rows=3, cols=3, spacing=3.0):
+    start_x = -((cols - 1) * spacing) / 2
+    start_y = -((rows - 1) * spacing) / 2
+    return [(start_x + col * spacing, start_y + row * spacing) for row in range(rows) for col in range(cols) if not (row == rows // 2 and col == cols // 2)]
+
+# exploration points like in Centrala.initiate_remapping_procedure
+def exploration_points(min_xy=-4.4, max_xy=4.4, step=0.2):
+    coords = [round(i * step, 2) for i in range(int(min_xy / step), int(max_xy / step) + 1)]
+    return [(x, y) for x in coords for y in coords if not (-1 < x < 1 and -1 < y < 1)]
+
+# rocks placed randomly, not overlapping centrala, fields and each other
+def rock_layout(rng, count, static, bound=4.4):
+    rocks = []
+    while len(rocks) < count:
+        x, y = rng.uniform(-bound, bound), rng.uniform(-bound, bound)
+        if all(math.hypot(x - ox, y - oy) > r + ROCK_RADIUS + 0.3 for ox, oy, r in static + rocks):
+            rocks.append((x, y, ROCK_RADIUS))
+    return rocks
+
+# scenario -> (obstacles, goals), deterministic for given seed
+def make_scenario(name, seed, goals=20, rocks=12):
+    rng = random.Random(seed)
+    obstacles = [(0.0, 0.0, CENTRALA_RADIUS)] + [(x, y, FIELD_RADIUS) for x, y in field_grid()]
+    if name == 'fields':
+        targets = [rng.choice(field_grid()) for _ in range(goals)]
+    elif name == 'rocks':
+        obstacles += rock_layout(rng, rocks, obstacles)
+        targets = [rng.choice(field_grid()) for _ in range(goals)]
+    elif name == 'exploration':
+        obstacles += rock_layout(rng, rocks, obstacles)
+        # points inside obstacles are never reachable, skip them like explore tasks near fields
+        free = [point for point in exploration_points() if all(math.hypot(point[0] - x, point[1] - y) > r for x, y, r in obstacles[len(field_grid()) + 1:])]
+        targets = rng.sample(free, goals)
+    else:
+        raise ValueError(f"Unknown scenario: {name}")
+    return obstacles, targets
+
+# number of nodes in planner tree / roadmap
+def node_count(planner):
+    if hasattr(planner, 'count_'):
+        return planner.count_
+    if hasattr(planner, 'node_list_'):
+        return len(planner.node_list_)
+    if getattr(planner, 'roadmap_', None) is not None:
+        return int(planner.roadmap_.alive_.sum())
+    return 0
+
+# path valid if it ends at goal and misses obstacles (except ones containing start or goal, like in planner)
+def path_valid(path, start, goal, obstacles, goal_radius):
+    if path is None or len(path) < 1:
+        return False
+    points = np.array([point[:2] for point in path], dtype=float)
+    if math.hypot(points[-1, 0] - goal[0], points[-1, 1] - goal[1]) >= goal_radius + 1e-9:
+        return False
+    blocking = [(x, y, r) for x, y, r in obstacles if math.hypot(start[0] - x, start[1] - y) > r and math.hypot(goal[0] - x, goal[1] - y) > r]
+    if len(points) < 2:
+        return True
+    return not CollisionChecker(blocking).segments_collide(points[:-1], points[1:]).any()
+
+def run_scenario(config, name, seed, goals=20, rocks=12, use_map=True, retries=15):
+    random.seed(seed)
+    np.random.seed(seed)
+    obstacles, targets = make_scenario(name, seed, goals, rocks)
+    planner = create_planner(None, [0, 0], [0, 0], [], config)
+    if use_map:
+        planner.set_occupancy_map(OccupancyMap(obstacles, config['map_size_lb'], config['map_size_ub'], config.get('occupancy_resolution', 0.05)))
+        planner_obstacles = []
+    else:
+        planner_obstacles = obstacles
+    start = (1.0, 0.0)
+    times, lengths, nodes = [], [], []
+    successes = 0
+    for goal in targets:
+        t = time.perf_counter()
+        path = plan_with_retries(planner, start, goal, planner_obstacles, retries)
+        times.append(time.perf_counter() - t)
+        nodes.append(node_count(planner))
+        if path_valid(path, start, goal, obstacles, config['goal_radius']):
+            successes += 1
+            points = np.array(path, dtype=float)
+            lengths.append(float(np.hypot(*np.diff(points, axis=0).T).sum()) if len(points) > 1 else 0.0)
+            start = tuple(path[-1][:2])
+    times = np.array(times)
+    return {
+        'scenario': name,
+        'backend': config.get('backend', 'node'),
+        'queries': len(targets),
+        'success_rate': successes / len(targets),
+        'time_p50': float(np.percentile(times, 50)),
+        'time_p90': float(np.percentile(times, 90)),
+        'time_p99': float(np.percentile(times, 99)),
+        'time_max': float(times.max()),
+        'path_length': float(np.mean(lengths)) if lengths else math.nan,
+        'nodes': float(np.mean(nodes)),
+    }
+
+def run_benchmark(backends, scenarios, seeds, overrides=None, **kwargs):
+    results = []
+    for backend in backends:
+        config = dict(load_config(), **(overrides or {}), backend=backend)
+        for name in scenarios:
+            for seed in seeds:
+                # sampler and roadmap seeded too, informed refinement is still time limited
+                seeded = dict(config, sampling_seed=seed, prm_seed=seed)
+                result = run_scenario(seeded, name, seed, **kwargs)
+                result['seed'] = seed
+                results.append(result)
+    return results
+
+def print_results(results):
+    header = f"{'backend':<10}{'scenario':<13}{'seed':>5}{'success':>9}{'p50[ms]':>9}{'p90[ms]':>9}{'p99[ms]':>9}{'max[ms]':>9}{'length':>8}{'nodes':>8}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['backend']:<10}{r['scenario']:<13}{r['seed']:>5}{r['success_rate']:>9.2f}"
+              f"{r['time_p50'] * 1000:>9.1f}{r['time_p90'] * 1000:>9.1f}{r['time_p99'] * 1000:>9.1f}{r['time_max'] * 1000:>9.1f}"
+              f"{r['path_length']:>8.2f}{r['nodes']:>8.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark planera ścieżek bez symulatora")
+    parser.add_argument('--backend', nargs='+', default=[load_config().get('backend', 'node')], help="node | array | informed | prm")
+    parser.add_argument('--scenario', nargs='+', default=['fields', 'rocks', 'exploration'])
+    parser.add_argument('--seed', type=int, nargs='+', default=[0, 1, 2])
+    parser.add_argument('--goals', type=int, default=20, help="liczba zapytań w scenariuszu")
+    parser.add_argument('--rocks', type=int, default=12, help="liczba skał w scenariuszach rocks/exploration")
+    parser.add_argument('--sampler', help="nadpisuje sampler z konfiguracji")
+    parser.add_argument('--no-map', action='store_true', help="planowanie na liście przeszkód zamiast mapy zajętości")
+    args = parser.parse_args()
+    overrides = {'sampler': args.sampler} if args.sampler else {}
+    results = run_benchmark(args.backend, args.scenario, args.seed, overrides, goals=args.goals, rocks=args.rocks, use_map=not args.no_map)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,19 @@ import time
 import threading
 import random
 import math
-import csv
-from coppeliasim_zmqremoteapi_client import RemoteAPIClient
 from Code.rrt_star_visualise import visualise_obstacles
 from Code.area import Area
+from Code.field_store import FieldStore
+from Code.field_scheduler import FieldScheduler
+from Code.occupancy_map import OccupancyMap
+from Code.obstacle_registry import ObstacleRegistry
+from Code.rrt_star import load_config
+from Code.sim_clock import WallClock, Interval
+from Code.task_board import TaskBoard, locked_tasks, locked_fields
+from Code.task_assignment import assignment_costs, assign_tasks, ASSIGNMENT_METHODS
+from Code.rover_state import ActivityState
+from Code.exploration_planner import camera_footprint, lane_cover, plan_exploration_routes
+from Code.task_log_writer import TaskLogWriter
 from datetime import datetime
 import os
 
@@ -17,15 +26,46 @@ CRITICAL_PH_HIGH = 8.2
 MAX_SECONDS_SINCE_LAST_VISIT = 100
 FIELD_RADIUS_FOR_OBSTACLES = 0.7
 ROVER_RADIUS_FOR_OBSTACLES = 0.5
+CENTRALA_RADIUS_FOR_OBSTACLES = 0.75
+ROCK_RADIUS_FOR_OBSTACLES = 0.5
+MAIN_LOOP_PERIOD_SECS = 2
+# Zmiany parametrów pól na cykl pętli centrali
+HUMIDITY_DECAY_PER_CYCLE = 0.05
+PH_NOISE_PER_CYCLE = 0.01
 
 class Centrala:
     # Dodany parametr start_with_mapping_phase
-    def __init__(self, sim_client, start_with_mapping_phase=False):
+    def __init__(self, sim_client, start_with_mapping_phase=False, clock=None):
         self.sim = sim_client.require('sim')
+        # Zegar (WallClock - własny wątek, SimClock - tick() wywoływany z pętli głównej)
+        self.clock = clock if clock is not None else WallClock()
+        self.loop_interval = Interval(self.clock, MAIN_LOOP_PERIOD_SECS)
         self.fields = {}
+        # Parametry pól w kolumnach numpy, obiekty Area w self.fields są widokami na wiersze
+        self.field_store = FieldStore()
+        # Terminy przekroczenia progów pól (kopiec), zadania utrzymania tylko dla pól z minionym terminem
+        self.field_scheduler = FieldScheduler(self.field_store, MAIN_LOOP_PERIOD_SECS, HUMIDITY_DECAY_PER_CYCLE, PH_NOISE_PER_CYCLE,
+                                              CRITICAL_HUMIDITY, CRITICAL_PH_LOW, CRITICAL_PH_HIGH, MAX_SECONDS_SINCE_LAST_VISIT)
         self.rovers = {}
-        self.task_queue = []
+        # Tablica zadań z osobnymi blokadami dla zadań i pól (pętla centrali i łaziki w różnych wątkach)
+        self.task_board = TaskBoard()
+        # Kopiec zadań z indeksami pole -> zadania i pole -> łazik
+        self.task_queue = self.task_board.queue_
+        # Zadania przydzielone wolnym łazikom w ostatniej paczce, odbierane przy ich kolejnym zapytaniu
+        self.reservations = self.task_board.reservations_
+        config = load_config()
+        self.assignment_method = config.get('assignment_method', 'hungarian')
+        if self.assignment_method not in ASSIGNMENT_METHODS:
+            raise ValueError(f"Unknown assignment method: {self.assignment_method}")
+        self.assignment_candidates = config.get('assignment_candidates', 32)
+        self.assignment_priority_weight = config.get('assignment_priority_weight', 5.0)
+        self.assignment_battery_weight = config.get('assignment_battery_weight', 1.0)
+        self.exploration_config = config
+        self.exploration_strategy = config.get('exploration_strategy', 'coverage')
         self.obstacle_list = []
+        self.occupancy_map = None
+        # Wspólny rejestr przeszkód ze sceny (dla centrali i łazików)
+        self.obstacle_registry = ObstacleRegistry(self.sim, {'Centrala': CENTRALA_RADIUS_FOR_OBSTACLES, 'Rock': ROCK_RADIUS_FOR_OBSTACLES})
         
         self.running = True
         self.next_task_id = 0
@@ -34,7 +74,6 @@ class Centrala:
         self.mapping_phase_active = start_with_mapping_phase
         self.initial_mapping_tasks_generated = False # Pomocnicza flaga
 
-        self.task_log = []
         self.initialize_task_log_csv()
 
         print("[Centrala] Inicjalizacja...")
@@ -47,10 +86,17 @@ class Centrala:
             self._load_fields_from_scene()
             self._initialize_static_obstacles() # Dodanie załadowanych pól do listy przeszkód
 
-        self.simulation_thread = threading.Thread(target=self._main_loop)
-        self.simulation_thread.daemon = True
-        self.simulation_thread.start()
-        print("[Centrala] Główna pętla uruchomiona.")
+        self._load_scene_obstacles()
+        self._build_occupancy_map()
+
+        self.simulation_thread = None
+        if self.clock.stepped:
+            print("[Centrala] Główna pętla wywoływana co krok symulacji (tick).")
+        else:
+            self.simulation_thread = threading.Thread(target=self._main_loop)
+            self.simulation_thread.daemon = True
+            self.simulation_thread.start()
+            print("[Centrala] Główna pętla uruchomiona.")
 
     def _get_new_task_id(self):
         self.next_task_id += 1
@@ -112,7 +158,8 @@ class Centrala:
                     data["minerals"],
                     name=name,                       
                     handle=handle,                   
-                    last_visited_time=time.time()    
+                    last_visited_time=self.clock.now(),
+                    store=self.field_store
                 )
 
                 self.fields[name] = area_obj
@@ -139,6 +186,34 @@ class Centrala:
         # self.obstacle_list.append({'x': -10, 'y': 0, 'radius': 1, 'type': 'border', 'id': 'border_west'})
 
 
+    def _load_scene_obstacles(self):
+        # Centrala i skały (Rock[i]) ze sceny jako przeszkody statyczne, z rejestru przeszkód
+        entries = self.obstacle_registry.entries()
+        for entry in entries:
+            self.obstacle_list.append({'x': entry['x'], 'y': entry['y'], 'radius': entry['radius'], 'type': entry['alias'].lower(), 'id': entry['id']})
+        if not any(entry['alias'] == 'Centrala' for entry in entries):
+            print("[Centrala] Ostrzeżenie: Nie znaleziono obiektu /Centrala w scenie.")
+        print(f"[Centrala] Załadowano {len(entries)} przeszkód ze sceny.")
+
+    def _build_occupancy_map(self):
+        # Mapa zajętości ze wszystkich przeszkód poza łazikami, wspólna dla planerów wszystkich łazików
+        config = load_config()
+        static_obstacles = [(obs['x'], obs['y'], obs['radius']) for obs in self.obstacle_list if obs.get('type') != 'rover']
+        self.occupancy_map = OccupancyMap(static_obstacles, config['map_size_lb'], config['map_size_ub'], config.get('occupancy_resolution', 0.05))
+        print(f"[Centrala] Zbudowano mapę zajętości z {len(static_obstacles)} przeszkód statycznych.")
+
+    def get_dynamic_obstacles_for_rover(self, requesting_rover_id):
+        # Pozostałe łaziki jako okręgi, pozycja z ostatniego kroku ich RoverMover (bez zapytań do symulatora)
+        dynamic_obstacles = []
+        for rover_id, rover_info in self.rovers.items():
+            if rover_id == requesting_rover_id:
+                continue
+            mover = getattr(rover_info['object'], 'mover', None)
+            position = mover.pos if mover is not None else rover_info['position']
+            dynamic_obstacles.append((position[0], position[1], ROVER_RADIUS_FOR_OBSTACLES))
+        return dynamic_obstacles
+
+    @locked_fields
     def _update_rover_obstacle_position(self, rover_id, new_x, new_y):
         found = False
         for obs in self.obstacle_list:
@@ -150,6 +225,7 @@ class Centrala:
         if not found:
             self.obstacle_list.append({'x': new_x, 'y': new_y, 'radius': ROVER_RADIUS_FOR_OBSTACLES, 'type': 'rover', 'id': rover_id})
 
+    @locked_fields
     def get_current_obstacle_list_for_rover(self, requesting_rover_id):
         obs_for_planner = []
         for obs in self.obstacle_list:
@@ -158,6 +234,7 @@ class Centrala:
             obs_for_planner.append((obs['x'], obs['y'], obs['radius']))
         return obs_for_planner
 
+    @locked_tasks
     def register_rover(self, rover_id, rover_object_instance, rover_state_instance, initial_position):
         if rover_id not in self.rovers:
             self.rovers[rover_id] = {
@@ -174,6 +251,7 @@ class Centrala:
         else:
             print(f"[Centrala] Łazik {rover_id} jest już zarejestrowany.")
 
+    @locked_tasks
     def update_rover_info(self, rover_id, position, status, battery_level, task_queue_len=0):
         if rover_id in self.rovers:
             self.rovers[rover_id]['position'] = position
@@ -184,19 +262,26 @@ class Centrala:
         else:
             print(f"[Centrala] Ostrzeżenie: Próba aktualizacji info dla niezarejestrowanego łazika {rover_id}")
             
+    @locked_tasks
     def request_new_task_for_rover(self, rover_id):
-        if not self.task_queue:
+        # Zadania zarezerwowane dla łazików, które nie mogą ich już podjąć, wracają do kolejki (także gdy jest pusta)
+        self._release_stale_reservations(rover_id)
+        if not self.task_queue and rover_id not in self.reservations:
             return None 
 
         if rover_id not in self.rovers or self.rovers[rover_id]['status'] not in ['idle', 'returning']: 
             # print(f"[Centrala] Łazik {rover_id} nie jest gotowy na nowe zadanie (status: {self.rovers[rover_id].get('status', 'NIEZNANY')}).")
             return None
 
-        # Prosta logika FIFO, można by dodać priorytetyzację zadań eksploracyjnych, jeśli są wymieszane
-        task_to_assign = self.task_queue.pop(0) 
+        # Zadanie zarezerwowane w ostatnim przydziale, inaczej nowy przydział dla wszystkich wolnych łazików
+        reserved = self.reservations.pop(rover_id, None)
+        task_to_assign = reserved[2] if reserved is not None else self._assign_tasks(rover_id)
+        if task_to_assign is None:
+            return None
         
         self.rovers[rover_id]['current_task_id'] = task_to_assign['id']
         self.rovers[rover_id]['current_task_target_field_name'] = task_to_assign['field_name'] 
+        self.task_queue.assign(task_to_assign['field_name'], rover_id)
         self.rovers[rover_id]['status'] = 'assigned_task'
 
         self.rovers[rover_id]['current_task_data'] = task_to_assign
@@ -206,20 +291,90 @@ class Centrala:
         task_to_assign['assignment_time'] = assignment_time
         
         target_field_obj = self.fields.get(task_to_assign['field_name'])
-        if not target_field_obj and task_to_assign['type'] != 'explore_point': 
+        if not target_field_obj and task_to_assign['type'] not in ('explore_point', 'explore_route'): 
             print(f"[Centrala] Błąd: Pole {task_to_assign['field_name']} dla zadania {task_to_assign['id']} nie istnieje!")
-            self.task_queue.insert(0, task_to_assign) 
+            self.task_queue.release(task_to_assign['field_name'], rover_id)
+            self.task_queue.push_front(task_to_assign)
             self.rovers[rover_id]['current_task_id'] = None
             self.rovers[rover_id]['current_task_target_field_name'] = None 
             self.rovers[rover_id]['status'] = 'idle'
             return None
         
-        if task_to_assign['type'] != 'explore_point': 
+        if task_to_assign['type'] not in ('explore_point', 'explore_route'): 
             task_to_assign['target_coords'] = (target_field_obj.x, target_field_obj.y, target_field_obj.z)
         
         print(f"[Centrala] Przypisano zadanie {task_to_assign['id']} ({task_to_assign['type']} dla {task_to_assign.get('field_name', task_to_assign.get('details',{}).get('target_coords_explore'))}) do łazika {rover_id}.")
         return task_to_assign
 
+    def _rover_position(self, rover_info):
+        mover = getattr(rover_info['object'], 'mover', None)
+        return mover.pos if mover is not None else rover_info['position']
+
+    def _rover_battery(self, rover_info):
+        state = getattr(rover_info['object'], 'state', None)
+        if state is not None:
+            return state.battery().charge()
+        return rover_info.get('battery_level', 100)
+
+    # Łazik czeka na zadanie (nie ładuje się i nie pracuje)
+    def _rover_ready(self, rover_info):
+        if rover_info['status'] not in ['idle', 'returning'] or rover_info['current_task_id'] is not None:
+            return False
+        state = getattr(rover_info['object'], 'state', None)
+        return state is None or (state.activity_state() == ActivityState.IDLE and not state.is_forced_idle())
+
+    def _task_position(self, task):
+        if task['type'] == 'explore_point':
+            return task['details']['target_coords_explore']
+        if task['type'] == 'explore_route':
+            return task['details']['route'][0]
+        field_obj = self.fields.get(task['field_name'])
+        # zadanie bez pola (pozycja centrali) jest obsłużone jako błąd w request_new_task_for_rover
+        return (field_obj.x, field_obj.y) if field_obj else (0, 0)
+
+    # Niewykorzystane rezerwacje wracają do kolejki na swoje miejsce
+    def _release_reservations(self):
+        for rover_id, entry in self.reservations.items():
+            self.task_queue.release(entry[2]['field_name'], rover_id)
+        self.task_queue.restore(list(self.reservations.values()))
+        self.reservations.clear()
+
+    # Rezerwacje innych łazików, które przestały czekać na zadanie (rozładowane, ładowanie) wracają do kolejki
+    def _release_stale_reservations(self, rover_id):
+        stale = [other for other in self.reservations if other != rover_id and not self._rover_ready(self.rovers[other])]
+        for other in stale:
+            entry = self.reservations.pop(other)
+            self.task_queue.release(entry[2]['field_name'], other)
+            self.task_queue.restore([entry])
+
+    # Przydział paczki zadań z początku kolejki wszystkim wolnym łazikom, zwraca zadanie pytającego łazika
+    def _assign_tasks(self, rover_id):
+        if self.assignment_method == 'fifo':
+            return self.task_queue.pop()
+        self._release_reservations()
+        rover_ids = [rover_id] + [other for other, info in self.rovers.items() if other != rover_id and self._rover_ready(info)]
+        entries = self.task_queue.take(max(self.assignment_candidates, len(rover_ids)))
+        if not entries:
+            return None
+        tasks = [entry[2] for entry in entries]
+        costs = assignment_costs([self._rover_position(self.rovers[other]) for other in rover_ids],
+                                 [self._rover_battery(self.rovers[other]) for other in rover_ids],
+                                 [self._task_position(task) for task in tasks],
+                                 [task.get('priority', 1) for task in tasks],
+                                 self.assignment_priority_weight, self.assignment_battery_weight)
+        assigned = {col: rover_ids[row] for row, col in assign_tasks(costs, self.assignment_method)}
+        self.task_queue.restore([entry for col, entry in enumerate(entries) if col not in assigned])
+        task_for_rover = None
+        for col, other in assigned.items():
+            if other == rover_id:
+                task_for_rover = tasks[col]
+            else:
+                self.reservations[other] = entries[col]
+                self.task_queue.assign(tasks[col]['field_name'], other)
+        return task_for_rover
+
+    @locked_tasks
+    @locked_fields
     def report_task_completed(self, rover_id, task_id, success, field_data_after_work=None):
         if rover_id not in self.rovers:
             print(f"[Centrala] Niezarejestrowany łazik {rover_id} próbuje raportować zadanie.")
@@ -249,7 +404,8 @@ class Centrala:
             'Numer pola': field_name,
             'Łazik': rover_id,
             'Czas wystawienia': assignment_time,
-            'Czas zrealizowania': completion_time
+            'Czas zrealizowania': completion_time,
+            'Czas dodania': self.rovers[rover_id]['current_task_data'].get('enqueue_time', 'N/A')
         }
         self.log_task_to_csv(task_data_for_csv)
 
@@ -264,6 +420,8 @@ class Centrala:
 
         rover_info['status'] = 'idle' 
         rover_info['current_task_id'] = None
+        finished_field_name = rover_info['current_task_target_field_name']
+        self.task_queue.release(finished_field_name, rover_id)
         rover_info['current_task_target_field_name'] = None 
 
         if success and field_data_after_work:
@@ -276,7 +434,8 @@ class Centrala:
                 field_obj.temperature = field_data_after_work.get('temperature', field_obj.temperature)
                 minerals_key = 'minerals' if 'minerals' in field_data_after_work else 'mineral_composition'
                 field_obj.mineral_composition = field_data_after_work.get(minerals_key, field_obj.mineral_composition)
-                field_obj.last_visited_time = time.time()
+                field_obj.last_visited_time = self.clock.now()
+                self._rearm_field(field_name)
                 print(f"[Centrala] Zaktualizowano parametry dla pola {field_name} po pracy łazika {rover_id}.")
                 
                 soil_data_to_write = {
@@ -311,107 +470,128 @@ class Centrala:
                 # Łazik powinien zgłosić, dlaczego się nie udało. Centrala może potem podjąć decyzję.
                 pass
 
+        # Pole po obsłudze (łazik zmienia jego parametry) dostaje nowe terminy w harmonogramie
+        self._rearm_field(finished_field_name)
+
 
     def _main_loop(self):
         while self.running:
-            current_time = time.time()
-
-            # Logika dla fazy mapowania
-            if self.mapping_phase_active:
-                if not self.initial_mapping_tasks_generated:
+            self.tick()
+            # Sen do następnego cyklu albo najbliższego terminu pola
+            wake = self.loop_interval.next_due()
+            if not self.mapping_phase_active:
+                with self.task_board.fields_lock_:
+                    wake = min(wake, self.field_scheduler.next_deadline())
+            time.sleep(min(max(wake - self.clock.now(), 0.01), MAIN_LOOP_PERIOD_SECS))
+
+    # Z zegarem symulacji: wywoływane w pętli głównej po każdym kroku, pełna iteracja co MAIN_LOOP_PERIOD_SECS czasu symulacji,
+    # między iteracjami tylko zadania pól, których termin już minął (np. czas od ostatniej wizyty)
+    def tick(self):
+        if not self.running:
+            return
+        if self.loop_interval.due():
+            if not self._loop_iteration(self.clock.now()):
+                self.running = False
+        elif not self.mapping_phase_active:
+            self._generate_tasks(self.clock.now())
+
+    # Jedna iteracja pętli centrali, zwraca False gdy scenariusz się zakończył
+    def _loop_iteration(self, current_time):
+        # Logika dla fazy mapowania
+        if self.mapping_phase_active:
+            if not self.initial_mapping_tasks_generated:
+                # Trasy pokrycia są dzielone między łaziki, więc czekamy na ich rejestrację
+                if self.exploration_strategy == 'grid' or self.rovers:
                     self.initiate_remapping_procedure() # Użyj tej samej funkcji do generowania zadań eksploracji
                     self.initial_mapping_tasks_generated = True
-                
-                # Sprawdź, czy faza mapowania dobiegła końca
-                no_explore_tasks_in_queue = not any(task['type'] == 'explore_point' for task in self.task_queue)
+            
+            # Sprawdź, czy faza mapowania dobiegła końca
+            with self.task_board.lock_:
+                no_explore_tasks_in_queue = self.task_queue.count_type('explore_point') == 0 and self.task_queue.count_type('explore_route') == 0 and not self.reservations
                 no_rovers_exploring = not any(
                     rover_info.get('current_task_id') and
                     # Potrzebujemy dostępu do typu zadania, które łazik wykonuje
                     # Załóżmy, że łazik przechowuje `current_task` i możemy to odpytać (lub centrala trzyma kopię)
                     # Prostsze: jeśli `current_task_target_field_name` zaczyna się od "explore_point_"
-                    (rover_info.get('current_task_target_field_name', '').startswith("explore_point_"))
+                    (rover_info.get('current_task_target_field_name', '').startswith(("explore_point_", "explore_route_")))
                     for rover_info in self.rovers.values()
                 )
 
-                if no_explore_tasks_in_queue and no_rovers_exploring and self.initial_mapping_tasks_generated : # Upewnij się, że zadania były wygenerowane
-                    if not self.fields: # Jeśli po mapowaniu nie ma żadnych pól, coś poszło nie tak.
-                        print("[Centrala] Faza mapowania zakończona, ale nie odkryto żadnych pól. Sprawdź logi łazików i detekcję markerów.")
-                        # Można by spróbować ponownie, albo zatrzymać, albo przejść do trybu czuwania.
-                        # Na razie przechodzimy dalej, ale z ostrzeżeniem.
-                    else:
-                        print(f"[Centrala] Faza mapowania zakończona. Odkryto {len(self.fields)} pól. Wyświetlam pozycje na mapie.")
-                        temp_counter = 0
-                        for name, field in self.fields.items():
-                            print(f"[Centrala] Pole: {name} na pozycji: {field.x},{field.y}")
-                            visualise_obstacles(self.sim, [field.x, field.y], temp_counter)
-                            temp_counter+=1
-                    self.mapping_phase_active = False
-                    self.initial_mapping_tasks_generated = False # Reset na wypadek ponownego mapowania
-                    print("[Centrala] Koniec scenariusza.")
-                    return
-                    # Po zakończeniu mapowania, można zainicjalizować przeszkody na nowo,
-                    # jeśli `report_discovered_field` nie dodawał ich dynamicznie.
-                    # Ale obecna `report_discovered_field` dodaje, więc to jest OK.
-                    # self._initialize_static_obstacles() # Jeśli przeszkody nie były dodawane na bieżąco
-            
-            else: # Normalny tryb operacyjny (nie faza mapowania)
-                # 1. Symulacja degradacji parametrów pól (tylko jeśli są pola)
-                if self.fields:
-                    for field_name, field_obj in self.fields.items():
-                        if field_obj.handle != -1: 
-                            field_obj.humidity = max(0, round(field_obj.humidity - 0.05, 2)) 
-                            field_obj.pH = round(field_obj.pH + random.uniform(-0.01, 0.01), 2) 
-                
-                # 2. Generowanie zadań utrzymania
-                self._generate_tasks(current_time)
+            if no_explore_tasks_in_queue and no_rovers_exploring and self.initial_mapping_tasks_generated : # Upewnij się, że zadania były wygenerowane
+                if not self.fields: # Jeśli po mapowaniu nie ma żadnych pól, coś poszło nie tak.
+                    print("[Centrala] Faza mapowania zakończona, ale nie odkryto żadnych pól. Sprawdź logi łazików i detekcję markerów.")
+                    # Można by spróbować ponownie, albo zatrzymać, albo przejść do trybu czuwania.
+                    # Na razie przechodzimy dalej, ale z ostrzeżeniem.
+                else:
+                    print(f"[Centrala] Faza mapowania zakończona. Odkryto {len(self.fields)} pól. Wyświetlam pozycje na mapie.")
+                    temp_counter = 0
+                    for name, field in self.fields.items():
+                        print(f"[Centrala] Pole: {name} na pozycji: {field.x},{field.y}")
+                        visualise_obstacles(self.sim, [field.x, field.y], temp_counter)
+                        temp_counter+=1
+                self.mapping_phase_active = False
+                self.initial_mapping_tasks_generated = False # Reset na wypadek ponownego mapowania
+                print("[Centrala] Koniec scenariusza.")
+                return False
+                # Po zakończeniu mapowania, można zainicjalizować przeszkody na nowo,
+                # jeśli `report_discovered_field` nie dodawał ich dynamicznie.
+                # Ale obecna `report_discovered_field` dodaje, więc to jest OK.
+                # self._initialize_static_obstacles() # Jeśli przeszkody nie były dodawane na bieżąco
+        
+        else: # Normalny tryb operacyjny (nie faza mapowania)
+            # 1. Symulacja degradacji parametrów pól (tylko jeśli są pola)
+            # (jeden przebieg na kolumnach magazynu pól, pola z handle -1 pomijane)
+            with self.task_board.fields_lock_:
+                self.field_store.degrade(HUMIDITY_DECAY_PER_CYCLE, PH_NOISE_PER_CYCLE)
             
-            time.sleep(2) 
+            # 2. Generowanie zadań utrzymania
+            self._generate_tasks(current_time)
+        return True
 
     def _generate_tasks(self, current_time):
         # Nie generuj zadań utrzymania podczas fazy mapowania
         if self.mapping_phase_active:
             return
 
-        if not self.fields: # Jeśli nie ma pól, nie ma co generować zadań utrzymania
-            return
-
-        for field_name, field_obj in self.fields.items():
-            # Sprawdź, czy już istnieje aktywne zadanie lub zadanie w kolejce dla tego pola
-            task_in_queue_for_field = any(
-                task['field_name'] == field_name for task in self.task_queue
-            )
-            
-            task_assigned_to_rover_for_field = any(
-                # Sprawdzamy, czy current_task_target_field_name łazika pasuje
-                # ORAZ czy łazik faktycznie ma przypisane zadanie (current_task_id is not None)
-                rover_info.get('current_task_target_field_name') == field_name and
-                rover_info.get('current_task_id') is not None # Dodatkowe zabezpieczenie
-                for rover_info in self.rovers.values()
-            )
-
-            if task_in_queue_for_field or task_assigned_to_rover_for_field:
-                # print(f"[Centrala DEBUG] Zadanie dla {field_name} już w kolejce lub przypisane. Pomijam generowanie nowego.")
-                continue
-
-            # Zadanie: Niska wilgotność
-            if field_obj.humidity < CRITICAL_HUMIDITY:
+        # Pola, których termin w harmonogramie minął (nowe pola dostają terminy przy pierwszym wywołaniu)
+        next_cycle = self.loop_interval.next_due()
+        with self.task_board.fields_lock_:
+            self.field_scheduler.sync(current_time, next_cycle)
+            due = self.field_scheduler.due(current_time, next_cycle)
+            triggered = [(self.field_store.names_[index], index, task_type) for index, task_type in due]
+
+        for field_name, index, task_type in triggered:
+            # Jedno zadanie na pole, dodawane tylko gdy pole nie ma zadania w kolejce ani przypisanego
+            if task_type == 'restore_humidity':
+                # Zadanie: Niska wilgotność
                 task_details = {'target_humidity': random.uniform(60,75)} # Docelowa wilgotność
-                self.add_task_to_queue(field_name, 'restore_humidity', task_details, priority=1) # Normalny priorytet
-                continue # Jedno zadanie na pole na cykl generowania
-
-            # Zadanie: Nieprawidłowe pH
-            if field_obj.pH < CRITICAL_PH_LOW or field_obj.pH > CRITICAL_PH_HIGH:
+                task = self.add_task_to_queue(field_name, 'restore_humidity', task_details, priority=1, only_if_free=True) # Normalny priorytet
+            elif task_type == 'adjust_pH':
+                # Zadanie: Nieprawidłowe pH
                 target_ph = 7.0 # Dążymy do neutralnego
                 task_details = {'target_pH': target_ph}
-                self.add_task_to_queue(field_name, 'adjust_pH', task_details, priority=1)
-                continue
-            
-            # Zadanie: Wizyta kontrolna z powodu długiego braku odwiedzin
-            if (current_time - field_obj.last_visited_time) > MAX_SECONDS_SINCE_LAST_VISIT:
-                self.add_task_to_queue(field_name, 'visit_scan', {}, priority=2) # Niższy priorytet dla skanowania
-                continue
+                task = self.add_task_to_queue(field_name, 'adjust_pH', task_details, priority=1, only_if_free=True)
+            else:
+                # Zadanie: Wizyta kontrolna z powodu długiego braku odwiedzin
+                task = self.add_task_to_queue(field_name, 'visit_scan', {}, priority=2, only_if_free=True) # Niższy priorytet dla skanowania
+            if task is None:
+                # Pole zajęte, sprawdzenie w następnym cyklu
+                with self.task_board.fields_lock_:
+                    self.field_scheduler.retry(index, next_cycle)
+
+    # Nowe terminy pola po jego obsłudze lub zmianie parametrów
+    def _rearm_field(self, field_name):
+        field_obj = self.fields.get(field_name)
+        if field_obj is None:
+            return
+        with self.task_board.fields_lock_:
+            self.field_scheduler.rearm(field_obj.index_, self.clock.now(), self.loop_interval.next_due())
     
-    def add_task_to_queue(self, field_name, task_type, details, priority=1):
+    # only_if_free: zadanie dodawane tylko, gdy pole nie ma zadania w kolejce ani przypisanego (sprawdzane pod blokadą)
+    @locked_tasks
+    def add_task_to_queue(self, field_name, task_type, details, priority=1, only_if_free=False):
+        if only_if_free and not self.task_board.is_free(field_name):
+            return None
         new_task_id = self._get_new_task_id()
         task = {
             'id': new_task_id,
@@ -420,19 +600,25 @@ class Centrala:
             'details': details,
             'priority': priority,
             'status': 'queued', 
-            'added_time': time.time()
+            'added_time': self.clock.now(),
+            # same clock as assignment and completion times in task log (queueing latency)
+            'enqueue_time': self.sim.getSimulationTime()
         }
         
         target_description = field_name
         if task_type == 'explore_point' and 'target_coords_explore' in details:
             target_description = f"punktu eksploracji {details['target_coords_explore']}"
+        elif task_type == 'explore_route' and 'route' in details:
+            target_description = f"trasy eksploracji ({len(details['route'])} punktów)"
 
-        self.task_queue.append(task)
-        # Sortowanie kolejki po priorytecie (mniejsza wartość = wyższy priorytet)
-        self.task_queue.sort(key=lambda t: t.get('priority', 1))
+        # Kopiec po priorytecie (mniejsza wartość = wyższy priorytet)
+        self.task_queue.push(task)
         print(f"[Centrala] Dodano zadanie {new_task_id} ({task_type}, prio: {priority}) dla {target_description} do kolejki. Długość kolejki: {len(self.task_queue)}")
+        return task
 
 
+    @locked_tasks
+    @locked_fields
     def initiate_remapping_procedure(self):
         print("[Centrala] Inicjacja procedury generowania zadań eksploracyjnych...")
         # Parametry siatki eksploracji
@@ -443,7 +629,13 @@ class Centrala:
         # Usuń stare zadania typu 'explore_point' (jeśli są, na wypadek ponownego mapowania)
         # Ale tylko jeśli to nie jest pierwsze generowanie w fazie mapowania
         if not (self.mapping_phase_active and not self.initial_mapping_tasks_generated):
-            self.task_queue = [t for t in self.task_queue if t.get('type') != 'explore_point']
+            self._release_reservations()
+            self.task_queue.remove_type('explore_point')
+            self.task_queue.remove_type('explore_route')
+
+        if self.exploration_strategy == 'coverage':
+            self._generate_exploration_routes((min_x, min_y), (max_x, max_y))
+            return
 
         num_explore_tasks = 0
         for x_coord in [round(i * step,2) for i in range(int(min_x / step), int(max_x / step) + 1)]:
@@ -465,7 +657,7 @@ class Centrala:
                 # Nazwa pola dla zadań eksploracyjnych może być generowana
                 pseudo_field_name = f"explore_point_{x_coord:.1f}_{y_coord:.1f}"
                 # Sprawdź, czy zadanie o tym samym celu (pseudo_field_name) już nie jest w kolejce
-                if any(t['field_name'] == pseudo_field_name and t['type'] == 'explore_point' for t in self.task_queue):
+                if self.task_queue.has_field(pseudo_field_name, 'explore_point'):
                     continue
 
                 self.add_task_to_queue(pseudo_field_name, 'explore_point', details, priority=0) # Wyższy priorytet (0)
@@ -477,6 +669,32 @@ class Centrala:
             print(f"[Centrala] Nie dodano nowych zadań eksploracyjnych (być może wszystkie punkty są blisko znanych pól lub siatka jest pusta).")
 
 
+    # Zasięg boczny pasa (low, high) z modelu kamery pierwszego łazika z detektorem, inaczej symetryczny z konfiguracji
+    def _exploration_lane_cover(self):
+        config = self.exploration_config
+        for rover_info in self.rovers.values():
+            detector = getattr(rover_info['object'], 'detector', None)
+            if detector is not None:
+                footprint = camera_footprint(detector.camera_matrix_, detector.t_camera_rover_, config.get('exploration_rover_height', 0.375),
+                                             config.get('exploration_marker_height', 0.25))
+                return lane_cover(footprint, config.get('exploration_marker_margin', 0.15))
+        spacing = config.get('exploration_lane_spacing', 0.5)
+        return -spacing / 2, spacing / 2
+
+    # Jedna trasa pokrycia (explore_route) na łazik, pasy omijają znane przeszkody i pola
+    def _generate_exploration_routes(self, lower_bound, upper_bound):
+        cover = self._exploration_lane_cover()
+        rover_ids = list(self.rovers)
+        positions = [self._rover_position(self.rovers[rover_id]) for rover_id in rover_ids] or [(0, 0)]
+        checker = self.occupancy_map.checker() if self.occupancy_map is not None else None
+        routes = plan_exploration_routes(positions, lower_bound, upper_bound, cover, checker,
+                                         self.exploration_config.get('exploration_sample_step', 0.1),
+                                         waypoint_step=self.exploration_config.get('exploration_waypoint_step', 1.0))
+        for index, route in sorted(routes.items()):
+            self.add_task_to_queue(f"explore_route_{index}", 'explore_route', {'route': route}, priority=0)
+        print(f"[Centrala] Dodano {len(routes)} tras eksploracji (pasy średnio co {cover[1] - cover[0]:.2f} m, {sum(len(route) for route in routes.values())} punktów).")
+
+    @locked_fields
     def report_discovered_field(self, rover_id, marker_id, detected_position_world, field_parameters_from_scan):
         discovered_field_name = f"Field_{marker_id}"
         path_to_object = f"/{discovered_field_name}" # Use path notation
@@ -495,7 +713,8 @@ class Centrala:
             
             field_obj.humidity = field_parameters_from_scan.get('humidity', field_obj.humidity)
             field_obj.pH = field_parameters_from_scan.get('pH', field_obj.pH)
-            field_obj.last_visited_time = time.time()
+            field_obj.last_visited_time = self.clock.now()
+            self._rearm_field(discovered_field_name)
             
             # Update obstacle list if necessary
             found_in_obstacles = False
@@ -537,6 +756,7 @@ class Centrala:
                     
                     self.sim.setShapeColor(shape_handle, None, self.sim.colorcomponent_ambient_diffuse, [0.2, 0.6, 0.2])
                     handle_for_new_field = shape_handle
+                    self.obstacle_registry.invalidate() # Scena się zmieniła
                     print(f"[Centrala] Stworzono obiekt {discovered_field_name} w symulacji z uchwytem {handle_for_new_field}.")
                 except Exception as e:
                     print(f"[Centrala] Błąd podczas tworzenia obiektu {discovered_field_name} w symulacji: {e}")
@@ -556,7 +776,8 @@ class Centrala:
                 field_parameters_from_scan.get('minerals', "Unknown"),
                 name=discovered_field_name,       
                 handle=handle_for_new_field,              
-                last_visited_time=time.time()     
+                last_visited_time=self.clock.now(),
+                store=self.field_store
             )
             self.fields[discovered_field_name] = new_area_obj
             
@@ -576,42 +797,34 @@ class Centrala:
                     print(f"[Centrala] Błąd podczas zapisu SoilData dla nowego pola {discovered_field_name}: {e}")
 
             self.obstacle_list.append({'x': new_area_obj.x, 'y': new_area_obj.y, 'radius': FIELD_RADIUS_FOR_OBSTACLES, 'type': 'field', 'id': discovered_field_name})
+            if self.occupancy_map is not None:
+                self.occupancy_map.add_obstacle(new_area_obj.x, new_area_obj.y, FIELD_RADIUS_FOR_OBSTACLES)
             print(f"[Centrala] Dodano nowe pole {discovered_field_name} do rejestru i listy przeszkód.")
 
 
     def stop(self):
         print("[Centrala] Zatrzymywanie...")
         self.running = False
-        if self.simulation_thread.is_alive():
+        if self.simulation_thread is not None and self.simulation_thread.is_alive():
             self.simulation_thread.join(timeout=5) 
+        # Zapis pozostałych wierszy logu zadań
+        self.task_log_writer.close()
         print("[Centrala] Zatrzymana.")
 
     def initialize_task_log_csv(self):
+        config = load_config()
+        log_format = config.get('task_log_format', 'csv')
         current_time = datetime.now().strftime("%H-%M-%S")
-        self.task_log_filename = f"task_log_{current_time}.csv"
-        self.task_log = []  # Do logowania danych w pamięci (jeśli chcesz)
-    
-        with open(self.task_log_filename, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([
-                "Numer zadania", "Nazwa zadania", "Numer pola", 
-                "Łazik", "Czas wystawienia", "Czas zrealizowania"
-            ])
+        self.task_log_filename = f"task_log_{current_time}.{log_format}"
+        # Wiersze zbierane w pamięci i zapisywane paczkami w osobnym wątku
+        self.task_log_writer = TaskLogWriter(self.task_log_filename, log_format,
+                                             config.get('task_log_flush_rows', 64), config.get('task_log_flush_interval', 5.0))
         
-        print(f"[Centrala] Utworzono nowy plik CSV do logowania zadań: {self.task_log_filename}")
+        print(f"[Centrala] Utworzono nowy plik logu zadań: {self.task_log_filename}")
 
     def log_task_to_csv(self, task_data):
-        if not hasattr(self, 'task_log_filename'):
-            print("[Centrala] Błąd: Plik CSV nie został zainicjalizowany.")
+        if not hasattr(self, 'task_log_writer'):
+            print("[Centrala] Błąd: Log zadań nie został zainicjalizowany.")
             return
         
-        with open(self.task_log_filename, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([
-                task_data['Numer zadania'],
-                task_data['Nazwa zadania'],
-                task_data['Numer pola'],
-                task_data['Łazik'],
-                task_data['Czas wystawienia'],
-                task_data['Czas zrealizowania']
-            ])
+        self.task_log_writer.write(task_data)
@@ -0,0 +1,102 @@
+import math
+import numpy as np
+
+"""
+Sprawdzanie kolizji punktów i odcinków (krawędzi drzewa) z listą przeszkód [(x,y,r), ...]
+jednym przebiegiem numpy. Dla dużej liczby przeszkód można włączyć broadphase -
+siatkę komórek, w której każda przeszkoda jest wpisana do komórek pokrywanych przez jej okrąg.
+"""
+
+class CollisionChecker:
+    def __init__(self, obstacle_list, broadphase_threshold=None, cell_size=1.0):
+        self.obstacles_ = np.array([obstacle[:3] for obstacle in obstacle_list], dtype=float).reshape(-1, 3)
+        self.cell_size_ = cell_size
+        self.grid_ = None
+        if broadphase_threshold is not None and len(self.obstacles_) >= broadphase_threshold:
+            self._build_grid()
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size_), math.floor(y / self.cell_size_)
+
+    def _build_grid(self):
+        cells = {}
+        for index, (x, y, r) in enumerate(self.obstacles_):
+            x_lb, y_lb = self._cell(x - r, y - r)
+            x_ub, y_ub = self._cell(x + r, y + r)
+            for i in range(x_lb, x_ub + 1):
+                for j in range(y_lb, y_ub + 1):
+                    cells.setdefault((i, j), []).append(index)
+        self.grid_ = {cell: np.array(indices) for cell, indices in cells.items()}
+
+    # obstacles which may touch given bounding box
+    def _candidates(self, x_min, y_min, x_max, y_max):
+        if self.grid_ is None:
+            return self.obstacles_
+        x_lb, y_lb = self._cell(x_min, y_min)
+        x_ub, y_ub = self._cell(x_max, y_max)
+        # box bigger than whole grid, cheaper to test everything
+        if (x_ub - x_lb + 1) * (y_ub - y_lb + 1) > len(self.grid_):
+            return self.obstacles_
+        indices = [self.grid_[(i, j)] for i in range(x_lb, x_ub + 1) for j in range(y_lb, y_ub + 1) if (i, j) in self.grid_]
+        if not indices:
+            return self.obstacles_[:0]
+        return self.obstacles_[np.unique(np.concatenate(indices))]
+
+    # points -> (m, 2), returns bool mask (m,)
+    def points_collide(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if not len(points):
+            return np.zeros(0, dtype=bool)
+        obstacles = self._candidates(*points.min(axis=0), *points.max(axis=0))
+        if not len(obstacles):
+            return np.zeros(len(points), dtype=bool)
+        dx = points[:, 0, None] - obstacles[None, :, 0]
+        dy = points[:, 1, None] - obstacles[None, :, 1]
+        return np.any(dx * dx + dy * dy <= obstacles[None, :, 2] ** 2, axis=1)
+
+    def point_collides(self, x, y):
+        obstacles = self._candidates(x, y, x, y)
+        dx = obstacles[:, 0] - x
+        dy = obstacles[:, 1] - y
+        return bool(np.any(dx * dx + dy * dy <= obstacles[:, 2] ** 2))
+
+    # segments starts -> (m, 2), ends -> (m, 2) or single (2,), returns bool mask (m,)
+    def segments_collide(self, starts, ends):
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.broadcast_to(np.asarray(ends, dtype=float), starts.shape)
+        if not len(starts):
+            return np.zeros(0, dtype=bool)
+        both = np.concatenate([starts, ends])
+        obstacles = self._candidates(*both.min(axis=0), *both.max(axis=0))
+        if not len(obstacles):
+            return np.zeros(len(starts), dtype=bool)
+        # closest point on each segment to each obstacle centre
+        direction = ends - starts
+        length_sq = np.einsum('ij,ij->i', direction, direction)
+        to_centre = obstacles[None, :, :2] - starts[:, None, :]
+        t = np.einsum('mkj,mj->mk', to_centre, direction) / np.where(length_sq > 0, length_sq, 1.0)[:, None]
+        t = np.clip(t, 0.0, 1.0)
+        closest = starts[:, None, :] + t[:, :, None] * direction[:, None, :]
+        offset = obstacles[None, :, :2] - closest
+        distance_sq = np.einsum('mkj,mkj->mk', offset, offset)
+        return np.any(distance_sq <= obstacles[None, :, 2] ** 2, axis=1)
+
+    # single segment version without batch broadcasting overhead
+    def segment_collides(self, x0, y0, x1, y1):
+        obstacles = self._candidates(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        if not len(obstacles):
+            return False
+        dx, dy = x1 - x0, y1 - y0
+        length_sq = dx * dx + dy * dy
+        t = ((obstacles[:, 0] - x0) * dx + (obstacles[:, 1] - y0) * dy) / (length_sq if length_sq > 0 else 1.0)
+        t = np.clip(t, 0.0, 1.0)
+        offset_x = obstacles[:, 0] - (x0 + t * dx)
+        offset_y = obstacles[:, 1] - (y0 + t * dy)
+        return bool(np.any(offset_x * offset_x + offset_y * offset_y <= obstacles[:, 2] ** 2))
+
+
+# create checker with broadphase params from config, with occupancy map obstacle_list are only dynamic obstacles
+def create_checker(obstacle_list, config, occupancy_map=None, free_points=()):
+    if occupancy_map is not None:
+        return occupancy_map.checker(obstacle_list, free_points)
+    return CollisionChecker(obstacle_list, config.get('broadphase_threshold'), config.get('broadphase_cell_size', 1.0))
@@ -2,11 +2,6 @@ import logging
 import math
 import threading
 
-from coppeliasim_zmqremoteapi_client import RemoteAPIClient
-
-client = RemoteAPIClient()
-sim = client.require("sim")
-
 def singleton(cls):
     instances = {}
 
@@ -26,20 +21,32 @@ class DayNightCycle:
     LINEAR_ATTENUATION_HIGH = 10 # Dark
     LIGHT_LABEL = "/DefaultLights/Sun"
 
-    def __init__(self):
-        client = RemoteAPIClient()
-        self._sim = client.require("sim")
-        self._light_handle = sim.getObject(self.LIGHT_LABEL)
+    # sim of first caller is used (singleton), without it a new RemoteAPIClient connection is opened
+    # with stepped clock (SimClock) there is no thread, moment follows simulation time
+    def __init__(self, sim=None, clock=None):
+        if sim is None:
+            from coppeliasim_zmqremoteapi_client import RemoteAPIClient
+            sim = RemoteAPIClient().require("sim")
+        self._sim = sim
+        self._light_handle = self._sim.getObject(self.LIGHT_LABEL)
 
         self._moment = 0
         self._brightness = None
         self._linear_attenuation = None
 
-        self._update_thread = threading.Thread(target=self.__update_cb)
+        self._clock = clock if clock is not None and clock.stepped else None
+        if self._clock is not None:
+            self._start_time = self._clock.now()
+            self._updates = 0
+            self.__sync()
+            return
+
+        self._update_thread = threading.Thread(target=self.__update_cb, daemon=True)
         self._update_thread_stop_event = threading.Event()
         self._update_thread.start()
 
     def is_day(self):
+        self.__sync()
         return self._brightness >= 0.4
 
     def is_night(self):
@@ -53,20 +60,32 @@ class DayNightCycle:
             self.__update()
             self._update_thread_stop_event.wait(self.UPDATE_PERIOD_SECS)
 
+    # same moments as thread updates, one per UPDATE_PERIOD_SECS of clock time
+    def __sync(self):
+        if self._clock is None:
+            return
+        updates = int((self._clock.now() - self._start_time) / self.UPDATE_PERIOD_SECS + 1e-9) + 1
+        if updates != self._updates:
+            self._updates = updates
+            self._moment = (updates * self.UPDATE_PERIOD_SECS) % self.DAY_DURATION_SECS
+            self.__apply()
+
     def __update(self):
+        self._moment = (self._moment + self.UPDATE_PERIOD_SECS) % self.DAY_DURATION_SECS
+        self.__apply()
+
+    def __apply(self):
         # prev_moment = self._moment
         # prev_brightness = self._brightness
         # prev_linear_attenuation = self._linear_attenuation
 
-        self._moment = (self._moment + self.UPDATE_PERIOD_SECS) % self.DAY_DURATION_SECS
-
         day_fraction = self._moment / self.DAY_DURATION_SECS
         self._brightness = (math.cos(day_fraction * 2 * math.pi - math.pi) + 1) / 2
         self._linear_attenuation = (
             self.LINEAR_ATTENUATION_HIGH
             * (self.LINEAR_ATTENUATION_LOW / self.LINEAR_ATTENUATION_HIGH) ** self._brightness
         )
-        sim.setFloatArrayProperty(
+        self._sim.setFloatArrayProperty(
             self._light_handle,
             "attenuationFactors",
             self.__get_attenuation_list(self._linear_attenuation),
@@ -88,6 +107,9 @@ if __name__ == "__main__":
         datefmt="%H:%M:%S",
     )
 
+    from coppeliasim_zmqremoteapi_client import RemoteAPIClient
+    sim = RemoteAPIClient().require("sim")
+
     # Start simulation
     sim.startSimulation()
-    DayNightCycle()
+    DayNightCycle(sim)
@@ -0,0 +1,118 @@
+import numpy as np
+from Code.task_assignment import assign_tasks
+
+"""
+Planowanie eksploracji w fazie mapowania na podstawie pola widzenia kamery łazika.
+Zamiast zadania explore_point w każdym oczku siatki 0.2 m obszar jest pokrywany
+pasami (boustrophedon) o szerokości śladu kamery na płaszczyźnie markerów (z modelu
+kamery MarkerDetector, pomniejszonego o margines, aby cały marker zmieścił się w kadrze).
+Ślad nie jest symetryczny względem osi łazika, a na nawrotach kierunek jazdy się odwraca,
+więc każdy pas ma stały kierunek jazdy (na przemian +x i -x), a odstępy między pasami
+są na przemian różne tak, aby pokryte fragmenty sąsiednich pasów stykały się.
+Łazik skanuje w trakcie jazdy, więc punkty trasy to końce wolnych odcinków pasów i punkty
+pośrednie co waypoint_step, po których łazik jedzie prosto wzdłuż pasa (bez bocznego
+znoszenia ścieżki RRT* poza szerokość pasa).
+Pasy są dzielone na ciągłe grupy o podobnej długości, każdy łazik dostaje jedną
+trasę (zadanie explore_route) zaczynającą się w najbliższym mu rogu swojej grupy.
+"""
+
+# (x_min, x_max, y_min, y_max) of plane at plane_height (e.g. markers on fields) seen by camera, in rover frame
+def camera_footprint(camera_matrix, t_camera_rover, rover_height, plane_height=0.0):
+    camera_matrix = np.asarray(camera_matrix, dtype=float)
+    t_camera_rover = np.asarray(t_camera_rover, dtype=float)
+    width, height = 2 * camera_matrix[0, 2], 2 * camera_matrix[1, 2]
+    pixels = np.array([[0, 0, 1], [width, 0, 1], [width, height, 1], [0, height, 1]], dtype=float)
+    rays = t_camera_rover[:3, :3] @ (np.linalg.inv(camera_matrix) @ pixels.T)
+    origin = t_camera_rover[:3, 3]
+    # plane is rover_height - plane_height below rover origin
+    scale = (plane_height - rover_height - origin[2]) / rays[2]
+    if np.any(scale <= 0):
+        raise ValueError("Camera does not see the marker plane")
+    corners = origin[:2, None] + rays[:2] * scale
+    # rectangle inside the (trapezoid) footprint
+    xs, ys = np.sort(corners[0]), np.sort(corners[1])
+    return xs[1], xs[2], ys[1], ys[2]
+
+# (low, high) lateral offsets from rover axis where whole marker is visible, rover frame
+def lane_cover(footprint, marker_margin):
+    _, _, y_min, y_max = footprint
+    low, high = float(y_min + marker_margin), float(y_max - marker_margin)
+    if low >= high:
+        raise ValueError("Camera footprint smaller than marker")
+    if low >= 0 or high <= 0:
+        raise ValueError("Camera footprint does not cover rover axis")
+    return low, high
+
+# free segments of lanes along x, [(y, [(x_start, x_end), ...], forward), ...] ordered by y;
+# lane driven towards +x (forward) covers y + [low, high], towards -x covers y - [high, low]
+def coverage_lanes(lower_bound, upper_bound, cover, checker=None, sample_step=0.1):
+    (min_x, min_y), (max_x, max_y) = lower_bound[:2], upper_bound[:2]
+    low, high = cover
+    # first lane covers from border, gaps alternate so that covered stripes touch
+    lane_ys = []
+    y, forward = min_y - low, True
+    while True:
+        lane_ys.append((y, forward))
+        covered_to = y + high if forward else y - low
+        if covered_to >= max_y:
+            break
+        y, forward = y + (2 * high if forward else -2 * low), not forward
+    xs = np.linspace(min_x, max_x, max(int(np.ceil((max_x - min_x) / sample_step)) + 1, 2))
+    lanes = []
+    for y, forward in lane_ys:
+        # lanes outside map (first may be) moved to border
+        y = min(max(y, min_y), max_y)
+        free = np.ones(len(xs), dtype=bool)
+        if checker is not None:
+            free = ~checker.points_collide(np.column_stack([xs, np.full(len(xs), y)]))
+        # runs of free samples
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], free.astype(int), [0]])))
+        segments = [(float(xs[start]), float(xs[end - 1])) for start, end in zip(edges[::2], edges[1::2])]
+        if segments:
+            lanes.append((float(y), segments, forward))
+    return lanes
+
+def _lane_length(lane):
+    return sum(end - start for start, end in lane[1])
+
+# split lanes into parts contiguous groups with similar total length
+def partition_lanes(lanes, parts):
+    parts = max(1, min(parts, len(lanes)))
+    lengths = np.cumsum([_lane_length(lane) + 1e-9 for lane in lanes])
+    cuts = [int(np.searchsorted(lengths, lengths[-1] * i / parts)) for i in range(1, parts)]
+    bounds = [0] + [cut + 1 for cut in cuts] + [len(lanes)]
+    groups = [lanes[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    return [group for group in groups if group]
+
+# x of segment ends and points in between, at most waypoint_step apart
+def segment_waypoints(start, end, waypoint_step=None):
+    if not waypoint_step:
+        return [start, end]
+    count = max(int(np.ceil((end - start) / waypoint_step)), 1)
+    return [float(x) for x in np.linspace(start, end, count + 1)]
+
+# serpentine waypoints through group, every lane driven in its own direction
+def boustrophedon_route(group, reverse_lanes=False, z=0.25, waypoint_step=None):
+    route = []
+    lanes = group[::-1] if reverse_lanes else group
+    for y, segments, forward in lanes:
+        points = [(x, y, z) for start, end in segments for x in segment_waypoints(start, end, waypoint_step)]
+        route.extend(points if forward else points[::-1])
+    return route
+
+# route from group end nearest to position
+def best_route(group, position, z=0.25, waypoint_step=None):
+    routes = [boustrophedon_route(group, reverse_lanes, z, waypoint_step) for reverse_lanes in (False, True)]
+    return min(routes, key=lambda route: np.hypot(route[0][0] - position[0], route[0][1] - position[1]))
+
+# one route per rover, {rover index: [(x, y, z), ...]}
+def plan_exploration_routes(rover_positions, lower_bound, upper_bound, cover, checker=None, sample_step=0.1, z=0.25, waypoint_step=None):
+    lanes = coverage_lanes(lower_bound, upper_bound, cover, checker, sample_step)
+    groups = partition_lanes(lanes, len(rover_positions))
+    if not groups:
+        return {}
+    # rovers matched to groups by distance to group centre
+    centres = [(np.mean([x for _, segments, _ in group for segment in segments for x in segment]), np.mean([y for y, _, _ in group])) for group in groups]
+    positions = np.asarray(rover_positions, dtype=float)[:, :2]
+    costs = np.hypot(positions[:, None, 0] - np.array(centres)[None, :, 0], positions[:, None, 1] - np.array(centres)[None, :, 1])
+    return {row: best_route(groups[col], rover_positions[row], z, waypoint_step) for row, col in assign_tasks(costs)}
@@ -0,0 +1,121 @@
+import heapq
+import itertools
+import math
+
+"""
+Harmonogram zadań utrzymania pól sterowany zdarzeniami zamiast sprawdzania wszystkich
+pól co cykl. Dla każdego pola (wiersz FieldStore) w kopcu są terminy:
+    humidity - cykl, w którym wilgotność spadnie poniżej progu (spadek stały na cykl)
+    ph       - najwcześniejszy cykl, w którym losowe zmiany pH mogą wyjść poza zakres
+               (odległość od granicy / maksymalna zmiana na cykl), wtedy sprawdzenie
+    visit    - chwila przekroczenia maksymalnego czasu od ostatniej wizyty
+Termin jest tylko wskazówką, przy wyzwoleniu warunek jest sprawdzany na aktualnych
+wartościach pola, a jeśli nie jest spełniony, termin jest liczony od nowa. Po obsłudze
+pola (rearm) stare terminy są unieważniane numerem wersji pola.
+"""
+
+class FieldScheduler:
+    def __init__(self, store, cycle_period, humidity_step, ph_noise, critical_humidity, ph_low, ph_high, max_seconds_since_visit):
+        self.store_ = store
+        self.cycle_period_ = cycle_period
+        self.humidity_step_ = humidity_step
+        # random step plus rounding of pH to 0.01
+        self.ph_step_ = ph_noise + 0.005
+        self.critical_humidity_ = critical_humidity
+        self.ph_low_ = ph_low
+        self.ph_high_ = ph_high
+        self.max_seconds_since_visit_ = max_seconds_since_visit
+        # (deadline, order, field index, kind, field version)
+        self.heap_ = []
+        self.counter_ = itertools.count()
+        self.versions_ = []
+
+    def __len__(self):
+        return len(self.heap_)
+
+    # earliest deadline (inf when empty)
+    def next_deadline(self):
+        return self.heap_[0][0] if self.heap_ else math.inf
+
+    # arm fields added to store since last call
+    def sync(self, now, next_cycle):
+        while len(self.versions_) < len(self.store_):
+            self.versions_.append(0)
+            self._arm(len(self.versions_) - 1, now, next_cycle)
+
+    # field was serviced or changed, old deadlines dropped and new ones computed
+    def rearm(self, index, now, next_cycle):
+        if index >= len(self.versions_):
+            return
+        self.versions_[index] += 1
+        self._arm(index, now, next_cycle)
+
+    # field got a task, no deadlines until rearm
+    def disarm(self, index):
+        self.versions_[index] += 1
+
+    def _push(self, deadline, index, kind):
+        if math.isfinite(deadline):
+            heapq.heappush(self.heap_, (deadline, next(self.counter_), index, kind, self.versions_[index]))
+
+    def _arm(self, index, now, next_cycle):
+        for kind in ('humidity', 'ph', 'visit'):
+            self._push(self._deadline(index, kind, now, next_cycle), index, kind)
+
+    def _deadline(self, index, kind, now, next_cycle):
+        store = self.store_
+        if kind == 'visit':
+            return float(store.last_visited_time_[index]) + self.max_seconds_since_visit_
+        if kind == 'humidity':
+            humidity = store.humidity_[index]
+            if humidity < self.critical_humidity_:
+                return now
+            if not store.active_[index]:
+                return math.inf
+            # first cycle with humidity below threshold
+            cycles = math.floor((humidity - self.critical_humidity_) / self.humidity_step_ + 1e-9) + 1
+            return next_cycle + (cycles - 1) * self.cycle_period_
+        pH = store.pH_[index]
+        if pH < self.ph_low_ or pH > self.ph_high_:
+            return now
+        if not store.active_[index]:
+            return math.inf
+        # pH cannot leave range in fewer cycles than distance / max step
+        cycles = math.floor(min(pH - self.ph_low_, self.ph_high_ - pH) / self.ph_step_)
+        return next_cycle + cycles * self.cycle_period_
+
+    # task type needed by field now, checked in priority order (None if field is fine)
+    def task_type(self, index, now):
+        store = self.store_
+        if store.humidity_[index] < self.critical_humidity_:
+            return 'restore_humidity'
+        if store.pH_[index] < self.ph_low_ or store.pH_[index] > self.ph_high_:
+            return 'adjust_pH'
+        if now - store.last_visited_time_[index] > self.max_seconds_since_visit_:
+            return 'visit_scan'
+        return None
+
+    # [(field index, task type)] for deadlines up to now, fields with task are disarmed
+    def due(self, now, next_cycle):
+        tasks = []
+        while self.heap_ and self.heap_[0][0] <= now:
+            _, _, index, kind, version = heapq.heappop(self.heap_)
+            if version != self.versions_[index]:
+                continue
+            task_type = self.task_type(index, now)
+            if task_type is None and kind == 'retry':
+                self._arm(index, now, next_cycle)
+                continue
+            if task_type is None:
+                # prediction was early (e.g. pH moved back, visit at deadline), only this kind again
+                deadline = self._deadline(index, kind, now, next_cycle)
+                self._push(max(deadline, math.nextafter(now, math.inf)), index, kind)
+                continue
+            self.disarm(index)
+            tasks.append((index, task_type))
+        return tasks
+
+    # task could not be added (field busy), whole field checked again in next cycle
+    def retry(self, index, next_cycle):
+        self.versions_[index] += 1
+        self._push(next_cycle, index, 'retry')
@@ -0,0 +1,55 @@
+import numpy as np
+
+"""
+Kolumnowy magazyn parametrów pól (tablice numpy zamiast atrybutów obiektów Area).
+Area jest widokiem na jeden wiersz magazynu, więc dotychczasowy kod (field.humidity,
+field.pH, ...) działa bez zmian, a Centrala w jednym przebiegu na tablicach wykonuje
+degrade - spadek wilgotności i losowe zmiany pH wszystkich aktywnych pól.
+Terminy zadań dla pól liczy FieldScheduler na tych samych kolumnach.
+"""
+
+class FieldStore:
+    COLUMNS = ('x_', 'y_', 'z_', 'humidity_', 'pH_', 'temperature_', 'last_visited_time_')
+
+    def __init__(self, capacity=16):
+        self.size_ = 0
+        for column in self.COLUMNS:
+            setattr(self, column, np.zeros(capacity))
+        # fields with handle -1 (not in simulation) are not degraded
+        self.active_ = np.zeros(capacity, dtype=bool)
+        self.names_ = []
+        self.index_ = {}
+
+    def __len__(self):
+        return self.size_
+
+    def _grow(self):
+        capacity = max(2 * len(self.active_), 16)
+        for column in self.COLUMNS + ('active_',):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size_] = old[:self.size_]
+            setattr(self, column, new)
+
+    # new row, returns its index
+    def add(self, name, x, y, z, humidity, pH, temperature, last_visited_time=0.0, active=True):
+        if self.size_ == len(self.active_):
+            self._grow()
+        index = self.size_
+        for column, value in zip(self.COLUMNS, (x, y, z, humidity, pH, temperature, last_visited_time)):
+            getattr(self, column)[index] = value
+        self.active_[index] = active
+        self.names_.append(name)
+        if name is not None:
+            self.index_[name] = index
+        self.size_ += 1
+        return index
+
+    # humidity drops by humidity_step, pH changes by uniform noise, both rounded to 0.01
+    def degrade(self, humidity_step=0.05, ph_noise=0.01, rng=np.random):
+        n = self.size_
+        active = self.active_[:n]
+        humidity = self.humidity_[:n]
+        pH = self.pH_[:n]
+        humidity[active] = np.maximum(0, np.round(humidity[active] - humidity_step, 2))
+        pH[active] = np.round(pH[active] + rng.uniform(-ph_noise, ph_noise, int(active.sum())), 2)
@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+Harmonogram kroku całej floty łazików:
+    1. tick() każdego łazika po kolei - maszyna stanów i cała komunikacja z symulatorem
+       (jedno połączenie ZMQ), ciężkie obliczenia są tylko zlecane
+    2. run_cpu_work() łazików równolegle w puli wątków - planowanie ścieżki (find_path),
+       dekodowanie obrazu i detekcja ArUco
+    3. bariera, potem finish_tick() po kolei - przypisanie ścieżek i znalezionych markerów
+Ścieżki z usługi planowania są odbierane, gdy będą gotowe (łazik jedzie starą ścieżką).
+Z deterministic=True (przebiegi powtarzalne, np. main_headless.py --deterministic) świat
+czeka na ścieżkę łazika, który stoi bez ścieżki, a ścieżka z okresowego przeplanowania
+jest przyjmowana dokładnie replan_delay_ticks kroków po zleceniu, niezależnie od szybkości komputera.
+Potem pętla główna robi batch.flush() i sim.step().
+Wątki, nie procesy - planery i detektory trzymają referencję do sim, a numpy/scipy/cv2
+zwalniają GIL w ciężkich operacjach.
+"""
+
+class FleetScheduler:
+    def __init__(self, rovers, max_workers=None, deterministic=False, replan_delay_ticks=20):
+        self.rovers_ = rovers
+        self.deterministic_ = deterministic
+        for rover in rovers:
+            rover.defer_cpu_work = True
+            if deterministic:
+                rover.replan_delay_ticks = replan_delay_ticks
+        workers = max_workers or min(max(len(rovers), 1), os.cpu_count() or 1)
+        self.executor_ = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rover-cpu")
+
+    def tick(self):
+        for rover in self.rovers_:
+            rover.tick()
+        busy = [rover for rover in self.rovers_ if rover.has_cpu_work()]
+        futures = [self.executor_.submit(rover.run_cpu_work) for rover in busy]
+        # barrier before world step, result() re-raises worker exceptions
+        for future in futures:
+            future.result()
+        for rover in busy:
+            rover.finish_tick()
+        # only rovers standing without path block the step, waiting time does not depend on host speed
+        if self.deterministic_:
+            for rover in self.rovers_:
+                if rover.waiting_for_path:
+                    rover.wait_for_planned_path()
+
+    def shutdown(self):
+        self.executor_.shutdown(wait=True)
+        for rover in self.rovers_:
+            rover.defer_cpu_work = False
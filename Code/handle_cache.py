@@ -0,0 +1,44 @@
+"""
+Pamięć podręczna uchwytów obiektów łazika (ramię, chwytak, panele słoneczne).
+Uchwyty ścieżek '/{rover_name}/{name}' są pobierane raz (przy tworzeniu Rover) zamiast
+przy każdym wywołaniu deploy_arm / grip / deploy_solar_panels.
+Pusta nazwa oznacza sam łazik ('/{rover_name}'). Części łazika nie są usuwane ze sceny
+w trakcie symulacji, więc uchwyty nie są unieważniane.
+"""
+
+ROVER_PART_NAMES = [
+    '',
+    'ArmJoint1',
+    'ArmJoint2',
+    'ArmEndpoint',
+    'ArmEndpointLeft',
+    'ArmEndpointRight',
+    'SolarPanel_Left',
+    'SolarPanel_Right',
+]
+
+class HandleCache:
+    def __init__(self, sim, rover_name, names=()):
+        self.sim_ = sim
+        self.rover_name_ = rover_name
+        self.handles_ = {}
+        for name in names:
+            self.get(name)
+
+    def _path(self, name):
+        return f"/{self.rover_name_}/{name}" if name else f"/{self.rover_name_}"
+
+    # cached handle, resolved with sim.getObject on first use
+    def get(self, name):
+        handle = self.handles_.get(name)
+        if handle is None:
+            handle = self.sim_.getObject(self._path(name))
+            self.handles_[name] = handle
+        return handle
+
+
+# resolver for helpers which get either HandleCache or only rover name
+def handle_resolver(sim, rover_name, handles=None):
+    if handles is not None:
+        return handles.get
+    return lambda name: sim.getObject(f"/{rover_name}/{name}" if name else f"/{rover_name}")
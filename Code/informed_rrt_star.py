@@ -0,0 +1,92 @@
+import math
+import random
+import time
+import numpy as np
+from Code.rrt_star_array import RRTStarArray
+
+"""
+Informed RRT* na drzewie tablicowym (RRTStarArray). Po znalezieniu pierwszej ścieżki
+planowanie jest kontynuowane, a punkty losowane tylko z elipsy, w której może leżeć
+krótsza ścieżka (ogniska w starcie i celu, suma odległości < koszt najlepszej ścieżki).
+Poprawianie kończy się po informed_iterations iteracjach albo gdy od początku planowania
+minie informed_time_budget sekund (budżet na całe zapytanie, poprawianie dostaje tylko to,
+co zostało po pierwszej ścieżce), a wynik jest wygładzany przez skróty (shortcut_path).
+"""
+
+# greedy shortcutting, from each point jump to farthest point visible with free segment
+def shortcut_path(path, checker):
+    if path is None or len(path) < 3:
+        return path
+    points = np.array([point[:2] for point in path], dtype=float)
+    result = [path[0]]
+    i = 0
+    while i < len(points) - 1:
+        free = np.flatnonzero(~checker.segments_collide(points[i + 1:], points[i]))
+        i = i + 1 + (int(free[-1]) if len(free) else 0)
+        result.append(path[i])
+    return result
+
+class InformedRRTStar(RRTStarArray):
+    def __init__(self, sim, start, goal, obstacle_list, config=None):
+        super().__init__(sim, start, goal, obstacle_list, config)
+        self.informed_iterations_ = self.config_.get('informed_iterations', 1000)
+        self.time_budget_ = self.config_.get('informed_time_budget', 0.1)
+        self.best_cost_ = math.inf
+
+    # uniform point in ellipse with foci in start and goal for given path cost
+    def sample_informed(self, best_cost):
+        start_x, start_y = self.start_
+        goal_x, goal_y = self.goal_
+        min_cost = math.hypot(goal_x - start_x, goal_y - start_y)
+        best_cost = max(best_cost, min_cost)
+        major = best_cost / 2
+        minor = math.sqrt(best_cost ** 2 - min_cost ** 2) / 2
+        theta = math.atan2(goal_y - start_y, goal_x - start_x)
+        rho = math.sqrt(random.random())
+        phi = random.uniform(-math.pi, math.pi)
+        x = major * rho * math.cos(phi)
+        y = minor * rho * math.sin(phi)
+        return ((start_x + goal_x) / 2 + x * math.cos(theta) - y * math.sin(theta),
+                (start_y + goal_y) / 2 + x * math.sin(theta) + y * math.cos(theta))
+
+    # cheapest node in goal radius (costs may drop after rewiring)
+    def _best_goal(self, goal_nodes):
+        goal_nodes = np.array(goal_nodes)
+        costs = self.costs_[goal_nodes] + np.hypot(self.coords_[goal_nodes, 0] - self.goal_[0], self.coords_[goal_nodes, 1] - self.goal_[1])
+        best = int(np.argmin(costs))
+        return int(goal_nodes[best]), float(costs[best])
+
+    # search until first path (max_ierations_), then improve within ellipse until budget of whole query ends
+    def plan(self):
+        goal_nodes = []
+        best_index = None
+        self.best_cost_ = math.inf
+        deadline = time.perf_counter() + self.time_budget_
+        iterations = self.max_ierations_
+        i = 0
+        while i < iterations:
+            i += 1
+            if best_index is not None and time.perf_counter() > deadline:
+                break
+            target = self.generate_point() if best_index is None else self.sample_informed(self.best_cost_)
+            nearest_index = int(np.argmin(self.distances_to(target[0], target[1])))
+            new_x, new_y = self.steer(nearest_index, target)
+
+            if not self.check_edge_collision(nearest_index, new_x, new_y):
+                distances = self.distances_to(new_x, new_y)
+                neighbors = np.flatnonzero(distances <= self.search_radius_)
+                parent, cost = self.choose_parent(neighbors, distances, nearest_index, new_x, new_y)
+                new_index = self.add_node(new_x, new_y, cost, parent)
+                self.rewire(neighbors, distances, new_index)
+
+                if self.check_goal(new_x, new_y):
+                    goal_nodes.append(new_index)
+                    if best_index is None:
+                        # first solution, switch to informed sampling for rest of budget
+                        iterations = i + self.informed_iterations_
+            if goal_nodes:
+                best_index, self.best_cost_ = self._best_goal(goal_nodes)
+
+        if best_index is not None:
+            self.path_ = shortcut_path(self.generate_path(best_index), self.checker_)
+            self.goal_reached_ = True
@@ -86,14 +86,14 @@ class MarkerDetector:
         return img, markers
 
 
-    def calculate_marker_location(self, tvec, rotm):
+    def calculate_marker_location(self, tvec, rotm, rover_matrix=None):
         # Construct translation
         t_marker_camera = np.eye(4)
         t_marker_camera[:3, :3] = rotm
         t_marker_camera[:3, 3] = tvec.flatten()
 
-        # Create rover map transformation matrix
-        m = self.sim_.getObjectMatrix(self.rover_handle_, -1)
+        # Create rover map transformation matrix (rover_matrix can be read earlier, together with image)
+        m = rover_matrix if rover_matrix is not None else self.sim_.getObjectMatrix(self.rover_handle_, -1)
         t_rover_map = np.array([
         [m[0], m[4], m[8], m[3]],
         [m[1], m[5], m[9], m[7]],
@@ -0,0 +1,529 @@
+import copy
+import json
+import os
+import random
+import threading
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+"""
+Zastępstwo CoppeliaSim działające w procesie (bez GUI i ZMQ) - kinematyczna scena z tym
+podzbiorem API sim, którego używają Centrala, Rover, RoverMover, MarkerDetector,
+DayNightCycle i funkcje animacji:
+    - drzewo obiektów z aliasami, ścieżki '/Rover0/ArmJoint1' (dowolna głębokość), pozycje,
+      orientacje (kąty Eulera jak w CoppeliaSim: Rx*Ry*Rz), macierze, przeguby sferyczne
+    - bloki danych (readCustomDataBlock / writeCustomDataBlock), parametry i właściwości
+    - czas symulacji (step, getSimulationTime, getSimulationTimeStep)
+    - obraz czujnika wizyjnego renderowany z płaszczyzn pól z teksturami (model otworkowy,
+      tylko płaszczyzny i górne ściany prostopadłościanów, reszta jest niewidoczna)
+Skrypty Lua nie są wykonywane (createScript zgłasza wyjątek - SimBatch wysyła wtedy
+operacje pojedynczo). Scena startowa jak po prepare_sim: create_scene(sim, ...).
+
+Użycie:
+    client = MockClient()
+    sim = client.require('sim')
+    create_scene(sim, rovers=1)
+    centrala = Centrala(client)
+"""
+
+TEXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Textures")
+
+# rover -> camera transform, same as in MarkerDetector (5 degree tilt)
+CAMERA_IN_ROVER = np.array([
+    [0, 1, 0, 0.45066],
+    [0.9961946, 0, 0.0871557, 0.03496],
+    [0.0871557, 0, -0.9961946, 0.329],
+    [0, 0, 0, 1]])
+
+class MockObject:
+    def __init__(self, handle, alias, kind, parent=-1):
+        self.handle = handle
+        self.alias = alias
+        self.kind = kind
+        self.parent = parent
+        # pose relative to parent and extra joint transform (spherical joints)
+        self.local = np.eye(4)
+        self.joint = np.eye(4)
+        self.size = None
+        self.color = None
+        self.texture = None
+        self.uv_scaling = (1.0, 1.0)
+        self.custom_data = {}
+        self.int_params = {}
+        self.float_params = {}
+        self.properties = {}
+
+
+class MockSim:
+    # constants with the same names as in sim module (values are only ids)
+    handle_world = -1
+    handle_all = -2
+    handle_parent = -11
+    handle_scene = -12
+    primitiveshape_plane = 1
+    primitiveshape_disc = 2
+    primitiveshape_cuboid = 3
+    primitiveshape_spheroid = 4
+    primitiveshape_cylinder = 5
+    colorcomponent_ambient_diffuse = 0
+    texturemap_plane = 0
+    drawing_lines = 1
+    shapeintparam_static = 3003
+    shapeintparam_respondable = 3004
+    visionfloatparam_perspective_angle = 1004
+    scripttype_customization = 6
+
+    def __init__(self, time_step=0.05, resolution=(256, 256), perspective_angle=np.radians(60), ground_color=(150, 95, 65)):
+        self.objects_ = {}
+        self.next_handle_ = 1
+        self.textures_ = {}
+        self.drawings_ = {}
+        self.time_step_ = time_step
+        self.time_ = 0.0
+        self.steps_ = 0
+        self.running_ = False
+        self.stepping_ = False
+        self.resolution_ = list(resolution)
+        self.perspective_angle_ = perspective_angle
+        self.ground_color_ = np.array(ground_color, dtype=np.uint8)
+        self.lock_ = threading.RLock()
+
+    # -- objects --------------------------------------------------------
+
+    def _create(self, alias, kind, parent=-1):
+        with self.lock_:
+            handle = self.next_handle_
+            self.next_handle_ += 1
+            self.objects_[handle] = MockObject(handle, alias, kind, parent)
+            return handle
+
+    def _object(self, handle):
+        obj = self.objects_.get(handle)
+        if obj is None:
+            raise Exception(f"Object does not exist: {handle}")
+        return obj
+
+    def _children(self, handle):
+        return [obj.handle for obj in self.objects_.values() if obj.parent == handle]
+
+    def _descendants(self, handle):
+        result = []
+        stack = self._children(handle)
+        while stack:
+            child = stack.pop(0)
+            result.append(child)
+            stack.extend(self._children(child))
+        return result
+
+    # 'Alias[i]' -> ('Alias', i)
+    @staticmethod
+    def _split_index(part):
+        if part.endswith(']') and '[' in part:
+            alias, index = part[:-1].split('[', 1)
+            return alias, int(index)
+        return part, 0
+
+    # object path, first part is top level object, next parts are descendants at any depth
+    def getObject(self, path, options=None):
+        parts = [part for part in path.split('/') if part]
+        candidates = self._children(-1)
+        handle = None
+        for part in parts:
+            alias, index = self._split_index(part)
+            matching = [candidate for candidate in candidates if self.objects_[candidate].alias == alias]
+            if len(matching) <= index:
+                raise Exception(f"Object does not exist: {path}")
+            handle = matching[index]
+            candidates = self._descendants(handle)
+        if handle is None:
+            raise Exception(f"Object does not exist: {path}")
+        return handle
+
+    def getObjectHandle(self, path):
+        return self.getObject(path)
+
+    def isHandle(self, handle):
+        return handle in self.objects_ or handle in self.drawings_
+
+    def getObjectAlias(self, handle, options=-1):
+        return self._object(handle).alias
+
+    def setObjectAlias(self, handle, alias, options=0):
+        self._object(handle).alias = alias
+
+    def setObjectName(self, handle, name):
+        self._object(handle).alias = name
+
+    def getObjectParent(self, handle):
+        return self._object(handle).parent
+
+    def setObjectParent(self, handle, parent, keep_in_place=True):
+        obj = self._object(handle)
+        world = self._world(handle)
+        obj.parent = parent
+        if keep_in_place:
+            obj.local = np.linalg.inv(self._world(parent)) @ world @ np.linalg.inv(obj.joint)
+
+    # handles in tree, options bit 1 (2) -> only first level children
+    def getObjectsInTree(self, tree_base, object_type=-2, options=0):
+        base = -1 if tree_base == self.handle_scene else tree_base
+        if options & 2:
+            handles = self._children(base)
+        else:
+            handles = self._descendants(base)
+        if tree_base != self.handle_scene and not options & 1:
+            handles = [tree_base] + handles
+        return handles
+
+    def removeObject(self, handle):
+        with self.lock_:
+            for child in self._descendants(handle):
+                self.objects_.pop(child, None)
+            self.objects_.pop(handle, None)
+
+    def removeObjects(self, handles):
+        for handle in handles:
+            self.removeObject(handle)
+
+    # copy subtrees, returns handles of copied roots
+    def copyPasteObjects(self, handles, options=0):
+        copies = []
+        for handle in handles:
+            mapping = {}
+            for original in [handle] + self._descendants(handle):
+                obj = self.objects_[original]
+                new_handle = self._create(obj.alias, obj.kind, mapping.get(obj.parent, obj.parent))
+                new_obj = self.objects_[new_handle]
+                for name in ('local', 'joint', 'size', 'color', 'texture', 'uv_scaling', 'custom_data', 'int_params', 'float_params', 'properties'):
+                    setattr(new_obj, name, copy.deepcopy(getattr(obj, name)))
+                mapping[original] = new_handle
+            copies.append(mapping[handle])
+        return copies
+
+    def createDummy(self, size=0.01):
+        return self._create("Dummy", 'dummy')
+
+    def createPrimitiveShape(self, shape_type, sizes, options=0):
+        names = {self.primitiveshape_plane: "Plane", self.primitiveshape_cuboid: "Cuboid", self.primitiveshape_spheroid: "Sphere"}
+        handle = self._create(names.get(shape_type, "Shape"), 'shape')
+        obj = self.objects_[handle]
+        obj.size = list(sizes)
+        obj.int_params['shape_type'] = shape_type
+        return handle
+
+    def createVisionSensor(self, options=0, int_params=None, float_params=None):
+        handle = self._create("Vision_sensor", 'vision_sensor')
+        obj = self.objects_[handle]
+        obj.int_params['resolution'] = list(self.resolution_)
+        obj.float_params[self.visionfloatparam_perspective_angle] = self.perspective_angle_
+        return handle
+
+    def createScript(self, script_type, code):
+        raise Exception("MockSim does not run Lua scripts")
+
+    # -- poses ----------------------------------------------------------
+
+    def _world(self, handle):
+        if handle in (-1, None):
+            return np.eye(4)
+        obj = self._object(handle)
+        return self._world(obj.parent) @ obj.local @ obj.joint
+
+    # frame in which relative_to poses are expressed
+    def _frame(self, handle, relative_to):
+        if relative_to == self.handle_parent:
+            return self._world(self._object(handle).parent)
+        return self._world(relative_to)
+
+    def _set_world(self, handle, world):
+        obj = self._object(handle)
+        obj.local = np.linalg.inv(self._world(obj.parent)) @ world @ np.linalg.inv(obj.joint)
+
+    def getObjectPosition(self, handle, relative_to=-1):
+        pose = np.linalg.inv(self._frame(handle, relative_to)) @ self._world(handle)
+        return pose[:3, 3].tolist()
+
+    def setObjectPosition(self, handle, relative_to, position=None):
+        # old signature setObjectPosition(handle, position) is world relative
+        if position is None:
+            relative_to, position = -1, relative_to
+        frame = self._frame(handle, relative_to)
+        world = self._world(handle)
+        world[:3, 3] = (frame @ np.append(np.asarray(position[:3], dtype=float), 1.0))[:3]
+        self._set_world(handle, world)
+
+    def getObjectOrientation(self, handle, relative_to=-1):
+        pose = np.linalg.inv(self._frame(handle, relative_to)) @ self._world(handle)
+        return Rotation.from_matrix(pose[:3, :3]).as_euler('XYZ').tolist()
+
+    def setObjectOrientation(self, handle, relative_to, orientation=None):
+        if orientation is None:
+            relative_to, orientation = -1, relative_to
+        frame = self._frame(handle, relative_to)
+        world = self._world(handle)
+        world[:3, :3] = frame[:3, :3] @ Rotation.from_euler('XYZ', orientation[:3]).as_matrix()
+        self._set_world(handle, world)
+
+    def getObjectMatrix(self, handle, relative_to=-1):
+        pose = np.linalg.inv(self._frame(handle, relative_to)) @ self._world(handle)
+        return pose[:3, :].flatten().tolist()
+
+    def setObjectMatrix(self, handle, relative_to, matrix=None):
+        if matrix is None:
+            relative_to, matrix = -1, relative_to
+        pose = np.eye(4)
+        pose[:3, :] = np.asarray(matrix[:12], dtype=float).reshape(3, 4)
+        self._set_world(handle, self._frame(handle, relative_to) @ pose)
+
+    def getJointMatrix(self, handle):
+        return self._object(handle).joint[:3, :].flatten().tolist()
+
+    def setSphericalJointMatrix(self, handle, matrix):
+        joint = np.eye(4)
+        joint[:3, :3] = np.asarray(matrix[:12], dtype=float).reshape(3, 4)[:, :3]
+        self._object(handle).joint = joint
+
+    # -- data and params -------------------------------------------------
+
+    def readCustomDataBlock(self, handle, tag):
+        return self._object(handle).custom_data.get(tag)
+
+    def writeCustomDataBlock(self, handle, tag, data):
+        if data is None or len(data) == 0:
+            self._object(handle).custom_data.pop(tag, None)
+        else:
+            self._object(handle).custom_data[tag] = data
+
+    def setObjectInt32Param(self, handle, param, value):
+        self._object(handle).int_params[param] = value
+
+    def getObjectInt32Param(self, handle, param):
+        return self._object(handle).int_params.get(param, 0)
+
+    def setObjectFloatParam(self, handle, param, value):
+        self._object(handle).float_params[param] = value
+
+    def getObjectFloatParam(self, handle, param):
+        return self._object(handle).float_params.get(param, 0.0)
+
+    def setFloatArrayProperty(self, handle, name, values):
+        self._object(handle).properties[name] = list(values)
+
+    def getFloatArrayProperty(self, handle, name):
+        return self._object(handle).properties.get(name)
+
+    def setShapeColor(self, handle, color_name, component, rgb):
+        self._object(handle).color = list(rgb)
+
+    # texture is stored as shape with texture, like in CoppeliaSim
+    def createTexture(self, path, options=0, plane_sizes=None, scaling_uv=None, xy_g=None, fixed_resolution=0, resolution=None):
+        texture_id = len(self.textures_) + 1
+        self.textures_[texture_id] = {'path': path, 'image': None, 'loaded': False}
+        handle = self._create(os.path.splitext(os.path.basename(path))[0], 'texture')
+        self.objects_[handle].texture = texture_id
+        return handle, texture_id, [0, 0]
+
+    def setShapeTexture(self, handle, texture_id, mapping_mode, options, uv_scaling, position=None, orientation=None):
+        obj = self._object(handle)
+        obj.texture = texture_id
+        obj.uv_scaling = tuple(uv_scaling)
+
+    # rgb image of texture, loaded with cv2 on first use (None if cv2 or file is missing)
+    def _texture_image(self, texture_id):
+        texture = self.textures_.get(texture_id)
+        if texture is None:
+            return None
+        if not texture['loaded']:
+            texture['loaded'] = True
+            try:
+                import cv2
+                image = cv2.imread(texture['path'])
+                if image is not None:
+                    texture['image'] = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            except ImportError:
+                pass
+        return texture['image']
+
+    def addDrawingObject(self, object_type, size, duplicate_tolerance, parent, max_item_count, color=None, *args):
+        with self.lock_:
+            handle = self.next_handle_
+            self.next_handle_ += 1
+            self.drawings_[handle] = []
+            return handle
+
+    def addDrawingObjectItem(self, handle, item):
+        if item is None:
+            self.drawings_[handle] = []
+        else:
+            self.drawings_[handle].append(list(item))
+
+    def removeDrawingObject(self, handle):
+        self.drawings_.pop(handle, None)
+
+    # -- simulation -----------------------------------------------------
+
+    def setStepping(self, enabled):
+        previous = self.stepping_
+        self.stepping_ = enabled
+        return previous
+
+    def startSimulation(self):
+        self.running_ = True
+
+    def stopSimulation(self):
+        self.running_ = False
+
+    def step(self):
+        self.time_ += self.time_step_
+        self.steps_ += 1
+
+    def getSimulationTime(self):
+        return self.time_
+
+    def getSimulationTimeStep(self):
+        return self.time_step_
+
+    # -- vision sensor ----------------------------------------------------
+
+    def getVisionSensorResolution(self, handle):
+        return list(self._object(handle).int_params.get('resolution', self.resolution_))
+
+    # flat surfaces visible to camera: (world pose of surface centre, half sizes, texture image, uv scaling, color)
+    def _surfaces(self):
+        surfaces = []
+        for obj in list(self.objects_.values()):
+            if obj.kind != 'shape' or obj.size is None:
+                continue
+            shape_type = obj.int_params.get('shape_type')
+            if shape_type not in (self.primitiveshape_plane, self.primitiveshape_cuboid):
+                continue
+            pose = self._world(obj.handle)
+            if shape_type == self.primitiveshape_cuboid:
+                # top face of cuboid
+                pose = pose @ np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, obj.size[2] / 2], [0, 0, 0, 1]])
+            image = self._texture_image(obj.texture) if obj.texture is not None else None
+            color = np.array([255 * c for c in obj.color], dtype=np.uint8) if obj.color else np.array([128, 128, 128], dtype=np.uint8)
+            surfaces.append((pose, obj.size[0] / 2, obj.size[1] / 2, image, obj.uv_scaling, color))
+        return surfaces
+
+    # pinhole camera looking along sensor +z (image right = +x, image down = +y), rows returned bottom-up like CoppeliaSim
+    def render(self, handle):
+        width, height = self.getVisionSensorResolution(handle)
+        focal = height / (2 * np.tan(self.getObjectFloatParam(handle, self.visionfloatparam_perspective_angle) / 2))
+        sensor = self._world(handle)
+        u, v = np.meshgrid(np.arange(width) + 0.5 - width / 2, np.arange(height) + 0.5 - height / 2)
+        rays = np.stack([u / focal, v / focal, np.ones_like(u)], axis=-1) @ sensor[:3, :3].T
+        origin = sensor[:3, 3]
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:] = self.ground_color_
+        depth = np.full((height, width), np.inf)
+        for pose, half_x, half_y, texture, (scale_u, scale_v), color in self._surfaces():
+            normal = pose[:3, 2]
+            denominator = rays @ normal
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = ((pose[:3, 3] - origin) @ normal) / denominator
+            hits = origin + t[..., None] * rays
+            local = (hits - pose[:3, 3]) @ pose[:3, :3]
+            visible = (t > 0) & (t < depth) & (np.abs(local[..., 0]) <= half_x) & (np.abs(local[..., 1]) <= half_y)
+            if not visible.any():
+                continue
+            depth[visible] = t[visible]
+            if texture is None:
+                image[visible] = color
+            else:
+                tex_height, tex_width = texture.shape[:2]
+                tu = np.mod(local[..., 0][visible] / scale_u + 0.5, 1.0)
+                tv = np.mod(local[..., 1][visible] / scale_v + 0.5, 1.0)
+                image[visible] = texture[((1.0 - tv) * (tex_height - 1)).astype(int), (tu * (tex_width - 1)).astype(int)]
+        return image[::-1]
+
+    def getVisionSensorImg(self, handle, options=0, rgba_cut_off=0, pos=None, size=None):
+        image = self.render(handle)
+        return image.tobytes(), [image.shape[1], image.shape[0]]
+
+
+class MockClient:
+    # RemoteAPIClient replacement, require('sim') returns the same MockSim
+    def __init__(self, sim=None):
+        self.sim_ = sim if sim is not None else MockSim()
+
+    def require(self, name):
+        if name != 'sim':
+            raise Exception(f"MockClient provides only 'sim', not '{name}'")
+        return self.sim_
+
+    def getObject(self, name):
+        return self.require(name)
+
+
+# rover hierarchy with parts used by Rover, HandleCache, move_arm and sliding_solar_panel
+def add_rover(sim, name, x, y, z=0.375):
+    rover = sim.createPrimitiveShape(sim.primitiveshape_spheroid, [0.6, 0.4, 0.3])
+    sim.setObjectAlias(rover, name)
+    sim.setObjectPosition(rover, -1, [x, y, z])
+    def part(alias, parent, position):
+        handle = sim.createDummy(0.01)
+        sim.setObjectAlias(handle, alias)
+        sim.setObjectParent(handle, parent, False)
+        sim.setObjectPosition(handle, sim.handle_parent, position)
+        return handle
+    joint1 = part('ArmJoint1', rover, [0.3, 0.0, 0.1])
+    joint2 = part('ArmJoint2', joint1, [0.2, 0.0, 0.0])
+    endpoint = part('ArmEndpoint', joint2, [0.2, 0.0, 0.0])
+    part('ArmEndpointLeft', endpoint, [0.0, -0.027, 0.0])
+    part('ArmEndpointRight', endpoint, [0.0, 0.027, 0.0])
+    part('SolarPanel_Left', rover, [0.0, 0.1, 0.15])
+    part('SolarPanel_Right', rover, [0.0, -0.1, 0.15])
+    arm = part('Arm', rover, [0.0, 0.0, 0.0])
+    cuboid = part('Cuboid', arm, [0.0, 0.0, 0.0])
+    cylinder = part('Cylinder', cuboid, [0.0, 0.0, 0.0])
+    sensor = sim.createVisionSensor()
+    sim.setObjectAlias(sensor, 'visionSensor')
+    sim.setObjectParent(sensor, cylinder, False)
+    sim.setObjectMatrix(sensor, sim.handle_parent, CAMERA_IN_ROVER[:3, :].flatten().tolist())
+    return rover
+
+# scene like after prepare_sim: light, Centrala, 3x3 grid of textured fields with SoilData, rocks and rovers
+def create_scene(sim, rovers=1, fields=True, rocks=(), rover_positions=None, seed=None):
+    rng = random.Random(seed)
+    lights = sim.createDummy(0.01)
+    sim.setObjectAlias(lights, 'DefaultLights')
+    sun = sim.createDummy(0.01)
+    sim.setObjectAlias(sun, 'Sun')
+    sim.setObjectParent(sun, lights, False)
+    centrala = sim.createPrimitiveShape(sim.primitiveshape_cuboid, [1.0, 1.0, 1.0])
+    sim.setObjectAlias(centrala, 'Centrala')
+    sim.setObjectPosition(centrala, -1, [0.0, 0.0, 0.5])
+    if fields:
+        spacing = 3.0
+        index = 0
+        for row in range(3):
+            for col in range(3):
+                if row == 1 and col == 1:
+                    continue
+                x, y = -spacing + col * spacing, -spacing + row * spacing
+                plane = sim.createPrimitiveShape(sim.primitiveshape_plane, [1.0, 1.0, 0.1])
+                sim.setObjectPosition(plane, sim.handle_world, [x, y, 0.25])
+                sim.setObjectName(plane, f"Field_{index}")
+                texture_path = os.path.join(TEXTURES_DIR, f"dirt_with_aruco_{index}.jpg")
+                _, texture_id, _ = sim.createTexture(texture_path, 0)
+                sim.setShapeTexture(plane, texture_id, sim.texturemap_plane, 1, [1.5, 1.5])
+                soil_data = {
+                    "area": (x, y, 0.25),
+                    "humidity": round(rng.uniform(40.0, 70.0), 2),
+                    "pH": round(rng.uniform(5.5, 8.0), 2),
+                    "microbiome": rng.choice(["Bacteria", "Fungi", "Algae", "Archaea"]),
+                    "temperature": round(rng.uniform(15.0, 30.0), 2),
+                    "minerals": "Silicon, Iron"
+                }
+                sim.writeCustomDataBlock(plane, "SoilData", json.dumps(soil_data).encode('utf-8'))
+                index += 1
+    for x, y in rocks:
+        rock = sim.createPrimitiveShape(sim.primitiveshape_spheroid, [0.6, 0.6, 0.4])
+        sim.setObjectAlias(rock, 'Rock')
+        sim.setObjectPosition(rock, -1, [x, y, 0.2])
+    if rover_positions is None:
+        rover_positions = [(-4.0, -4.0 + i) for i in range(rovers)]
+    for i, (x, y) in enumerate(rover_positions[:rovers]):
+        add_rover(sim, f"Rover{i}", x, y)
+    return sim
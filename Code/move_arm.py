@@ -2,7 +2,8 @@ import math
 import time
 import numpy as np
 
-from coppeliasim_zmqremoteapi_client import RemoteAPIClient
+from Code.handle_cache import handle_resolver
+from Code.animation import run_blocking
 
 
 def get_rotation_matrix_x(theta_deg):
@@ -31,7 +32,8 @@ def to_numpy_array(lst):
 def to_list(np_array):
     return np_array.flatten().tolist()
 
-def rotate_y(sim, joint_handle, angle, rotation_matrix_getter=get_rotation_matrix_y):
+# animation frames (generator), yields after every simulation frame
+def rotate_y_frames(sim, joint_handle, angle, rotation_matrix_getter=get_rotation_matrix_y):
     ANGLE_CHANGE_PER_STEP = 20
     STEP_DURATION_SECS = 0.1
     direction = 1 if angle >= 0 else -1
@@ -46,16 +48,17 @@ def rotate_y(sim, joint_handle, angle, rotation_matrix_getter=get_rotation_matri
         )
 
         sim.setSphericalJointMatrix(joint_handle, rotation_matrix)
-        sim.step()
+        yield
         #time.sleep(STEP_DURATION_SECS)
 
-def grip(sim, rover_name, percent_open=1.0):
+def rotate_y(sim, joint_handle, angle, rotation_matrix_getter=get_rotation_matrix_y):
+    run_blocking(sim, rotate_y_frames(sim, joint_handle, angle, rotation_matrix_getter))
+
+def grip_frames(sim, rover_name, percent_open=1.0, handles=None):
     FULL_OPEN_Y = 0.027
     CHANGE_PER_STEP = 0.01
     STEP_DURATION = 0.1
-    handle = lambda joint_name: sim.getObject(
-        f"/{rover_name}/{joint_name}"
-    )
+    handle = handle_resolver(sim, rover_name, handles)
     endpoint_handle = handle('ArmEndpoint')
     endpoint_left_handle = handle('ArmEndpointLeft')
     endpoint_right_handle = handle('ArmEndpointRight')
@@ -74,24 +77,30 @@ def grip(sim, rover_name, percent_open=1.0):
         right_pos[1] = right_pos[1] + get_operator(right_y_pos_diff)*CHANGE_PER_STEP
         sim.setObjectPosition(endpoint_left_handle, endpoint_handle, left_pos)
         sim.setObjectPosition(endpoint_right_handle, endpoint_handle, right_pos)
-        sim.step()
+        yield
         #time.sleep(STEP_DURATION)
 
-def deploy_arm(sim, rover_name):
-    joint_handle = lambda joint_name: sim.getObject(
-        f"/{rover_name}/{joint_name}"
-    )
-    rotate_y(sim, joint_handle('ArmJoint1'), 90)
-    rotate_y(sim, joint_handle('ArmJoint2'), 90)
+def grip(sim, rover_name, percent_open=1.0, handles=None):
+    run_blocking(sim, grip_frames(sim, rover_name, percent_open, handles))
+
+def deploy_arm_frames(sim, rover_name, handles=None):
+    joint_handle = handle_resolver(sim, rover_name, handles)
+    yield from rotate_y_frames(sim, joint_handle('ArmJoint1'), 90)
+    yield from rotate_y_frames(sim, joint_handle('ArmJoint2'), 90)
+
+def deploy_arm(sim, rover_name, handles=None):
+    run_blocking(sim, deploy_arm_frames(sim, rover_name, handles))
+
+def retract_arm_frames(sim, rover_name, handles=None):
+    joint_handle = handle_resolver(sim, rover_name, handles)
+    yield from rotate_y_frames(sim, joint_handle('ArmJoint1'), -90)
+    yield from rotate_y_frames(sim, joint_handle('ArmJoint2'), -90)
 
-def retract_arm(sim, rover_name):
-    joint_handle = lambda joint_name: sim.getObject(
-        f"/{rover_name}/{joint_name}"
-    )
-    rotate_y(sim, joint_handle('ArmJoint1'), -90)
-    rotate_y(sim, joint_handle('ArmJoint2'), -90)
+def retract_arm(sim, rover_name, handles=None):
+    run_blocking(sim, retract_arm_frames(sim, rover_name, handles))
 
 if __name__ == "__main__":
+    from coppeliasim_zmqremoteapi_client import RemoteAPIClient
     client = RemoteAPIClient()
     sim = client.require("sim")
     sim.startSimulation()
@@ -1,7 +1,6 @@
 import time
 import numpy as np
 import math
-from coppeliasim_zmqremoteapi_client import RemoteAPIClient
 
 def wrap_to_pi(angle):
     return (angle + np.pi) % (2 * np.pi) - np.pi
@@ -0,0 +1,60 @@
+"""
+Wspólny rejestr przeszkód ze sceny (np. Centrala, Rock[i]).
+Scena jest przeglądana raz - jedno sim.getObjectsInTree dla obiektów najwyższego poziomu
+i filtrowanie po aliasie - uchwyty i pozycje są trzymane w pamięci.
+Ponowne odczytanie sceny następuje tylko po invalidate() (np. po utworzeniu nowego obiektu).
+"""
+
+class ObstacleRegistry:
+    def __init__(self, sim, radii):
+        self.sim_ = sim
+        # alias -> obstacle radius, e.g. {'Centrala': 0.75, 'Rock': 0.5}
+        self.radii_ = radii
+        self.entries_ = []
+        self.dirty_ = True
+        self.version_ = 0
+
+    # force rescan of the scene on next access
+    def invalidate(self):
+        self.dirty_ = True
+
+    def refresh(self, force=False):
+        if not (force or self.dirty_):
+            return
+        # top level objects only (options bit 1), like '/Rock[i]' paths
+        handles = self.sim_.getObjectsInTree(self.sim_.handle_scene, self.sim_.handle_all, 2)
+        counters = {}
+        entries = []
+        for handle in handles:
+            alias = self.sim_.getObjectAlias(handle)
+            if alias not in self.radii_:
+                continue
+            index = counters.get(alias, 0)
+            counters[alias] = index + 1
+            position = self.sim_.getObjectPosition(handle, -1)
+            entries.append({
+                'alias': alias,
+                'id': f"{alias}[{index}]",
+                'handle': handle,
+                'x': position[0],
+                'y': position[1],
+                'radius': self.radii_[alias],
+            })
+        self.entries_ = entries
+        self.dirty_ = False
+        self.version_ += 1
+
+    # cached entries, optionally only with given aliases
+    def entries(self, aliases=None):
+        self.refresh()
+        if aliases is None:
+            return list(self.entries_)
+        return [entry for entry in self.entries_ if entry['alias'] in aliases]
+
+    # obstacles in planner format [(x, y, r), ...]
+    def get_obstacles(self, aliases=None):
+        return [(entry['x'], entry['y'], entry['radius']) for entry in self.entries(aliases)]
+
+    def version(self):
+        self.refresh()
+        return self.version_
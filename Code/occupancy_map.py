@@ -0,0 +1,140 @@
+import itertools
+import math
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+from Code.collision_checker import CollisionChecker
+
+"""
+Rastrowa mapa zajętości budowana raz ze statycznych przeszkód [(x,y,r), ...]
+(centrala, skały, pola) + euklidesowa transformata odległości (clearance).
+Zapytania o punkt to odczyt z tablicy, dynamiczne przeszkody (łaziki) są
+nakładane przy każdym zapytaniu jako dokładne okręgi.
+"""
+
+# identity of map instance, not reused after garbage collection like id()
+_map_ids = itertools.count()
+
+class OccupancyMap:
+    def __init__(self, obstacle_list, lower_bound, upper_bound, resolution=0.05):
+        self.lb_ = np.array(lower_bound[:2], dtype=float)
+        self.ub_ = np.array(upper_bound[:2], dtype=float)
+        self.resolution_ = resolution
+        self.shape_ = tuple(np.ceil((self.ub_ - self.lb_) / resolution).astype(int))
+        self.occupied_ = np.zeros(self.shape_, dtype=bool)
+        self.obstacles_ = np.empty((0, 3))
+        # bumped on every static change (used e.g. by path cache signature)
+        self.version_ = 0
+        self.map_id_ = next(_map_ids)
+        for obstacle in obstacle_list:
+            self._rasterise(obstacle[0], obstacle[1], obstacle[2])
+        self._update_distance()
+
+    # mark cells touching the disc (conservative, disc grown by half of cell diagonal)
+    def _rasterise(self, x, y, r):
+        self.obstacles_ = np.vstack([self.obstacles_, [x, y, r]])
+        r = r + self.resolution_ * math.sqrt(2) / 2
+        i_lb, j_lb = np.floor((np.array([x - r, y - r]) - self.lb_) / self.resolution_).astype(int)
+        i_ub, j_ub = np.ceil((np.array([x + r, y + r]) - self.lb_) / self.resolution_).astype(int)
+        i_lb, j_lb = max(i_lb, 0), max(j_lb, 0)
+        i_ub, j_ub = min(i_ub, self.shape_[0]), min(j_ub, self.shape_[1])
+        if i_lb >= i_ub or j_lb >= j_ub:
+            return
+        xs = self.lb_[0] + (np.arange(i_lb, i_ub) + 0.5) * self.resolution_
+        ys = self.lb_[1] + (np.arange(j_lb, j_ub) + 0.5) * self.resolution_
+        inside = (xs[:, None] - x) ** 2 + (ys[None, :] - y) ** 2 <= r ** 2
+        self.occupied_[i_lb:i_ub, j_lb:j_ub] |= inside
+
+    # distance (in meters) from every cell to nearest occupied cell
+    def _update_distance(self):
+        if self.occupied_.any():
+            self.distance_ = distance_transform_edt(~self.occupied_) * self.resolution_
+        else:
+            self.distance_ = np.full(self.shape_, np.inf)
+
+    # add new static obstacle (e.g. discovered field)
+    def add_obstacle(self, x, y, r):
+        self._rasterise(x, y, r)
+        self._update_distance()
+        self.version_ += 1
+
+    # points -> (m, 2), returns cell indices and mask of points inside map
+    def _cells(self, points):
+        cells = np.floor((points - self.lb_) / self.resolution_).astype(int)
+        inside = np.all((cells >= 0) & (cells < self.shape_), axis=1)
+        return np.clip(cells, 0, np.array(self.shape_) - 1), inside
+
+    # static clearance for points (0 outside map), dynamic discs subtracted exactly
+    def clearances(self, points, dynamic_obstacles=()):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        cells, inside = self._cells(points)
+        clearance = np.where(inside, self.distance_[cells[:, 0], cells[:, 1]], 0.0)
+        dynamic = np.array([obstacle[:3] for obstacle in dynamic_obstacles], dtype=float).reshape(-1, 3)
+        if len(dynamic):
+            to_dynamic = np.hypot(points[:, 0, None] - dynamic[None, :, 0], points[:, 1, None] - dynamic[None, :, 1]) - dynamic[None, :, 2]
+            clearance = np.minimum(clearance, np.maximum(to_dynamic.min(axis=1), 0.0))
+        return clearance
+
+    def clearance(self, x, y, dynamic_obstacles=()):
+        return float(self.clearances([[x, y]], dynamic_obstacles)[0])
+
+    def is_free(self, x, y, dynamic_obstacles=()):
+        return self.clearance(x, y, dynamic_obstacles) > 0
+
+    # checker with CollisionChecker interface for planners
+    def checker(self, dynamic_obstacles=(), free_points=()):
+        return MapChecker(self, dynamic_obstacles, free_points)
+
+
+class MapChecker:
+    # free raster cells accepted directly, occupied ones rechecked exactly (raster is conservative);
+    # dynamic discs checked exactly, static obstacles containing free_points (rover start, goal field) are ignored
+    def __init__(self, occupancy_map, dynamic_obstacles=(), free_points=()):
+        self.map_ = occupancy_map
+        self.dynamic_ = CollisionChecker(dynamic_obstacles)
+        self.step_ = occupancy_map.resolution_ / 2
+        self.free_points_ = np.array([point[:2] for point in free_points], dtype=float).reshape(-1, 2)
+        self.static_ = None
+        self.static_version_ = None
+
+    # exact checker over current map obstacles, rebuilt when map changes (long lived checkers, e.g. PRM roadmap)
+    def _static_checker(self):
+        if self.static_ is None or self.static_version_ != self.map_.version_:
+            obstacles = self.map_.obstacles_
+            if len(self.free_points_) and len(obstacles):
+                free = self.free_points_
+                contains = np.hypot(free[:, 0, None] - obstacles[None, :, 0], free[:, 1, None] - obstacles[None, :, 1]) <= obstacles[None, :, 2]
+                obstacles = obstacles[~contains.any(axis=0)]
+            self.static_ = CollisionChecker(obstacles)
+            self.static_version_ = self.map_.version_
+        return self.static_
+
+    def _static_collide(self, points):
+        cells, inside = self.map_._cells(points)
+        blocked = ~inside | self.map_.occupied_[cells[:, 0], cells[:, 1]]
+        recheck = blocked & inside
+        if recheck.any():
+            blocked[recheck] = self._static_checker().points_collide(points[recheck])
+        return blocked
+
+    def points_collide(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        return self._static_collide(points) | self.dynamic_.points_collide(points)
+
+    def point_collides(self, x, y):
+        return bool(self.points_collide([[x, y]])[0])
+
+    # segments sampled every half cell
+    def segments_collide(self, starts, ends):
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.broadcast_to(np.asarray(ends, dtype=float), starts.shape)
+        if not len(starts):
+            return np.zeros(0, dtype=bool)
+        lengths = np.hypot(*(ends - starts).T)
+        samples = max(int(math.ceil(lengths.max() / self.step_)), 1) + 1
+        t = np.linspace(0.0, 1.0, samples)
+        points = starts[:, None, :] + t[None, :, None] * (ends - starts)[:, None, :]
+        static = self._static_collide(points.reshape(-1, 2)).reshape(len(starts), samples).any(axis=1)
+        return static | self.dynamic_.segments_collide(starts, ends)
+
+    def segment_collides(self, x0, y0, x1, y1):
+        return bool(self.segments_collide([[x0, y0]], [x1, y1])[0])
@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from Code.rrt_star import create_planner, plan_with_retries, shared_path_cache
+
+"""
+Usługa planowania ścieżek w tle. Zlecenie (start, goal, obstacles[, occupancy_map])
+zwraca concurrent.futures.Future ze ścieżką w formacie path_ planera ([[x, y], ...])
+albo None, gdy ścieżki nie znaleziono. Każdy wątek roboczy ma własny planer.
+Zlecenia jeszcze nie rozpoczęte można anulować przez future.cancel().
+"""
+
+class PlanningService:
+    def __init__(self, sim, max_workers=2, retries=15):
+        self.sim_ = sim
+        self.retries_ = retries
+        self.path_cache_ = shared_path_cache()
+        self.local_ = threading.local()
+        self.executor_ = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="planner")
+
+    # planner owned by current worker thread
+    def _planner(self):
+        planner = getattr(self.local_, 'planner', None)
+        if planner is None:
+            planner = create_planner(self.sim_, [0, 0], [0, 0], [])
+            self.local_.planner = planner
+        return planner
+
+    def _plan(self, start, goal, obstacles, occupancy_map):
+        planner = self._planner()
+        planner.set_occupancy_map(occupancy_map)
+        return plan_with_retries(planner, start, goal, obstacles, self.retries_, self.path_cache_)
+
+    def submit(self, start, goal, obstacles, occupancy_map=None):
+        return self.executor_.submit(self._plan, list(start), list(goal), list(obstacles), occupancy_map)
+
+    def shutdown(self):
+        self.executor_.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,234 @@
+import math
+import heapq
+import threading
+import weakref
+import numpy as np
+from scipy.spatial import cKDTree
+from Code.rrt_star import load_config, static_signature
+from Code.collision_checker import CollisionChecker, create_checker
+
+"""
+Planer PRM (probabilistic roadmap) dla prawie statycznego otoczenia.
+Graf wolnej przestrzeni jest budowany raz dla mapy zajętości (centrala, skały, pola)
+i współdzielony przez wszystkie łaziki, zapytanie to dołączenie startu i celu do grafu
+i przeszukanie A*. Nowe przeszkody z mapy (odkryte pola) usuwają z grafu tylko
+węzły i krawędzie w swoim pobliżu. Nieudane zapytania dogęszczają wspólny graf,
+ale najwyżej do prm_max_nodes węzłów. Interfejs jak RRTStar (update_state, plan, path_).
+"""
+
+class Roadmap:
+    def __init__(self, static_checker, lower_bound, upper_bound, nodes=1500, neighbors=10, connection_radius=1.5, seed=None, max_nodes=None):
+        self.checker_ = static_checker
+        # cap for all sampled nodes (also removed ones), None - no cap
+        self.max_nodes_ = max_nodes
+        self.lb_ = np.array(lower_bound[:2], dtype=float)
+        self.ub_ = np.array(upper_bound[:2], dtype=float)
+        self.neighbors_ = neighbors
+        self.connection_radius_ = connection_radius
+        self.rng_ = np.random.default_rng(seed)
+        self.coords_ = np.empty((0, 2))
+        self.alive_ = np.empty(0, dtype=bool)
+        # node -> {neighbor: edge length}
+        self.edges_ = []
+        self.tree_ = None
+        # number of occupancy map obstacles already applied
+        self.synced_ = 0
+        self.lock_ = threading.RLock()
+        self.expand(nodes)
+
+    # sample new free nodes and connect them to roadmap, returns False when roadmap is full
+    def expand(self, count):
+        with self.lock_:
+            if self.max_nodes_ is not None:
+                count = min(count, self.max_nodes_ - len(self.coords_))
+                if count <= 0:
+                    return False
+            points = self.lb_ + self.rng_.random((count, 2)) * (self.ub_ - self.lb_)
+            points = points[~self.checker_.points_collide(points)]
+            first = len(self.coords_)
+            self.coords_ = np.vstack([self.coords_, points])
+            self.alive_ = np.concatenate([self.alive_, np.ones(len(points), dtype=bool)])
+            self.edges_.extend({} for _ in range(len(points)))
+            self.tree_ = cKDTree(self.coords_)
+            for index in range(first, len(self.coords_)):
+                self._connect(index)
+            return True
+
+    # edges from node to its k nearest free neighbours
+    def _connect(self, index):
+        k = min(self.neighbors_ + 1, len(self.coords_))
+        distances, candidates = self.tree_.query(self.coords_[index], k=k, distance_upper_bound=self.connection_radius_)
+        mask = (candidates != index) & (candidates < len(self.coords_))
+        candidates, distances = candidates[mask], distances[mask]
+        alive = self.alive_[candidates]
+        candidates, distances = candidates[alive], distances[alive]
+        if not len(candidates):
+            return
+        blocked = self.checker_.segments_collide(self.coords_[candidates], self.coords_[index])
+        for candidate, distance, candidate_blocked in zip(candidates, distances, blocked):
+            if not candidate_blocked:
+                self.edges_[index][int(candidate)] = float(distance)
+                self.edges_[int(candidate)][index] = float(distance)
+
+    # remove nodes and edges touching new static obstacle
+    def add_obstacle(self, x, y, r):
+        with self.lock_:
+            obstacle = CollisionChecker([(x, y, r)])
+            for index in self.tree_.query_ball_point([x, y], r):
+                self._remove_node(index)
+            # edges crossing the disc have an end within connection radius of it
+            for index in self.tree_.query_ball_point([x, y], r + self.connection_radius_):
+                if not self.alive_[index] or not self.edges_[index]:
+                    continue
+                others = list(self.edges_[index])
+                blocked = obstacle.segments_collide(self.coords_[others], self.coords_[index])
+                for other, other_blocked in zip(others, blocked):
+                    if other_blocked:
+                        del self.edges_[index][other]
+                        del self.edges_[other][index]
+
+    def _remove_node(self, index):
+        self.alive_[index] = False
+        for other in self.edges_[index]:
+            del self.edges_[other][index]
+        self.edges_[index] = {}
+
+    # apply obstacles added to occupancy map since last sync
+    def sync(self, occupancy_map):
+        with self.lock_:
+            for x, y, r in occupancy_map.obstacles_[self.synced_:]:
+                self.add_obstacle(x, y, r)
+            self.synced_ = len(occupancy_map.obstacles_)
+
+    # alive nodes near point which can be reached with checker
+    def _attach(self, point, checker):
+        k = min(self.neighbors_, len(self.coords_))
+        _, candidates = self.tree_.query(point, k=k, distance_upper_bound=self.connection_radius_)
+        candidates = np.atleast_1d(candidates)
+        candidates = candidates[candidates < len(self.coords_)]
+        candidates = candidates[self.alive_[candidates]]
+        if not len(candidates):
+            return {}
+        blocked = checker.segments_collide(self.coords_[candidates], point)
+        return {int(candidate): float(math.hypot(*(self.coords_[candidate] - point))) for candidate, candidate_blocked in zip(candidates, blocked) if not candidate_blocked}
+
+    def _path(self, parents, start, goal):
+        path = [goal.tolist()]
+        current = parents[-2]
+        while current != -1:
+            path.append(self.coords_[current].tolist())
+            current = parents[current]
+        path.append(start.tolist())
+        return path[::-1]
+
+    # A* from start to goal, edges checked lazily against checker (dynamic obstacles)
+    def query(self, start, goal, checker):
+        start = np.array(start[:2], dtype=float)
+        goal = np.array(goal[:2], dtype=float)
+        if not checker.segment_collides(start[0], start[1], goal[0], goal[1]):
+            return [start.tolist(), goal.tolist()]
+        with self.lock_:
+            from_start = self._attach(start, checker)
+            to_goal = self._attach(goal, checker)
+            if not from_start or not to_goal:
+                return None
+            # -1 is start, -2 is goal
+            costs = {-1: 0.0}
+            parents = {-1: None}
+            closed = set()
+            queue = [(float(np.hypot(*(goal - start))), -1)]
+            while queue:
+                _, current = heapq.heappop(queue)
+                if current in closed:
+                    continue
+                closed.add(current)
+                if current == -2:
+                    return self._path(parents, start, goal)
+                if current == -1:
+                    edges = from_start.items()
+                    position = start
+                else:
+                    edges = list(self.edges_[current].items())
+                    if current in to_goal:
+                        edges.append((-2, to_goal[current]))
+                    position = self.coords_[current]
+                    # roadmap edges are free of static obstacles, check only current ones
+                    others = [other for other, _ in edges if other >= 0 and other not in closed]
+                    if others:
+                        blocked = checker.segments_collide(self.coords_[others], position)
+                        blocked = {other for other, other_blocked in zip(others, blocked) if other_blocked}
+                        edges = [(other, length) for other, length in edges if other not in blocked]
+                for other, length in edges:
+                    if other in closed:
+                        continue
+                    cost = costs[current] + length
+                    if cost < costs.get(other, math.inf):
+                        costs[other] = cost
+                        parents[other] = current
+                        target = goal if other == -2 else self.coords_[other]
+                        heapq.heappush(queue, (cost + float(np.hypot(*(goal - target))), other))
+            return None
+
+
+_roadmaps = weakref.WeakKeyDictionary()
+_roadmaps_lock = threading.Lock()
+
+# roadmap shared by planners using the same occupancy map
+def shared_roadmap(occupancy_map, config):
+    with _roadmaps_lock:
+        roadmap = _roadmaps.get(occupancy_map)
+        if roadmap is None:
+            roadmap = _create_roadmap(occupancy_map.checker(), config)
+            roadmap.synced_ = len(occupancy_map.obstacles_)
+            _roadmaps[occupancy_map] = roadmap
+    roadmap.sync(occupancy_map)
+    return roadmap
+
+def _create_roadmap(static_checker, config):
+    return Roadmap(static_checker, config['map_size_lb'], config['map_size_ub'],
+                   config.get('prm_nodes', 1500), config.get('prm_neighbors', 10),
+                   config.get('prm_connection_radius', 1.5), config.get('prm_seed'),
+                   config.get('prm_max_nodes', 4 * config.get('prm_nodes', 1500)))
+
+
+class PRMPlanner:
+    def __init__(self, sim, start, goal, obstacle_list, config=None):
+        self.sim_ = sim
+        if config is None:
+            config = load_config()
+        self.config_ = config
+        self.goal_radius_ = config['goal_radius']
+        self.expand_nodes_ = config.get('prm_nodes', 1500) // 4
+        self.occupancy_map_ = None
+        self.roadmap_ = None
+        self.signature_ = None
+        self.path_ = None
+        self.goal_reached_ = False
+        self.update_state(start, goal, obstacle_list)
+
+    def update_state(self, new_start, new_goal, new_obstacles):
+        self.start_ = (new_start[0], new_start[1])
+        self.goal_ = (new_goal[0], new_goal[1])
+        self.obstacles_ = new_obstacles
+        self.checker_ = create_checker(new_obstacles, self.config_, self.occupancy_map_, [new_start, new_goal])
+        if self.occupancy_map_ is not None:
+            self.roadmap_ = shared_roadmap(self.occupancy_map_, self.config_)
+        else:
+            # without map all obstacles are static, own roadmap rebuilt when they change
+            signature = static_signature(new_obstacles)
+            if signature != self.signature_:
+                self.roadmap_ = _create_roadmap(CollisionChecker(new_obstacles), self.config_)
+                self.signature_ = signature
+        self.path_ = None
+        self.goal_reached_ = False
+
+    def plan(self):
+        self.path_ = self.roadmap_.query(self.start_, self.goal_, self.checker_)
+        self.goal_reached_ = self.path_ is not None
+
+    # denser roadmap for next query (shared, so bounded by prm_max_nodes)
+    def increase_iterations(self):
+        self.roadmap_.expand(self.expand_nodes_)
+
+    def set_occupancy_map(self, occupancy_map):
+        self.occupancy_map_ = occupancy_map
@@ -1,37 +1,74 @@
-from Code.rrt_star import RRTStar
-from Code.sliding_solar_panel import retract_solar_panels, deploy_solar_panels
-from Code.move_arm import deploy_arm, retract_arm, grip
+from Code.rrt_star import create_planner, plan_with_retries, shared_path_cache
+from Code.collision_checker import create_checker
+from Code.sliding_solar_panel import retract_solar_panels_frames, deploy_solar_panels_frames
+from Code.move_arm import deploy_arm_frames, retract_arm_frames, grip_frames
+from Code.animation import AnimationQueue
 from Code.move_rover_to_goal import move_rover_to_goal
 from Code.rrt_star_visualise import visualise_path, remove_path
 from Code.locate_marker import MarkerDetector
 from Code.rover_mover import RoverMover
 from Code.rover_state import RoverState, ActivityState
+from Code.day_night_cycle import DayNightCycle
+from Code.handle_cache import HandleCache, ROVER_PART_NAMES
+from concurrent.futures import wait
 import cv2
 import numpy as np
 import random
 import logging
 
 class Rover:
-    def __init__(self, sim, rover_name, centrala):
+    def __init__(self, sim, rover_name, centrala, batch=None, planning_service=None):
         self.sim = sim
         self.name = rover_name
         self.handle = sim.getObjectHandle(f'/{rover_name}')
+        # arm, gripper and panel handles resolved once
+        self.handles = HandleCache(sim, rover_name, ROVER_PART_NAMES)
+        # arm/panel animations played one frame per global simulation step
+        self.animations = AnimationQueue()
         self.centrala = centrala
+        # battery and day/night cycle use the same clock as centrala
+        self.clock = centrala.clock
         self.task_queue = []
         self.position = self.get_position()
-        self.planner = RRTStar(sim, [0,0], [0,0], [[0,0,0]])
+        self.planner = create_planner(sim, [0,0], [0,0], [[0,0,0]])
         camera_name = f"/{rover_name}/Arm/Cuboid/Cylinder/visionSensor"
         self.camera_handle = sim.getObjectHandle(camera_name)
         self.detector = MarkerDetector(sim, self.camera_handle, self.handle)
+        # day/night cycle is a singleton, first rover binds it to the same simulator
+        DayNightCycle(sim, self.clock)
         self.state = RoverState(self, rover_name)
-        self.mover = RoverMover(sim, rover_name, [])
+        self.mover = RoverMover(sim, rover_name, [], batch=batch)
 
         self.discovered_markers = []
         self.replan_counter = 0
+        # current waypoint of explore_route task
+        self.route_index = 0
+        # set by FleetScheduler -> planning and image processing run later in worker threads
+        self.defer_cpu_work = False
+        self._plan_request = None
+        self._frame = None
+        self._planned = False
+        self._detected = None
+        # optional shared PlanningService -> paths planned in background, returned as futures
+        self.planning_service = planning_service
+        self._plan_future = None
+        self._plan_generation = 0
+        self.waiting_for_path = False
+        # set by FleetScheduler(deterministic=True): replanned path applied exactly this many ticks after request
+        self.replan_delay_ticks = None
+        self._plan_age = 0
+        # perform_task done, task reported after its arm animations are played
+        self._task_performed = False
+        # field parameters after work, applied by centrala in report_task_completed (under its field lock)
+        self._field_data_after_work = None
         # rejestracja w centrali
         self.centrala.register_rover(self.name, self, None, self.position)
 
     def tick(self):
+        # rover is busy with arm/panel animation, play next frame and wait for world step
+        if self.animations.step():
+            return
+
         self.state.update()
 
         if self.state.is_forced_idle():
@@ -44,13 +81,20 @@ class Rover:
                 logging.debug(f"[{self.name}] Brak nowych zadań.")
                 return
             self.current_task = task
+            self._task_performed = False
 
             if task['type'] == 'explore_point':
                 self.goal = task['details']['target_coords_explore']
+            elif task['type'] == 'explore_route':
+                # route is driven point by point, scanning all the way
+                self.route_index = 0
+                self.goal = task['details']['route'][0]
             else:
                 self.goal = task['target_coords']
                 
-            obstacles = self.find_obstacles(self.sim, self.goal)
+            obstacles = self.find_planning_obstacles(self.goal)
+            # path of previous task is finished, wait for new one before moving
+            self.waiting_for_path = self.planning_service is not None
             self.plan_new_path(self.goal, obstacles)
             self.state.set_activity_state(ActivityState.MOVING)
             logging.info(f"[{self.name}] Nowe zadanie: {task['type']} dla pola {task['field_name']}.")
@@ -58,29 +102,45 @@ class Rover:
             return
         # 2. Jeśli MOVING — wykonaj jazdę, popraw trasę co (X/20) sekund
         if self.state.activity_state() == ActivityState.MOVING:
+            self._poll_planned_path()
+            if self.waiting_for_path:
+                return
+            if self.mover.done and self.current_task['type'] == 'explore_route' and self.route_index + 1 < len(self.current_task['details']['route']):
+                self.route_index += 1
+                self.goal = self.current_task['details']['route'][self.route_index]
+                self._plan_route_hop(self.goal)
+                return
             if self.mover.done:
                 logging.info(f"[{self.name}] Reached goal.")
                 self.state.set_activity_state(ActivityState.WORKING)
                 return
             if self.replan_counter == 600:
-                obstacles = self.find_obstacles(self.sim, self.goal)
-                self.plan_new_path(self.goal, obstacles)
+                if self.current_task['type'] == 'explore_route' and self.route_index > 0:
+                    self._plan_route_hop(self.goal)
+                else:
+                    obstacles = self.find_planning_obstacles(self.goal)
+                    self.plan_new_path(self.goal, obstacles)
                 self.replan_counter = 0
             self._move_rover()
             self.replan_counter += 1
             # gdy task exploracji to w trasie skanuj i dodaj do listy gdy wykryje nowy punkt wg id
-            if self.current_task['type'] == 'explore_point':
-                detected = self.detect_marker()
-                if detected:
-                    for point in detected:
-                        if all(p[0] != point[0] for p in self.discovered_markers):
-                            logging.info(f"[{self.name}] Znaleziono nowy id:{point[0]} na [{point[1]}, {point[2]}].")
-                            self.discovered_markers.append(point)
+            if self.current_task['type'] in ('explore_point', 'explore_route'):
+                if self.defer_cpu_work:
+                    self._frame = self.capture_frame()
+                else:
+                    self._register_markers(self.detect_marker())
             return
         # 3. Jeśli WORKING — wykonaj zadanie
         if self.state.activity_state() == ActivityState.WORKING:
-            self.perform_task(self.current_task)
-            self.centrala.report_task_completed(self.name, self.current_task['id'], "success")
+            if not self._task_performed:
+                self._field_data_after_work = self.perform_task(self.current_task)
+                self._task_performed = True
+                # rover stays WORKING until arm frames are played (tick returns early while animations run)
+                if self.animations.busy():
+                    return
+            self._task_performed = False
+            self.centrala.report_task_completed(self.name, self.current_task['id'], "success", self._field_data_after_work)
+            self._field_data_after_work = None
             self.state.set_activity_state(ActivityState.IDLE)
             logging.info(f"[{self.name}] Zadanie ukończone, gotowy na nowe.")
             return
@@ -88,18 +148,135 @@ class Rover:
     def _move_rover(self):
         self.mover.step()
 
+    # add newly seen markers (by id) to discovered list and report them right away
+    # (field enters centrala occupancy map before route ends)
+    def _register_markers(self, detected):
+        for point in detected or []:
+            if all(p[0] != point[0] for p in self.discovered_markers):
+                logging.info(f"[{self.name}] Znaleziono nowy id:{point[0]} na [{point[1]}, {point[2]}].")
+                self.discovered_markers.append(point)
+                self._report_marker(point)
+
+    def _report_marker(self, point):
+        marker_id = point[0]
+        position = [point[1], point[2], 1]
+        # na razie uproszczone
+        field_parameters_from_scan = {'humidity': 40}
+        self.centrala.report_discovered_field(self.name, marker_id, position, field_parameters_from_scan)
+
     # plan and move to goal
     def plan_new_path(self, goal, obstacles):
+        if self.planning_service is not None:
+            # old path is followed (or rover waits) until future is done, older request is cancelled
+            if self._plan_future is not None:
+                self._plan_future.cancel()
+            self._plan_generation += 1
+            self._plan_future = self.planning_service.submit(self.get_position(), goal, obstacles, self.centrala.occupancy_map)
+            self._plan_future.generation = self._plan_generation
+            self._plan_age = 0
+            self.state.set_activity_state(ActivityState.MOVING)
+            return
+        if self.defer_cpu_work:
+            # planned in run_cpu_work, path applied in finish_tick (same world step)
+            self._plan_request = (self.get_position(), goal, obstacles)
+            self.state.set_activity_state(ActivityState.MOVING)
+            return
         self.find_path(goal, obstacles)
         # visualise_path(self.sim, self.planner.path_, random.randint(0,1000))
         self.mover.set_new_path(self.planner.path_)
         self.state.set_activity_state(ActivityState.MOVING)
 
+    # next point of explore_route lies on a lane checked against static map, so hop is driven
+    # straight (RRT* path could drift sideways beyond lane cover); planner only when hop is blocked
+    def _plan_route_hop(self, goal):
+        obstacles = self.find_planning_obstacles(goal)
+        start = self.get_position()
+        checker = create_checker(obstacles, self.planner.config_, self.centrala.occupancy_map, [start, goal])
+        if checker.segments_collide([start[:2]], [goal[:2]]).any():
+            self.waiting_for_path = self.planning_service is not None
+            self.plan_new_path(goal, obstacles)
+            return
+        # pending plan of previous hop is dropped
+        if self._plan_future is not None:
+            self._plan_future.cancel()
+            self._plan_future = None
+        self._plan_generation += 1
+        self._plan_request = None
+        self.waiting_for_path = False
+        self.mover.set_new_path([[start[0], start[1]], [goal[0], goal[1]]])
+        self.state.set_activity_state(ActivityState.MOVING)
+
+    # apply path from planning service when ready, stale results are dropped
+    def _poll_planned_path(self):
+        future = self._plan_future
+        if future is None:
+            return
+        if self.replan_delay_ticks is not None and not self.waiting_for_path:
+            # deterministic replan: old path followed for fixed number of ticks, then new one applied
+            self._plan_age += 1
+            if self._plan_age < self.replan_delay_ticks:
+                return
+            wait([future])
+        elif not future.done():
+            return
+        self._plan_future = None
+        if future.cancelled() or future.generation != self._plan_generation:
+            return
+        try:
+            path = future.result()
+        except Exception as e:
+            logging.error(f"[{self.name}] Błąd planowania ścieżki: {e}")
+            path = None
+        if path is None:
+            path = [self.get_position()]
+            print("No path found, setting position as goal")
+        self.mover.set_new_path(path)
+        self.waiting_for_path = False
+
+    # block until requested path is planned and apply it (deterministic runs: world does not step while planning)
+    def wait_for_planned_path(self):
+        if self._plan_future is None:
+            return
+        wait([self._plan_future])
+        self._poll_planned_path()
+
+    # cpu heavy part of tick, safe to run in worker thread (no simulator calls)
+    def has_cpu_work(self):
+        return self._plan_request is not None or self._frame is not None
+
+    def run_cpu_work(self):
+        if self._plan_request is not None:
+            start, goal, obstacles = self._plan_request
+            self._plan_request = None
+            self.find_path(goal, obstacles, start)
+            self._planned = True
+        if self._frame is not None:
+            frame = self._frame
+            self._frame = None
+            self._detected = self.process_frame(frame)
+
+    # apply results of run_cpu_work, called from main thread
+    def finish_tick(self):
+        if self._planned:
+            self._planned = False
+            self.mover.set_new_path(self.planner.path_)
+        if self._detected is not None:
+            self._register_markers(self._detected)
+            self._detected = None
+
+    # image and rover pose from last simulation step (main loop steps the world once for all rovers)
+    def capture_frame(self):
+        img, [resX, resY] = self.sim.getVisionSensorImg(self.camera_handle)
+        rover_matrix = self.sim.getObjectMatrix(self.handle, -1)
+        return img, resX, resY, rover_matrix
+
     def detect_marker(self, visualise_image=False):
-        self.sim.step()
+        return self.process_frame(self.capture_frame(), visualise_image)
+
+    def process_frame(self, frame, visualise_image=False):
+        img, resX, resY, rover_matrix = frame
         # matrix = markerdetector.get_camera_location()
-        # get image
-        img, [resX, resY] = self.sim.getVisionSensorImg(self.camera_handle)
+        # decode image
         img = np.frombuffer(img, dtype=np.uint8).reshape(resY, resX, 3)
         img = cv2.flip(cv2.cvtColor(img, cv2.COLOR_BGR2RGB), 0)
         # find markers
@@ -112,117 +289,81 @@ class Rover:
                 #rvec = marker[1]
                 tvec = marker[2]
                 rotm = marker[3]
-                marker_position, marker_orientation = self.detector.calculate_marker_location(tvec, rotm)
+                marker_position, marker_orientation = self.detector.calculate_marker_location(tvec, rotm, rover_matrix)
                 # print(f"Found marker! \n at:{marker_position[0]},{marker_position[1]},{marker_position[2]}  \n with orientation:{marker_orientation[0]},{marker_orientation[1]},{marker_orientation[2]}")
                 detected.append([id, marker_position[0], marker_position[1], 10])
 
         return detected
 
-    # return position
+    # return position (kept by mover once created, only mover moves the rover)
     def get_position(self):
+        if hasattr(self, 'mover'):
+            return list(self.mover.pos)
         pos = self.sim.getObjectPosition(self.handle, -1)
         return pos  # np. [x, y, z]
 
     # use planner to find path
-    def find_path(self, goal, obstacles):
-        # update map state
-        self.planner.update_state(self.get_position(), goal, obstacles)
-        # get path
-        self.planner.plan()
-        # if path empty then try 15 times with more steps
-        i = 0
-        while self.planner.path_ is None or i >15:
-            self.planner.increase_iterations()
-            self.planner.plan()
-            i+=1
+    def find_path(self, goal, obstacles, start=None):
+        # update map state and plan, if path empty then try 15 times with more steps
+        # repeated trips (same start cell, field and static obstacles) reuse path from shared cache
+        plan_with_retries(self.planner, start if start is not None else self.get_position(), goal, obstacles, cache=shared_path_cache())
         # if still not path then there is none avalible, set you position as point
         if self.planner.path_ is None:
-            self.planner.path_=[self.position]
+            self.planner.path_=[self.get_position()]
             print("No path found, setting position as goal")
 
 
-    # solar panel deployment
+    # solar panel deployment (queued animation)
     def deploy_rover_panel(self):
-        deploy_solar_panels(self.sim, self.name)
+        self.animations.add(deploy_solar_panels_frames(self.sim, self.name, handles=self.handles))
 
-    # solar panel retraction
+    # solar panel retraction (queued animation)
     def retract_rover_panel(self):
-        retract_solar_panels(self.sim, self.name)
+        self.animations.add(retract_solar_panels_frames(self.sim, self.name, handles=self.handles))
 
-    # arm deployment
+    # arm deployment (queued animation)
     def deploy_rover_arm(self):
-        deploy_arm(self.sim, self.name)
-        grip(self.sim, self.name, 0.5)
+        self.animations.add(deploy_arm_frames(self.sim, self.name, self.handles))
+        self.animations.add(grip_frames(self.sim, self.name, 0.5, self.handles))
 
-    # arm retraction
+    # arm retraction (queued animation)
     def retract_rover_arm(self):
-        retract_arm(self.sim, self.name)
-        grip(self.sim, self.name, 1.0)
+        self.animations.add(retract_arm_frames(self.sim, self.name, self.handles))
+        self.animations.add(grip_frames(self.sim, self.name, 1.0, self.handles))
 
+    # returns new field parameters for report_task_completed (None if field is not changed)
     def perform_task(self, task):
         # symulacja pracy — np. czasowa pauza, ruch ramienia, pomiar
         logging.info(f"[{self.name}] Wykonuję zadanie: {task['type']} na polu {task['field_name']}.")
         if task['type'] == "adjust_pH":
-            self.centrala.fields[task['field_name']].pH = 7.0
+            field_data = {'name': task['field_name'], 'pH': 7.0}
             self.deploy_rover_arm()
             self.retract_rover_arm()
-            print(f"Nowe pH w polu {task['field_name']}: {self.centrala.fields[task['field_name']].pH}")
+            print(f"Nowe pH w polu {task['field_name']}: {field_data['pH']}")
+            return field_data
         elif task['type'] == "restore_humidity":
-            self.centrala.fields[task['field_name']].humidity = random.uniform(60, 75)
+            field_data = {'name': task['field_name'], 'humidity': random.uniform(60, 75)}
             self.deploy_rover_arm()
             self.retract_rover_arm()
-            print(f"Nowa wilgotność w polu {task['field_name']}: {self.centrala.fields[task['field_name']].humidity}")
-        elif task['type'] == 'explore_point':
+            print(f"Nowa wilgotność w polu {task['field_name']}: {field_data['humidity']}")
+            return field_data
+        elif task['type'] in ('explore_point', 'explore_route'):
             if self.discovered_markers:
-                for point in self.discovered_markers:
-                    marker_id = point[0]
-                    position = [point[1], point[2], 1]
-                    # na razie uproszczone
-                    field_parameters_from_scan = {'humidity': 40}
-                    self.centrala.report_discovered_field(self.name, marker_id, position, field_parameters_from_scan)
-                # zgłoś i wyczyść
+                # punkty zgłoszone już przy wykryciu, tylko wyczyść
                 logging.info(f"[{self.name}] Przesłano odkryte punkty w liczbie {len(self.discovered_markers)}, są nimi: {self.discovered_markers}")
                 self.discovered_markers = []
         elif task['type'] == "visit_scan":
-            pass
+            # tylko czas wizyty (centrala ustawia last_visited_time)
+            return {'name': task['field_name']}
     
+    # with shared occupancy map from centrala only other rovers are passed to planner
+    def find_planning_obstacles(self, goal):
+        occupancy_map = self.centrala.occupancy_map
+        self.planner.set_occupancy_map(occupancy_map)
+        if occupancy_map is None:
+            return self.find_obstacles(self.sim, goal)
+        return self.centrala.get_dynamic_obstacles_for_rover(self.name)
+
+    # centrala and rocks from shared registry (scene enumerated once, not on every plan)
     def find_obstacles(self, sim, goal):
-        obstacles = []
-        centrala_handle = sim.getObject('/Centrala')
-        position = sim.getObjectPosition(centrala_handle, -1)
-        x, y = position[0], position[1]
-        z = 0.5*1.5
-        centrala_pos = [x, y, z]
-        obstacles.append(centrala_pos)
-        rover_x, rover_y, rover_z = self.get_position()
-        margin = 0.25
-        """
-        i = 0
-        while True:
-                name = f'Plane[{i}]'
-                try:
-                    handle = sim.getObject(f'/{name}')
-                except Exception:
-                    break
-
-                position = sim.getObjectPosition(handle, -1)
-                x, y = position[0], position[1]
-
-                if [x, y] != [goal[0], goal[1]] and (abs(x - rover_x) > margin or abs(y - rover_y) > margin):
-                    obstacles.append((x, y, 1.0)) 
-                i += 1
-        """
-        i = 0
-        while True:
-                name = f'Rock[{i}]'
-                try:
-                    handle = sim.getObject(f'/{name}')
-                except Exception:
-                    break
-
-                position = sim.getObjectPosition(handle, -1)
-                #print(position)
-                x, y = position[0], position[1]
-                obstacles.append((x, y, 0.50)) 
-                i += 1
-        return obstacles 
\ No newline at end of file
+        return self.centrala.obstacle_registry.get_obstacles()
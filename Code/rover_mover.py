@@ -3,8 +3,10 @@ import numpy as np
 import logging
 
 class RoverMover:
-    def __init__(self, sim, name, path, v=1.0, alpha=0.1):
+    def __init__(self, sim, name, path, v=1.0, alpha=0.1, batch=None):
         self.sim = sim
+        # optional SimBatch, writes are then sent once per step for all rovers
+        self.batch = batch
         self.name = name
         self.path = path
         self.v = v
@@ -16,9 +18,10 @@ class RoverMover:
         self.dt = sim.getSimulationTimeStep()
         self.pos = sim.getObjectPosition(self.handle, -1)
         self.z = self.pos[2]
+        # pose is kept locally, mover is the only one moving the rover
+        self.yaw = sim.getObjectOrientation(self.handle, -1)[2]
 
     def step(self):
-        self.pos = self.sim.getObjectPosition(self.handle, -1)
         if self.done or self.goal_index >= len(self.path):
             self.done = True
             return
@@ -34,15 +37,21 @@ class RoverMover:
 
         # Orientacja
         target_yaw = self.wrap_to_pi(np.arctan2(dy, dx))
-        current_yaw =  self.wrap_to_pi(self.sim.getObjectOrientation(self.handle, -1)[2])
+        current_yaw =  self.wrap_to_pi(self.yaw)
         interpolated_yaw =  self.wrap_to_pi((1 - self.alpha) * current_yaw + self.alpha * target_yaw)
-        self.sim.setObjectOrientation(self.handle, -1, [0, 0, interpolated_yaw])
+        self.yaw = interpolated_yaw
 
         # Pozycja
         x = self.pos[0] + self.dt * self.v * math.cos(target_yaw)
         y = self.pos[1] + self.dt * self.v * math.sin(target_yaw)
         self.pos = [x, y, self.z]
-        self.sim.setObjectPosition(self.handle, -1, self.pos)
+
+        if self.batch is not None:
+            self.batch.set_object_orientation(self.handle, -1, [0, 0, interpolated_yaw])
+            self.batch.set_object_position(self.handle, -1, self.pos)
+        else:
+            self.sim.setObjectOrientation(self.handle, -1, [0, 0, interpolated_yaw])
+            self.sim.setObjectPosition(self.handle, -1, self.pos)
 
     def wrap_to_pi(self, angle):
         return (angle + np.pi) % (2 * np.pi) - np.pi
@@ -2,11 +2,10 @@ from enum import Enum
 import logging
 import time
 
-from coppeliasim_zmqremoteapi_client import RemoteAPIClient
-
 from Code.sliding_solar_panel import deploy_solar_panels, retract_solar_panels
 from Code.day_night_cycle import DayNightCycle
 from Code.move_arm import deploy_arm, retract_arm
+from Code.sim_clock import WallClock
 
 
 def multiton(cls):
@@ -44,8 +43,9 @@ class Battery:
         ActivityState.CHARGING: 10,
     }
 
-    def __init__(self):
-        self._last_tick_time = 0
+    def __init__(self, clock=None):
+        self._clock = clock if clock is not None else WallClock()
+        self._last_tick_time = None
         self._charge = 100
 
     def _clamp_charge(self):
@@ -53,6 +53,9 @@ class Battery:
             Battery.MIN_CAPACITY, min(self._charge, Battery.MAX_CAPACITY)
         )
 
+    def charge(self):
+        return self._charge
+
     def is_empty(self):
         return self._charge == Battery.MIN_CAPACITY
 
@@ -60,15 +63,17 @@ class Battery:
         return self._charge == Battery.MAX_CAPACITY
 
     def _is_timeout(self):
-        current_time = time.time()
-        return current_time - self._last_tick_time < self.UPDATE_INTERVAL_SECS
+        if self._last_tick_time is None:
+            return False
+        # tolerance for float sum of simulation time steps
+        return self._clock.now() - self._last_tick_time < self.UPDATE_INTERVAL_SECS - 1e-9
 
 
     def tick(self, id, activity_state: ActivityState, has_charging_conditions: bool):
         if self._is_timeout():
             return
 
-        self._last_tick_time = time.time()
+        self._last_tick_time = self._clock.now()
         prev_charge = self._charge
         if activity_state == ActivityState.CHARGING and not has_charging_conditions:
             pass
@@ -92,7 +97,7 @@ class RoverState:
         self._activity_state = ActivityState.IDLE
         self._prev_action = None
         # Battery
-        self._battery = Battery()
+        self._battery = Battery(getattr(rover_ref, 'clock', None))
 
     def battery(self):
         return self._battery
@@ -193,6 +198,7 @@ if __name__ == "__main__":
         datefmt="%H:%M:%S",
     )
 
+    from coppeliasim_zmqremoteapi_client import RemoteAPIClient
     client = RemoteAPIClient()
     sim = client.require('sim')
     sim.startSimulation()
@@ -3,6 +3,11 @@ import random
 import numpy as np
 import math
 import os
+import threading
+from collections import OrderedDict
+from Code.spatial_index import create_index
+from Code.collision_checker import create_checker
+from Code.samplers import create_sampler, sampling_bounds
 
 """
 obstacle list -> [(x,y,r), (x1,y1,r1), (x2,y2,r2)], gdzie:
@@ -17,43 +22,177 @@ class Node:
         self.parent_ = None
         self.cost_= 0
 
+# load common planner params
+def load_config():
+    config_path = os.path.join(os.path.dirname(__file__), "rrt_star_config.yaml")
+    with open(config_path, 'r') as file:
+        config = yaml.safe_load(file)
+    return config
+
+# create planner backend chosen in config (backend: node | array | informed | prm), config from yaml if not given
+def create_planner(sim, start, goal, obstacle_list, config=None):
+    if config is None:
+        config = load_config()
+    backend = config.get('backend', 'node')
+    if backend == 'node':
+        return RRTStar(sim, start, goal, obstacle_list, config)
+    if backend == 'array':
+        from Code.rrt_star_array import RRTStarArray
+        return RRTStarArray(sim, start, goal, obstacle_list, config)
+    if backend == 'informed':
+        from Code.informed_rrt_star import InformedRRTStar
+        return InformedRRTStar(sim, start, goal, obstacle_list, config)
+    if backend == 'prm':
+        from Code.prm import PRMPlanner
+        return PRMPlanner(sim, start, goal, obstacle_list, config)
+    raise ValueError(f"Unknown planner backend: {backend}")
+
+# signature of static obstacles: occupancy map version or rounded obstacle list
+def static_signature(obstacles, occupancy_map=None):
+    if occupancy_map is not None:
+        # map_id_ is never reused, unlike id() of a collected map
+        return ('map', occupancy_map.map_id_, occupancy_map.version_)
+    return ('list', hash(tuple(sorted((round(o[0], 3), round(o[1], 3), round(o[2], 3)) for o in obstacles))))
+
+class PathCache:
+    """
+    Pamięć podręczna ścieżek wspólna dla wszystkich łazików (LRU).
+    Klucz: (komórka startu, komórka celu, sygnatura statycznych przeszkód).
+    Przed ponownym użyciem ścieżka jest sprawdzana checkerem z aktualnymi przeszkodami
+    (w tym łazikami), a pierwszy punkt zastępowany faktycznym startem.
+    """
+    def __init__(self, capacity=64, cell_size=0.25):
+        self.capacity_ = capacity
+        self.cell_size_ = cell_size
+        self.paths_ = OrderedDict()
+        self.lock_ = threading.Lock()
+        self.hits_ = 0
+        self.misses_ = 0
+
+    def _cell(self, point):
+        return (math.floor(point[0] / self.cell_size_), math.floor(point[1] / self.cell_size_))
+
+    def key(self, start, goal, signature):
+        return (self._cell(start), self._cell(goal), signature)
+
+    # cached path adjusted to start, None if missing or blocked now
+    def get(self, key, start, goal, checker, goal_radius):
+        with self.lock_:
+            path = self.paths_.get(key)
+            if path is not None:
+                self.paths_.move_to_end(key)
+        if path is None or math.hypot(path[-1][0] - goal[0], path[-1][1] - goal[1]) >= goal_radius:
+            self._count(False)
+            return None
+        path = [[start[0], start[1]]] + [list(point) for point in path[1:]]
+        points = np.array(path, dtype=float)
+        if len(points) > 1 and checker.segments_collide(points[:-1], points[1:]).any():
+            self._count(False)
+            return None
+        self._count(True)
+        return path
+
+    # counters shared by planner threads, updated under lock
+    def _count(self, hit):
+        with self.lock_:
+            if hit:
+                self.hits_ += 1
+            else:
+                self.misses_ += 1
+
+    def put(self, key, path):
+        with self.lock_:
+            self.paths_[key] = [list(point[:2]) for point in path]
+            self.paths_.move_to_end(key)
+            while len(self.paths_) > self.capacity_:
+                self.paths_.popitem(last=False)
+
+    def clear(self):
+        with self.lock_:
+            self.paths_.clear()
+
+_path_cache = None
+_path_cache_lock = threading.Lock()
+
+# path cache shared by all rovers (path_cache_size: 0 disables it)
+def shared_path_cache():
+    global _path_cache
+    with _path_cache_lock:
+        if _path_cache is None:
+            config = load_config()
+            capacity = config.get('path_cache_size', 64)
+            if not capacity:
+                return None
+            _path_cache = PathCache(capacity, config.get('path_cache_cell_size', 0.25))
+        return _path_cache
+
+# plan from start to goal, if path not found try again up to retries times with more iterations
+def plan_with_retries(planner, start, goal, obstacles, retries=15, cache=None):
+    planner.update_state(start, goal, obstacles)
+    if cache is not None:
+        # static part of key, dynamic obstacles are checked on reuse
+        static_obstacles = [] if planner.occupancy_map_ is not None else obstacles
+        key = cache.key(start, goal, static_signature(static_obstacles, planner.occupancy_map_))
+        path = cache.get(key, start, goal, planner.checker_, planner.goal_radius_)
+        if path is not None:
+            planner.path_ = path
+            planner.goal_reached_ = True
+            return path
+    planner.plan()
+    i = 0
+    while planner.path_ is None and i < retries:
+        planner.increase_iterations()
+        planner.plan()
+        i += 1
+    if cache is not None and planner.path_ is not None:
+        cache.put(key, planner.path_)
+    return planner.path_
+
 class RRTStar:
-    def __init__(self, sim,  start, goal, obstacle_list):
+    def __init__(self, sim,  start, goal, obstacle_list, config=None):
         self.sim_ = sim
         # common params for rrt*, constant in simulation, need to be fit for enviroment
-        config_path = os.path.join(os.path.dirname(__file__), "rrt_star_config.yaml")
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
+        if config is None:
+            config = load_config()
         self.map_size_ub_ = config['map_size_ub']
         self.map_size_lb_ = config['map_size_lb']
         self.step_size_ = config['step_size']
         self.max_ierations_ = config['max_ierations']
+        # iteration budget of single query, increase_iterations grows it only until next update_state
+        self.base_iterations_ = self.max_ierations_
         self.generate_chance_ = config['generate_chance']
         self.search_radius_ = config['search_radius']
         self.goal_radius_ = config['goal_radius']
+        self.config_ = config
+        # spatial index for nearest/neighbor queries
+        self.index_ = create_index(config)
+        # batched point sampler, bounds set for every query
+        self.sampler_ = create_sampler(config)
         # individual params for each rover
         self.start_ = Node(start[0], start[1])
         self.goal_ = Node(goal[0], goal[1])
         self.obstacles_ = obstacle_list
-        self.node_list_ = [self.start_]
+        self.occupancy_map_ = None
+        self.checker_ = create_checker(obstacle_list, config)
+        self.node_list_ = []
+        self.add_node(self.start_)
         self.path_ = None
         self.goal_reached_ = False
 
     # generate random node in space (with chance to generate target)
     def generate_node(self):
-        if random.randint(0, 1) > self.generate_chance_:
-            new_node = Node(random.uniform(self.map_size_lb_[0], self.map_size_ub_[0]), random.uniform(self.map_size_lb_[1], self.map_size_ub_[1]))
-        else:
-            new_node = self.goal_
-        return new_node
+        if random.random() < self.generate_chance_:
+            return self.goal_
+        return Node(*self.sampler_.sample())
+
+    # add node to tree and spatial index
+    def add_node(self, node):
+        self.node_list_.append(node)
+        self.index_.insert(node)
 
     # find in tree node nearest to given one
     def get_nearest_node(self, target_node):
-        distances = []
-        for candidate in self.node_list_:
-            distances.append(np.linalg.norm([target_node.x_ - candidate.x_, target_node.y_ - candidate.y_]))
-        nearest_node = self.node_list_[np.argmin(distances)]
-        return nearest_node
+        return self.index_.nearest(target_node.x_, target_node.y_)
     
     # generate node in direction to target node
     def steer(self, from_node, target_node):
@@ -67,41 +206,43 @@ class RRTStar:
 
     # check for collision with obstalces
     def check_collision(self, node):
-        for obstacle in self.obstacles_:
-            distance = np.linalg.norm([node.x_ - obstacle[0], node.y_ - obstacle[1]])
-            if distance <= obstacle[2]:
-                return True
-        return False
+        return self.checker_.point_collides(node.x_, node.y_)
+
+    # check if edge between nodes crosses any obstacle
+    def check_edge_collision(self, from_node, to_node):
+        return self.checker_.segment_collides(from_node.x_, from_node.y_, to_node.x_, to_node.y_)
 
     # find nodes nearby given node (in search_radius) 
     def find_neighbors(self, node):
-        neighbors = []
-        for candidate in self.node_list_:
-            distance = np.linalg.norm([node.x_ - candidate.x_, node.y_ - candidate.y_])
-            if distance <= self.search_radius_:
-                neighbors.append(candidate)
-        return neighbors 
+        return self.index_.within(node.x_, node.y_, self.search_radius_)
 
     # choose parent for new node (from nearest and neighbours)
     def choose_parent(self, neighbors, closest_node, node):
         # define node to which given node will be connected to
         min_cost = closest_node.cost_ + np.linalg.norm([node.x_ - closest_node.x_, node.y_ - closest_node.y_])
         best_node = closest_node
-        # check if there isnt better option in neighbouring nodes
-        for candidate in neighbors:
-            cand_cost = candidate.cost_ + np.linalg.norm([node.x_ - candidate.x_, node.y_ - candidate.y_])
-            if (cand_cost < min_cost) and not self.check_collision(candidate):
-                min_cost = cand_cost
-                best_node = candidate
+        # check if there isnt better option in neighbouring nodes (edges checked in one batch)
+        if neighbors:
+            coords = np.array([[candidate.x_, candidate.y_] for candidate in neighbors])
+            blocked = self.checker_.segments_collide(coords, [node.x_, node.y_])
+            for candidate, candidate_blocked in zip(neighbors, blocked):
+                cand_cost = candidate.cost_ + math.hypot(node.x_ - candidate.x_, node.y_ - candidate.y_)
+                if (cand_cost < min_cost) and not candidate_blocked:
+                    min_cost = cand_cost
+                    best_node = candidate
         node.cost_ = min_cost
         node.parent_ = best_node
         return node
 
      # check for better connections between nodes (setting new node as parent of nodes in radius)
     def rewire(self, neighbors, node):
-         for candidate in neighbors:
-            cand_cost = node.cost_ + np.linalg.norm([node.x_ - candidate.x_, node.y_ - candidate.y_])
-            if (cand_cost < candidate.cost_) and not self.check_collision(candidate):
+        if not neighbors:
+            return
+        coords = np.array([[candidate.x_, candidate.y_] for candidate in neighbors])
+        blocked = self.checker_.segments_collide(coords, [node.x_, node.y_])
+        for candidate, candidate_blocked in zip(neighbors, blocked):
+            cand_cost = node.cost_ + math.hypot(node.x_ - candidate.x_, node.y_ - candidate.y_)
+            if (cand_cost < candidate.cost_) and not candidate_blocked:
                 candidate.cost_ = cand_cost
                 candidate.parent_ = node
 
@@ -132,25 +273,34 @@ class RRTStar:
             new_node = self.steer(nearest_node, random_node)
 
             #if no collision then add to treee and try to optimize connections
-            if not self.check_collision(new_node):
+            if not self.check_edge_collision(nearest_node, new_node):
                 neighbors = self.find_neighbors(new_node)
                 new_node = self.choose_parent(neighbors, nearest_node, new_node)
-                self.node_list_.append(new_node)
+                self.add_node(new_node)
                 self.rewire(neighbors, new_node)
 
-            # return path if near goal
-            if self.check_goal(new_node):
-                self.path_ = self.generate_path(new_node)
-                self.goal_reached_ = True
-                return
+                # return path if near goal (only nodes added with collision free edge)
+                if self.check_goal(new_node):
+                    self.path_ = self.generate_path(new_node)
+                    self.goal_reached_ = True
+                    return
     
     def update_state(self, new_start, new_goal, new_obstacles):
         self.start_ = Node(new_start[0], new_start[1])
         self.goal_ = Node(new_goal[0], new_goal[1])
         self.obstacles_ = new_obstacles
-        self.node_list_ = [self.start_]
+        self.checker_ = create_checker(new_obstacles, self.config_, self.occupancy_map_, [new_start, new_goal])
+        self.max_ierations_ = self.base_iterations_
+        self.sampler_.set_bounds(*sampling_bounds(self.config_, new_start, new_goal, new_obstacles, self.occupancy_map_))
+        self.node_list_ = []
+        self.index_.clear()
+        self.add_node(self.start_)
         self.path_ = None
         self.goal_reached_ = False
     
     def increase_iterations(self):
-        self.max_ierations_ = math.ceil(1.2*self.max_ierations_)
\ No newline at end of file
+        self.max_ierations_ = math.ceil(1.2*self.max_ierations_)
+
+    # use shared occupancy map for static obstacles, obstacle list passed to update_state is then only dynamic
+    def set_occupancy_map(self, occupancy_map):
+        self.occupancy_map_ = occupancy_map
@@ -0,0 +1,152 @@
+import random
+import numpy as np
+import math
+from Code.rrt_star import load_config
+from Code.collision_checker import create_checker
+from Code.samplers import create_sampler, sampling_bounds
+
+"""
+RRT* z drzewem trzymanym w tablicach numpy zamiast obiektów Node:
+    coords_  -> (n, 2) współrzędne węzłów
+    costs_   -> (n,) koszt dojścia od startu
+    parents_ -> (n,) indeks rodzica (-1 dla startu)
+Interfejs (update_state, plan, increase_iterations, path_) jak w RRTStar.
+"""
+
+class RRTStarArray:
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, sim, start, goal, obstacle_list, config=None):
+        self.sim_ = sim
+        # common params for rrt*, constant in simulation, need to be fit for enviroment
+        if config is None:
+            config = load_config()
+        self.map_size_ub_ = config['map_size_ub']
+        self.map_size_lb_ = config['map_size_lb']
+        self.step_size_ = config['step_size']
+        self.max_ierations_ = config['max_ierations']
+        # iteration budget of single query, increase_iterations grows it only until next update_state
+        self.base_iterations_ = self.max_ierations_
+        self.generate_chance_ = config['generate_chance']
+        self.search_radius_ = config['search_radius']
+        self.goal_radius_ = config['goal_radius']
+        self.config_ = config
+        self.occupancy_map_ = None
+        # batched point sampler, bounds set for every query
+        self.sampler_ = create_sampler(config)
+        # preallocated tree storage, grown by doubling
+        self.coords_ = np.empty((self.INITIAL_CAPACITY, 2))
+        self.costs_ = np.empty(self.INITIAL_CAPACITY)
+        self.parents_ = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self.update_state(start, goal, obstacle_list)
+
+    def update_state(self, new_start, new_goal, new_obstacles):
+        self.start_ = (new_start[0], new_start[1])
+        self.goal_ = (new_goal[0], new_goal[1])
+        self.obstacles_ = new_obstacles
+        self.checker_ = create_checker(new_obstacles, self.config_, self.occupancy_map_, [new_start, new_goal])
+        self.max_ierations_ = self.base_iterations_
+        self.sampler_.set_bounds(*sampling_bounds(self.config_, new_start, new_goal, new_obstacles, self.occupancy_map_))
+        self.count_ = 0
+        self.add_node(self.start_[0], self.start_[1], 0.0, -1)
+        self.path_ = None
+        self.goal_reached_ = False
+
+    def _grow(self):
+        capacity = 2 * len(self.costs_)
+        coords = np.empty((capacity, 2))
+        coords[:self.count_] = self.coords_[:self.count_]
+        costs = np.empty(capacity)
+        costs[:self.count_] = self.costs_[:self.count_]
+        parents = np.empty(capacity, dtype=np.int64)
+        parents[:self.count_] = self.parents_[:self.count_]
+        self.coords_, self.costs_, self.parents_ = coords, costs, parents
+
+    # add node to tree, return its index
+    def add_node(self, x, y, cost, parent):
+        if self.count_ == len(self.costs_):
+            self._grow()
+        index = self.count_
+        self.coords_[index] = (x, y)
+        self.costs_[index] = cost
+        self.parents_[index] = parent
+        self.count_ += 1
+        return index
+
+    # generate random point in space (with chance to generate target)
+    def generate_point(self):
+        if random.random() < self.generate_chance_:
+            return self.goal_
+        return self.sampler_.sample()
+
+    # distances from point to every node in tree
+    def distances_to(self, x, y):
+        tree = self.coords_[:self.count_]
+        return np.hypot(tree[:, 0] - x, tree[:, 1] - y)
+
+    # generate point in direction to target point
+    def steer(self, from_index, target):
+        from_x, from_y = self.coords_[from_index]
+        theta = math.atan2(target[1] - from_y, target[0] - from_x)
+        return from_x + self.step_size_ * math.cos(theta), from_y + self.step_size_ * math.sin(theta)
+
+    # check if edge from tree node to point crosses any obstacle
+    def check_edge_collision(self, from_index, x, y):
+        return self.checker_.segment_collides(self.coords_[from_index, 0], self.coords_[from_index, 1], x, y)
+
+    # choose parent for new point among neighbours with free edge (nearest edge is already checked)
+    def choose_parent(self, neighbors, distances, nearest_index, x, y):
+        neighbors = neighbors[~self.checker_.segments_collide(self.coords_[neighbors], [x, y])]
+        candidates = np.append(neighbors, nearest_index)
+        candidate_costs = self.costs_[candidates] + distances[candidates]
+        best = int(np.argmin(candidate_costs))
+        return int(candidates[best]), float(candidate_costs[best])
+
+    # set new node as parent of neighbours if it makes them cheaper and edge is free
+    def rewire(self, neighbors, distances, new_index):
+        new_costs = self.costs_[new_index] + distances[neighbors]
+        better = new_costs < self.costs_[neighbors]
+        if np.any(better):
+            better[better] = ~self.checker_.segments_collide(self.coords_[neighbors[better]], self.coords_[new_index])
+        self.costs_[neighbors[better]] = new_costs[better]
+        self.parents_[neighbors[better]] = new_index
+
+    # check if goal is in goal_radius
+    def check_goal(self, x, y):
+        return math.hypot(x - self.goal_[0], y - self.goal_[1]) < self.goal_radius_
+
+    # generate path from given node to start and reverse
+    def generate_path(self, index):
+        path = []
+        while index != -1:
+            path.append([float(self.coords_[index, 0]), float(self.coords_[index, 1])])
+            index = int(self.parents_[index])
+        return path[::-1]
+
+    # main loop of algoritm
+    def plan(self):
+        for i in range(self.max_ierations_):
+            target = self.generate_point()
+            nearest_index = int(np.argmin(self.distances_to(target[0], target[1])))
+            new_x, new_y = self.steer(nearest_index, target)
+
+            # if no collision then add to tree and try to optimize connections
+            if not self.check_edge_collision(nearest_index, new_x, new_y):
+                distances = self.distances_to(new_x, new_y)
+                neighbors = np.flatnonzero(distances <= self.search_radius_)
+                parent, cost = self.choose_parent(neighbors, distances, nearest_index, new_x, new_y)
+                new_index = self.add_node(new_x, new_y, cost, parent)
+                self.rewire(neighbors, distances, new_index)
+
+                # return path if near goal
+                if self.check_goal(new_x, new_y):
+                    self.path_ = self.generate_path(new_index)
+                    self.goal_reached_ = True
+                    return
+
+    def increase_iterations(self):
+        self.max_ierations_ = math.ceil(1.2*self.max_ierations_)
+
+    # use shared occupancy map for static obstacles, obstacle list passed to update_state is then only dynamic
+    def set_occupancy_map(self, occupancy_map):
+        self.occupancy_map_ = occupancy_map
@@ -0,0 +1,92 @@
+import numpy as np
+from scipy.stats import qmc
+
+"""
+Losowanie punktów dla planerów RRT*. Punkty są generowane paczkami (sampling_batch)
+w kwadracie jednostkowym i skalowane do aktualnego obszaru:
+    uniform -> numpy random
+    halton  -> ciąg Haltona (scipy.stats.qmc, z mieszaniem)
+    sobol   -> ciąg Sobola (scipy.stats.qmc, z mieszaniem)
+Obszar losowania to cała mapa albo (sampling_region: obstacles) prostokąt obejmujący
+start, cel i znane przeszkody (centrala, skały, pola) powiększony o sampling_margin.
+"""
+
+class UniformSampler:
+    def __init__(self, lower_bound, upper_bound, batch_size=256, seed=None):
+        self.batch_size_ = batch_size
+        self.rng_ = np.random.default_rng(seed)
+        self.batch_ = np.empty((0, 2))
+        self.next_ = 0
+        self.set_bounds(lower_bound, upper_bound)
+
+    def set_bounds(self, lower_bound, upper_bound):
+        self.lb_ = np.array(lower_bound[:2], dtype=float)
+        self.size_ = np.array(upper_bound[:2], dtype=float) - self.lb_
+
+    # (n, 2) points in unit square
+    def _unit_batch(self, count):
+        return self.rng_.random((count, 2))
+
+    # single point (x, y), taken from current batch
+    def sample(self):
+        if self.next_ == len(self.batch_):
+            self.batch_ = self._unit_batch(self.batch_size_)
+            self.next_ = 0
+        u = self.batch_[self.next_]
+        self.next_ += 1
+        return float(self.lb_[0] + u[0] * self.size_[0]), float(self.lb_[1] + u[1] * self.size_[1])
+
+    # (count, 2) points at once
+    def sample_many(self, count):
+        return self.lb_ + self._unit_batch(count) * self.size_
+
+
+class HaltonSampler(UniformSampler):
+    def __init__(self, lower_bound, upper_bound, batch_size=256, seed=None):
+        self.engine_ = qmc.Halton(d=2, scramble=True, seed=seed)
+        super().__init__(lower_bound, upper_bound, batch_size, seed)
+
+    def _unit_batch(self, count):
+        return self.engine_.random(count)
+
+
+class SobolSampler(UniformSampler):
+    def __init__(self, lower_bound, upper_bound, batch_size=256, seed=None):
+        self.engine_ = qmc.Sobol(d=2, scramble=True, seed=seed)
+        # sobol points keep their balance properties only in powers of 2
+        batch_size = 1 << max(int(batch_size) - 1, 1).bit_length()
+        super().__init__(lower_bound, upper_bound, batch_size, seed)
+
+    def _unit_batch(self, count):
+        return self.engine_.random(count)
+
+
+SAMPLERS = {
+    'uniform': UniformSampler,
+    'halton': HaltonSampler,
+    'sobol': SobolSampler,
+}
+
+# sampler chosen in config (sampler: uniform | halton | sobol) over whole map
+def create_sampler(config):
+    name = config.get('sampler', 'uniform')
+    if name not in SAMPLERS:
+        raise ValueError(f"Unknown sampler: {name}")
+    return SAMPLERS[name](config['map_size_lb'], config['map_size_ub'], config.get('sampling_batch', 256), config.get('sampling_seed'))
+
+# sampling bounds for query, whole map or box around start, goal and known obstacles
+def sampling_bounds(config, start, goal, obstacles, occupancy_map=None):
+    lower_bound = np.array(config['map_size_lb'][:2], dtype=float)
+    upper_bound = np.array(config['map_size_ub'][:2], dtype=float)
+    if config.get('sampling_region', 'map') != 'obstacles':
+        return lower_bound, upper_bound
+    discs = [obstacle[:3] for obstacle in obstacles]
+    if occupancy_map is not None:
+        discs.extend(occupancy_map.obstacles_)
+    discs.append((start[0], start[1], 0.0))
+    discs.append((goal[0], goal[1], 0.0))
+    discs = np.array(discs, dtype=float)
+    margin = config.get('sampling_margin', 1.0)
+    lower = np.maximum((discs[:, :2] - discs[:, 2:]).min(axis=0) - margin, lower_bound)
+    upper = np.minimum((discs[:, :2] + discs[:, 2:]).max(axis=0) + margin, upper_bound)
+    return lower, upper
@@ -0,0 +1,134 @@
+import logging
+
+"""
+Warstwa dostępu do symulatora zbierająca odczyty i zapisy wszystkich łazików w jednym kroku
+symulacji i wysyłająca je jednym wywołaniem (funkcja Lua misk_apply_batch w skrypcie
+doczepionym do pomocniczego obiektu MiskBatch). Jeśli skryptu nie da się zainstalować,
+operacje są wykonywane po kolei przez zwykłe API (bez zmian w działaniu).
+Obiekt MiskBatch jest usuwany ze sceny przez uninstall() przy zatrzymaniu (i od razu, gdy
+instalacja skryptu się nie powiedzie), aby kolejne uruchomienia nie zostawiały duplikatów.
+
+Użycie w pętli głównej:
+    for rover in rovers: rover.tick()   # set_object_position(...) itd. tylko kolejkują
+    batch.flush()                       # jeden round-trip ZMQ
+    sim.step()
+    ...
+    batch.uninstall()                   # przed sim.stopSimulation()
+"""
+
+LUA_HELPER = """
+function misk_apply_batch(writes, reads)
+    for i = 1, #writes do
+        local op = writes[i]
+        if op[1] == 'position' then
+            sim.setObjectPosition(op[2], op[3], op[4])
+        elseif op[1] == 'orientation' then
+            sim.setObjectOrientation(op[2], op[3], op[4])
+        end
+    end
+    local results = {}
+    for i = 1, #reads do
+        local op = reads[i]
+        if op[1] == 'position' then
+            results[i] = sim.getObjectPosition(op[2], op[3])
+        elseif op[1] == 'orientation' then
+            results[i] = sim.getObjectOrientation(op[2], op[3])
+        end
+    end
+    return results
+end
+"""
+
+class BatchResult:
+    # value of queued read, available after flush
+    def __init__(self):
+        self.value = None
+        self.ready = False
+
+
+class SimBatch:
+    HELPER_ALIAS = "MiskBatch"
+    HELPER_FUNCTION = "misk_apply_batch"
+
+    def __init__(self, sim):
+        self.sim_ = sim
+        self.script_ = None
+        self.dummy_ = None
+        # (kind, handle) -> [kind, handle, relative_to, value], last write in step wins
+        self.writes_ = {}
+        self.reads_ = []
+
+    # create helper object with customization script, returns True if batching is available
+    def install(self):
+        try:
+            self.dummy_ = self.sim_.createDummy(0.01)
+            self.sim_.setObjectAlias(self.dummy_, self.HELPER_ALIAS)
+            script = self.sim_.createScript(self.sim_.scripttype_customization, LUA_HELPER)
+            try:
+                self.sim_.setObjectParent(script, self.dummy_, True)
+            except Exception:
+                self.sim_.associateScriptWithObject(script, self.dummy_)
+            self.script_ = script
+        except Exception as e:
+            logging.warning(f"[SimBatch] Nie udało się zainstalować skryptu pomocniczego, operacje będą wysyłane pojedynczo: {e}")
+            # helper without script is not left in scene
+            self.uninstall()
+        return self.script_ is not None
+
+    # remove helper object and its script from scene, operations are then sent one by one
+    def uninstall(self):
+        handles = [handle for handle in (self.script_, self.dummy_) if handle is not None]
+        self.script_ = None
+        self.dummy_ = None
+        try:
+            # legacy associated script is not an object, it goes away with the dummy
+            self.sim_.removeObjects([handle for handle in handles if self.sim_.isHandle(handle)])
+        except Exception as e:
+            logging.warning(f"[SimBatch] Nie udało się usunąć obiektu {self.HELPER_ALIAS}: {e}")
+
+    def set_object_position(self, handle, relative_to, position):
+        self.writes_[('position', handle)] = ['position', handle, relative_to, list(position)]
+
+    def set_object_orientation(self, handle, relative_to, orientation):
+        self.writes_[('orientation', handle)] = ['orientation', handle, relative_to, list(orientation)]
+
+    def get_object_position(self, handle, relative_to):
+        return self._queue_read('position', handle, relative_to)
+
+    def get_object_orientation(self, handle, relative_to):
+        return self._queue_read('orientation', handle, relative_to)
+
+    def _queue_read(self, kind, handle, relative_to):
+        result = BatchResult()
+        self.reads_.append(([kind, handle, relative_to], result))
+        return result
+
+    def _apply_sequentially(self, writes, reads):
+        for kind, handle, relative_to, value in writes:
+            if kind == 'position':
+                self.sim_.setObjectPosition(handle, relative_to, value)
+            else:
+                self.sim_.setObjectOrientation(handle, relative_to, value)
+        results = []
+        for kind, handle, relative_to in reads:
+            if kind == 'position':
+                results.append(self.sim_.getObjectPosition(handle, relative_to))
+            else:
+                results.append(self.sim_.getObjectOrientation(handle, relative_to))
+        return results
+
+    # send all queued operations, writes are applied before reads
+    def flush(self):
+        if not self.writes_ and not self.reads_:
+            return
+        writes = list(self.writes_.values())
+        reads = [op for op, _ in self.reads_]
+        if self.script_ is not None:
+            results = self.sim_.callScriptFunction(self.HELPER_FUNCTION, self.script_, writes, reads)
+        else:
+            results = self._apply_sequentially(writes, reads)
+        for (_, result), value in zip(self.reads_, results or []):
+            result.value = value
+            result.ready = True
+        self.writes_ = {}
+        self.reads_ = []
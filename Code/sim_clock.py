@@ -0,0 +1,60 @@
+import time
+
+"""
+Wspólny zegar dla Centrali, baterii łazików i cyklu dnia i nocy:
+    WallClock - czas rzeczywisty (time.time()), pętle działają w osobnych wątkach jak dotąd
+    SimClock  - czas symulacji liczony z liczby kroków (start z sim.getSimulationTime(),
+                potem clock.step() po każdym sim.step() w pętli głównej, bez zapytań do
+                symulatora), pętle są wywoływane z pętli głównej (Centrala.tick)
+Wyniki ze SimClock nie zależą od obciążenia komputera - symulację można krokować tak szybko,
+jak pozwala procesor.
+"""
+
+class WallClock:
+    # loops driven by own threads and time.sleep
+    stepped = False
+
+    def now(self):
+        return time.time()
+
+
+class SimClock:
+    # loops driven by main loop, one step() per sim.step()
+    stepped = True
+
+    def __init__(self, sim):
+        self.sim_ = sim
+        self.time_step_ = sim.getSimulationTimeStep()
+        self.start_ = sim.getSimulationTime()
+        self.steps_ = 0
+
+    def step(self):
+        self.steps_ += 1
+
+    def now(self):
+        return self.start_ + self.steps_ * self.time_step_
+
+    # realign with simulator time (e.g. after pause or steps done outside main loop)
+    def sync(self):
+        self.start_ = self.sim_.getSimulationTime()
+        self.steps_ = 0
+
+
+class Interval:
+    # True from due() once per period of clock time (first call is always due)
+    def __init__(self, clock, period):
+        self.clock_ = clock
+        self.period_ = period
+        self.last_ = None
+
+    def due(self):
+        now = self.clock_.now()
+        # tolerance for float sum of time steps
+        if self.last_ is None or now - self.last_ >= self.period_ - 1e-9:
+            self.last_ = now
+            return True
+        return False
+
+    # clock time of next due() (now before first call)
+    def next_due(self):
+        return self.clock_.now() if self.last_ is None else self.last_ + self.period_
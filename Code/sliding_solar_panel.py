@@ -1,26 +1,28 @@
 # Kod do przetestowania poprawności zainstalowania biblioteki. Należy włączyć CoppeliaSim. Uruchomienie skryptu powinno uruchomić symulację w CoppeliaSim.
-from coppeliasim_zmqremoteapi_client import RemoteAPIClient
 import time
 
+from Code.handle_cache import handle_resolver
+from Code.animation import run_blocking
 
-def deploy_solar_panels(sim, rover_name: str, extension: float = 0.25, duration: float = 0.5):
+
+def deploy_solar_panels_frames(sim, rover_name: str, extension: float = 0.25, duration: float = 0.5, handles=None):
     """
     Wysuwa jednocześnie lewy i prawy panel słoneczny z łazika w CoppeliaSim.
+    Generator - yield po każdej klatce animacji, sim.step() wykonuje wywołujący.
 
     :param rover_name: nazwa łazika w scenie, np. 'Rover'
     :param extension: dystans wysuwania w metrach (domyślnie 0.25)
     :param duration: czas animacji w sekundach (domyślnie 2.0)
+    :param handles: opcjonalny HandleCache łazika (bez ponownego sim.getObject)
     """
+    handle = handle_resolver(sim, rover_name, handles)
 
     # Uchwyt do łazika
-    rover_handle = sim.getObject(f'/{rover_name}')
-
-    # Nazwy paneli
-    left_panel_path = f"/{rover_name}/SolarPanel_Left"
-    right_panel_path = f"/{rover_name}/SolarPanel_Right"
+    rover_handle = handle('')
 
-    left_panel_handle = sim.getObject(left_panel_path)
-    right_panel_handle = sim.getObject(right_panel_path)
+    # Uchwyty paneli
+    left_panel_handle = handle('SolarPanel_Left')
+    right_panel_handle = handle('SolarPanel_Right')
 
     # Pozycje startowe i końcowe
     start_pos_left = sim.getObjectPosition(left_panel_handle, rover_handle)
@@ -52,25 +54,29 @@ def deploy_solar_panels(sim, rover_name: str, extension: float = 0.25, duration:
         sim.setObjectPosition(left_panel_handle, rover_handle, interp_left)
         sim.setObjectPosition(right_panel_handle, rover_handle, interp_right)
 
-        sim.step()
+        yield
+
+def deploy_solar_panels(sim, rover_name: str, extension: float = 0.25, duration: float = 0.5, handles=None):
+    run_blocking(sim, deploy_solar_panels_frames(sim, rover_name, extension, duration, handles))
 
-def retract_solar_panels(sim, rover_name: str, extension: float = 0.25, duration: float = 1.0):
+def retract_solar_panels_frames(sim, rover_name: str, extension: float = 0.25, duration: float = 1.0, handles=None):
     """
     Chowa jednocześnie lewy i prawy panel słoneczny łazika w CoppeliaSim.
+    Generator - yield po każdej klatce animacji, sim.step() wykonuje wywołujący.
 
     :param rover_name: nazwa łazika w scenie, np. 'Rover'
     :param extension: dystans chowania w metrach (domyślnie 0.25)
     :param duration: czas animacji w sekundach (domyślnie 2.0)
+    :param handles: opcjonalny HandleCache łazika (bez ponownego sim.getObject)
     """
-    # Uchwyt do łazika
-    rover_handle = sim.getObject(f'/{rover_name}')
+    handle = handle_resolver(sim, rover_name, handles)
 
-    # Nazwy paneli
-    left_panel_path = f"/{rover_name}/SolarPanel_Left"
-    right_panel_path = f"/{rover_name}/SolarPanel_Right"
+    # Uchwyt do łazika
+    rover_handle = handle('')
 
-    left_panel_handle = sim.getObject(left_panel_path)
-    right_panel_handle = sim.getObject(right_panel_path)
+    # Uchwyty paneli
+    left_panel_handle = handle('SolarPanel_Left')
+    right_panel_handle = handle('SolarPanel_Right')
 
     # Aktualne pozycje (zakładamy, że są wysunięte)
     start_pos_left = sim.getObjectPosition(left_panel_handle, rover_handle)
@@ -103,10 +109,14 @@ def retract_solar_panels(sim, rover_name: str, extension: float = 0.25, duration
         sim.setObjectPosition(left_panel_handle, rover_handle, interp_left)
         sim.setObjectPosition(right_panel_handle, rover_handle, interp_right)
 
-        sim.step()
+        yield
+
+def retract_solar_panels(sim, rover_name: str, extension: float = 0.25, duration: float = 1.0, handles=None):
+    run_blocking(sim, retract_solar_panels_frames(sim, rover_name, extension, duration, handles))
 
 
 if __name__ == '__main__':
+  from coppeliasim_zmqremoteapi_client import RemoteAPIClient
   client = RemoteAPIClient()
   sim = client.require('sim')
   deploy_solar_panels(sim, 'Rover0')  # wysuwa oba panele jednocześnie
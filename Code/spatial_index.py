@@ -0,0 +1,172 @@
+import math
+import numpy as np
+from scipy.spatial import cKDTree
+
+"""
+Indeksy przestrzenne dla drzewa RRT* -> wspólny interfejs:
+    clear()                 - usuwa wszystkie węzły
+    insert(node)            - dodaje węzeł (node.x_, node.y_)
+    nearest(x, y)           - zwraca węzeł najbliższy punktowi
+    within(x, y, radius)    - zwraca węzły w promieniu radius od punktu
+"""
+
+class LinearIndex:
+    # brute force search over all nodes (original planner behaviour)
+    def __init__(self):
+        self.nodes_ = []
+
+    def clear(self):
+        self.nodes_ = []
+
+    def insert(self, node):
+        self.nodes_.append(node)
+
+    def nearest(self, x, y):
+        best_node = None
+        best_distance = math.inf
+        for candidate in self.nodes_:
+            distance = math.hypot(x - candidate.x_, y - candidate.y_)
+            if distance < best_distance:
+                best_distance = distance
+                best_node = candidate
+        return best_node
+
+    def within(self, x, y, radius):
+        return [candidate for candidate in self.nodes_ if math.hypot(x - candidate.x_, y - candidate.y_) <= radius]
+
+
+class GridIndex:
+    # hash of square cells, nearest search expands in rings around query cell
+    def __init__(self, cell_size):
+        self.cell_size_ = cell_size
+        self.clear()
+
+    def clear(self):
+        self.cells_ = {}
+        self.min_cell_ = None
+        self.max_cell_ = None
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size_), math.floor(y / self.cell_size_)
+
+    def insert(self, node):
+        cell = self._cell(node.x_, node.y_)
+        self.cells_.setdefault(cell, []).append(node)
+        # remember bounds of occupied cells so ring search knows when to stop
+        if self.min_cell_ is None:
+            self.min_cell_ = list(cell)
+            self.max_cell_ = list(cell)
+        else:
+            self.min_cell_ = [min(self.min_cell_[0], cell[0]), min(self.min_cell_[1], cell[1])]
+            self.max_cell_ = [max(self.max_cell_[0], cell[0]), max(self.max_cell_[1], cell[1])]
+
+    def _ring(self, cx, cy, ring):
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    def nearest(self, x, y):
+        if self.min_cell_ is None:
+            return None
+        cx, cy = self._cell(x, y)
+        max_ring = max(abs(cx - self.min_cell_[0]), abs(cx - self.max_cell_[0]),
+                       abs(cy - self.min_cell_[1]), abs(cy - self.max_cell_[1]))
+        # rings closer than occupied cells bounds are empty, skip them
+        min_ring = max(self.min_cell_[0] - cx, cx - self.max_cell_[0],
+                       self.min_cell_[1] - cy, cy - self.max_cell_[1], 0)
+        best_node = None
+        best_distance = math.inf
+        for ring in range(min_ring, max_ring + 1):
+            for cell in self._ring(cx, cy, ring):
+                for candidate in self.cells_.get(cell, ()):
+                    distance = math.hypot(x - candidate.x_, y - candidate.y_)
+                    if distance < best_distance:
+                        best_distance = distance
+                        best_node = candidate
+            # every node in further rings is at least ring*cell_size away
+            if best_node is not None and best_distance <= ring * self.cell_size_:
+                break
+        return best_node
+
+    def within(self, x, y, radius):
+        x_lb, y_lb = self._cell(x - radius, y - radius)
+        x_ub, y_ub = self._cell(x + radius, y + radius)
+        neighbors = []
+        for i in range(x_lb, x_ub + 1):
+            for j in range(y_lb, y_ub + 1):
+                for candidate in self.cells_.get((i, j), ()):
+                    if math.hypot(x - candidate.x_, y - candidate.y_) <= radius:
+                        neighbors.append(candidate)
+        return neighbors
+
+
+class KDTreeIndex:
+    # kd-tree over older nodes + vectorized scan of recently added ones,
+    # tree is rebuilt when the unindexed tail grows, so rebuild cost is amortised
+    def __init__(self, min_tail=64, rebuild_ratio=0.25):
+        self.min_tail_ = min_tail
+        self.rebuild_ratio_ = rebuild_ratio
+        self.clear()
+
+    def clear(self):
+        self.nodes_ = []
+        self.coords_ = np.empty((256, 2))
+        self.tree_ = None
+        self.tree_size_ = 0
+
+    def insert(self, node):
+        count = len(self.nodes_)
+        if count == len(self.coords_):
+            self.coords_ = np.concatenate([self.coords_, np.empty_like(self.coords_)])
+        self.coords_[count] = (node.x_, node.y_)
+        self.nodes_.append(node)
+        tail = count + 1 - self.tree_size_
+        if tail > max(self.min_tail_, self.rebuild_ratio_ * self.tree_size_):
+            self.tree_size_ = count + 1
+            self.tree_ = cKDTree(self.coords_[:self.tree_size_])
+
+    def _tail(self):
+        return self.coords_[self.tree_size_:len(self.nodes_)]
+
+    def nearest(self, x, y):
+        if not self.nodes_:
+            return None
+        best_distance = math.inf
+        best_index = -1
+        if self.tree_ is not None:
+            best_distance, best_index = self.tree_.query((x, y))
+        tail = self._tail()
+        if len(tail):
+            distances = np.hypot(tail[:, 0] - x, tail[:, 1] - y)
+            tail_index = int(np.argmin(distances))
+            if distances[tail_index] < best_distance:
+                best_index = self.tree_size_ + tail_index
+        return self.nodes_[best_index]
+
+    def within(self, x, y, radius):
+        indices = []
+        if self.tree_ is not None:
+            indices = self.tree_.query_ball_point((x, y), radius)
+        tail = self._tail()
+        if len(tail):
+            distances = np.hypot(tail[:, 0] - x, tail[:, 1] - y)
+            indices = list(indices) + (np.flatnonzero(distances <= radius) + self.tree_size_).tolist()
+        return [self.nodes_[i] for i in indices]
+
+
+# create index chosen in config (neighbor_index: linear | grid | kdtree)
+def create_index(config):
+    kind = config.get('neighbor_index', 'kdtree')
+    if kind == 'linear':
+        return LinearIndex()
+    if kind == 'grid':
+        return GridIndex(config.get('grid_cell_size', 0.5))
+    if kind == 'kdtree':
+        return KDTreeIndex()
+    raise ValueError(f"Unknown neighbor index: {kind}")
@@ -0,0 +1,49 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+"""
+Przydział zadań z kolejki wolnym łazikom jednocześnie (paczka), zamiast kolejno
+według samego priorytetu. Koszt pary łazik-zadanie:
+    odległość w linii prostej * (1 + battery_weight * (1 - bateria / 100))
+    + priority_weight * priorytet zadania
+więc słabo naładowane łaziki dostają bliższe zadania, a ważniejsze zadania
+(mniejsza wartość priorytetu) są tańsze. Metody (assignment_method w konfiguracji):
+    hungarian -> minimalny koszt całego przydziału (scipy linear_sum_assignment)
+    greedy    -> kolejno najtańsze wolne pary (aukcja zachłanna)
+    fifo      -> bez przydziału, zadanie z początku kolejki jak dotąd
+"""
+
+ASSIGNMENT_METHODS = ('hungarian', 'greedy', 'fifo')
+
+# (rovers, tasks) cost matrix
+def assignment_costs(rover_positions, battery_levels, task_positions, priorities, priority_weight=5.0, battery_weight=1.0):
+    rover_positions = np.asarray(rover_positions, dtype=float)[:, :2]
+    task_positions = np.asarray(task_positions, dtype=float)[:, :2]
+    distances = np.hypot(rover_positions[:, None, 0] - task_positions[None, :, 0],
+                         rover_positions[:, None, 1] - task_positions[None, :, 1])
+    battery = np.clip(np.asarray(battery_levels, dtype=float), 0, 100)
+    distances *= 1 + battery_weight * (1 - battery[:, None] / 100)
+    return distances + priority_weight * np.asarray(priorities, dtype=float)[None, :]
+
+# list of (rover row, task column), each rover and task used at most once
+def assign_tasks(costs, method='hungarian'):
+    costs = np.asarray(costs, dtype=float)
+    if costs.size == 0:
+        return []
+    if method == 'hungarian':
+        rows, cols = linear_sum_assignment(costs)
+        return [(int(row), int(col)) for row, col in zip(rows, cols)]
+    if method == 'greedy':
+        pairs = []
+        used_rows, used_cols = set(), set()
+        for flat in np.argsort(costs, axis=None, kind='stable'):
+            row, col = divmod(int(flat), costs.shape[1])
+            if row in used_rows or col in used_cols:
+                continue
+            pairs.append((row, col))
+            used_rows.add(row)
+            used_cols.add(col)
+            if len(pairs) == min(costs.shape):
+                break
+        return pairs
+    raise ValueError(f"Unknown assignment method: {method}")
@@ -0,0 +1,43 @@
+import threading
+from functools import wraps
+from Code.task_queue import TaskQueue
+
+"""
+Tablica zadań Centrali współdzielona przez pętlę centrali (osobny wątek przy WallClock)
+i łaziki (wątki FleetScheduler). Dwie osobne blokady zamiast jednej na całą centralę:
+    lock_        - kolejka zadań, rezerwacje i stan zadań łazików
+    fields_lock_ - parametry pól, lista przeszkód i mapa zajętości
+Gdy potrzebne są obie, kolejność jest zawsze: zadania, potem pola (bez zakleszczeń).
+Generator zadań nie trzyma blokady pól podczas dodawania zadań, a zadanie jest
+dodawane tylko jeśli pole nadal jest wolne (is_free, sprawdzane pod blokadą zadań).
+"""
+
+class TaskBoard:
+    def __init__(self):
+        self.queue_ = TaskQueue()
+        # rover id -> heap entry of task reserved in last batch assignment
+        self.reservations_ = {}
+        self.lock_ = threading.RLock()
+        self.fields_lock_ = threading.RLock()
+
+    # field has no queued and no assigned task
+    def is_free(self, field_name):
+        with self.lock_:
+            return not self.queue_.has_field(field_name) and not self.queue_.is_assigned(field_name)
+
+
+# method runs with task lock of self.task_board
+def locked_tasks(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.task_board.lock_:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+# method runs with fields lock of self.task_board (put below locked_tasks when both are used)
+def locked_fields(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.task_board.fields_lock_:
+            return method(self, *args, **kwargs)
+    return wrapper
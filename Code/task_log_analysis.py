@@ -0,0 +1,228 @@
+import argparse
+import csv
+import glob
+import math
+import sys
+import numpy as np
+from Code.task_log_writer import NPZ_KEYS
+
+"""
+Analiza logów zadań Centrali (task_log_*.csv / .npz) i scenariuszy bazowych
+(Scenariusz nr 1-3.csv). Pliki są czytane wiersz po wierszu (CSV w UTF-8 albo,
+jak starsze logi z Windows, w cp1250), kolumny według kolejności:
+numer zadania, typ, pole, łazik, czas wystawienia, czas zrealizowania, czas dodania
+(ostatniej kolumny nie ma w starszych logach i scenariuszach bazowych).
+Dla każdego logu:
+    przepustowość - liczba zadań na godzinę czasu symulacji
+    obsługa       - czas od wystawienia (przydziału) do realizacji, percentyle na typ zadania
+    kolejka       - czas od dodania do kolejki do wystawienia, tylko logi z czasem dodania
+    wykorzystanie - udział czasu z zadaniem w czasie całego przebiegu, na łazik
+    przerwy       - czas bez zadania między kolejnymi zadaniami łazika
+    makespan      - od pierwszego wystawienia do ostatniej realizacji
+Porównanie z bazą (--baseline) zgłasza regresję, gdy przepustowość spadnie albo
+czas obsługi lub czas w kolejce p90 wzrośnie o więcej niż --tolerance, wtedy kod
+wyjścia to 1. Metryki bez danych (np. brak zadań) są wypisywane jako "brak danych"
+i nie są porównywane.
+
+Uruchomienie: python -m Code.task_log_analysis task_log_*.csv --baseline "Scenariusz nr 1.csv"
+"""
+
+PERCENTILES = (50, 90, 99)
+
+def _encoding(path):
+    with open(path, 'rb') as file:
+        header = file.readline()
+    try:
+        header.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1250'
+
+def _time(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+# rows (task id, type, field, rover, issued, completed, enqueued), rows without issued and
+# completed times are skipped, enqueued is None when not logged
+def read_task_log(path):
+    if path.endswith('.npz'):
+        data = np.load(path)
+        rows = zip(*(data[key].tolist() for key in NPZ_KEYS if key in data))
+    else:
+        file = open(path, newline='', encoding=_encoding(path))
+        rows = csv.reader(file)
+        next(rows, None)
+    try:
+        for row in rows:
+            if len(row) < 6:
+                continue
+            issued, completed = _time(row[4]), _time(row[5])
+            if issued is None or completed is None:
+                continue
+            enqueued = _time(row[6]) if len(row) > 6 else None
+            yield row[0], row[1], row[2], row[3], issued, completed, enqueued
+    finally:
+        if not path.endswith('.npz'):
+            file.close()
+
+
+class TaskLogStats:
+    def __init__(self, name):
+        self.name_ = name
+        self.count_ = 0
+        self.first_issued_ = math.inf
+        self.last_completed_ = -math.inf
+        # task type -> service times (issued -> completed) and queue times (enqueued -> issued)
+        self.service_ = {}
+        self.queue_ = {}
+        # rover -> [busy time, tasks, last completion, idle gaps]
+        self.rovers_ = {}
+
+    def add(self, task_type, rover, issued, completed, enqueued=None):
+        self.count_ += 1
+        self.first_issued_ = min(self.first_issued_, issued)
+        self.last_completed_ = max(self.last_completed_, completed)
+        self.service_.setdefault(task_type, []).append(max(completed - issued, 0.0))
+        if enqueued is not None:
+            self.queue_.setdefault(task_type, []).append(max(issued - enqueued, 0.0))
+        rover_stats = self.rovers_.setdefault(rover, [0.0, 0, None, []])
+        # overlapping tasks of one rover are counted once in busy time
+        busy_from = issued if rover_stats[2] is None else max(issued, rover_stats[2])
+        rover_stats[0] += max(completed - busy_from, 0.0)
+        rover_stats[1] += 1
+        if rover_stats[2] is not None and issued > rover_stats[2]:
+            rover_stats[3].append(issued - rover_stats[2])
+        rover_stats[2] = completed if rover_stats[2] is None else max(rover_stats[2], completed)
+
+    def summary(self):
+        makespan = max(self.last_completed_ - self.first_issued_, 0.0) if self.count_ else 0.0
+        rovers = {}
+        for rover, (busy, tasks, _, gaps) in sorted(self.rovers_.items()):
+            rovers[rover] = {
+                'tasks': tasks,
+                'utilisation': busy / makespan if makespan > 0 else 0.0,
+                'idle_total': float(sum(gaps)),
+                'idle_max': float(max(gaps)) if gaps else 0.0,
+                'idle_gaps': len(gaps),
+            }
+        return {
+            'name': self.name_,
+            'tasks': self.count_,
+            'makespan': makespan,
+            'throughput': self.count_ / makespan * 3600 if makespan > 0 else 0.0,
+            'service': _by_type(self.service_),
+            'queue': _by_type(self.queue_),
+            'rovers': rovers,
+            'utilisation': float(np.mean([r['utilisation'] for r in rovers.values()])) if rovers else 0.0,
+        }
+
+def _times_summary(times):
+    if not times:
+        return {'count': 0, 'mean': 0.0, **{f'p{p}': 0.0 for p in PERCENTILES}}
+    values = np.array(times)
+    return {'count': len(values), 'mean': float(values.mean()), **{f'p{p}': float(np.percentile(values, p)) for p in PERCENTILES}}
+
+# summary per task type and 'all'
+def _by_type(times):
+    by_type = {task_type: _times_summary(values) for task_type, values in sorted(times.items())}
+    by_type['all'] = _times_summary([value for values in times.values() for value in values])
+    return by_type
+
+def analyse(path):
+    stats = TaskLogStats(path)
+    for _, task_type, _, rover, issued, completed, enqueued in read_task_log(path):
+        stats.add(task_type, rover, issued, completed, enqueued)
+    return stats.summary()
+
+# metric value, None when log has no data for it
+def _metric(summary, name):
+    return summary[name] if summary['tasks'] else None
+
+def _percentile(summary, times, p):
+    stats = summary[times]['all']
+    return stats[f'p{p}'] if stats['count'] else None
+
+# metric, baseline, run, relative change, regression; change is None without data in both logs
+def compare(run, baseline, tolerance=0.05):
+    rows = []
+    metrics = [
+        ('throughput [zad/h]', _metric(run, 'throughput'), _metric(baseline, 'throughput')),
+        ('service p50 [s]', _percentile(run, 'service', 50), _percentile(baseline, 'service', 50)),
+        ('service p90 [s]', _percentile(run, 'service', 90), _percentile(baseline, 'service', 90)),
+        ('queue p50 [s]', _percentile(run, 'queue', 50), _percentile(baseline, 'queue', 50)),
+        ('queue p90 [s]', _percentile(run, 'queue', 90), _percentile(baseline, 'queue', 90)),
+        ('utilisation', _metric(run, 'utilisation'), _metric(baseline, 'utilisation')),
+        ('makespan [s]', _metric(run, 'makespan'), _metric(baseline, 'makespan')),
+    ]
+    for name, value, base in metrics:
+        if value is None or base is None:
+            rows.append((name, base, value, None, False))
+            continue
+        change = (value - base) / base if base else 0.0
+        # only throughput and p90 times are regression checks
+        regression = False
+        if name.startswith('throughput'):
+            regression = change < -tolerance
+        elif 'p90' in name:
+            regression = change > tolerance
+        rows.append((name, base, value, change, regression))
+    return rows
+
+def print_report(summary):
+    print(f"== {summary['name']}")
+    print(f"zadania: {summary['tasks']}, makespan: {summary['makespan']:.1f} s, przepustowość: {summary['throughput']:.1f} zad/h, wykorzystanie: {summary['utilisation']:.2f}")
+    for times, title in (('service', 'obsługa'), ('queue', 'kolejka')):
+        if not summary[times]['all']['count']:
+            print(f"{title}: brak danych")
+            continue
+        header = f"{title + ' / typ':<18}{'n':>6}{'mean[s]':>9}" + ''.join(f"{f'p{p}[s]':>9}" for p in PERCENTILES)
+        print(header)
+        print('-' * len(header))
+        for task_type, stats in summary[times].items():
+            print(f"{task_type:<18}{stats['count']:>6}{stats['mean']:>9.1f}" + ''.join(f"{stats[f'p{p}']:>9.1f}" for p in PERCENTILES))
+    header = f"{'łazik':<10}{'zadania':>8}{'wykorz.':>9}{'przerwy':>9}{'suma[s]':>9}{'max[s]':>9}"
+    print(header)
+    print('-' * len(header))
+    for rover, stats in summary['rovers'].items():
+        print(f"{rover:<10}{stats['tasks']:>8}{stats['utilisation']:>9.2f}{stats['idle_gaps']:>9}{stats['idle_total']:>9.1f}{stats['idle_max']:>9.1f}")
+    print()
+
+def _value(value):
+    return '-' if value is None else f"{value:.2f}"
+
+def print_comparison(run, baseline, rows):
+    print(f"== {run['name']} vs {baseline['name']}")
+    header = f"{'metryka':<20}{'baza':>10}{'przebieg':>10}{'zmiana':>9}"
+    print(header)
+    print('-' * len(header))
+    for name, base, value, change, regression in rows:
+        if change is None:
+            print(f"{name:<20}{_value(base):>10}{_value(value):>10}  brak danych")
+            continue
+        print(f"{name:<20}{base:>10.2f}{value:>10.2f}{change * 100:>8.1f}%" + ("  REGRESJA" if regression else ""))
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Analiza logów zadań Centrali")
+    parser.add_argument('logs', nargs='+', help="pliki logów (csv/npz), dopuszczalne wzorce np. task_log_*.csv")
+    parser.add_argument('--baseline', help="log bazowy do porównania, np. 'Scenariusz nr 1.csv'")
+    parser.add_argument('--tolerance', type=float, default=0.05, help="dopuszczalna względna zmiana przed zgłoszeniem regresji")
+    args = parser.parse_args()
+    paths = [path for pattern in args.logs for path in (sorted(glob.glob(pattern)) or [pattern])]
+    baseline = analyse(args.baseline) if args.baseline else None
+    regression = False
+    for path in paths:
+        summary = analyse(path)
+        print_report(summary)
+        if baseline is not None:
+            rows = compare(summary, baseline, args.tolerance)
+            print_comparison(summary, baseline, rows)
+            regression = regression or any(row[4] for row in rows)
+    sys.exit(1 if regression else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import atexit
+import csv
+import os
+import threading
+import numpy as np
+
+"""
+Zapis logu zadań Centrali w tle. Wiersze są zbierane w pamięci, a wątek zapisu
+dopisuje je paczką do pliku, gdy uzbiera się flush_rows wierszy, minie flush_interval
+sekund albo przy zamknięciu (Centrala.stop, a gdy nie zostanie wywołane - przy wyjściu
+z interpretera przez atexit). Ukończenie zadania przez łazika nie
+otwiera już pliku. Czasy (czas symulacji): dodania do kolejki, wystawienia (przydziału
+łazikowi) i realizacji. Formaty (task_log_format w konfiguracji):
+    csv -> plik CSV jak dotąd (nagłówki po polsku)
+    npz -> kolumny numpy (np.savez, klucze jak w NPZ_KEYS), wiersze zbierane w kolumnach
+           w pamięci, a plik zapisywany raz przy zamknięciu (do tego czasu jest pusty)
+"""
+
+# enqueue time appended last, so older readers of the first six columns still work
+COLUMNS = ["Numer zadania", "Nazwa zadania", "Numer pola", "Łazik", "Czas wystawienia", "Czas zrealizowania", "Czas dodania"]
+NPZ_KEYS = ["task_id", "task_type", "field", "rover", "assignment_time", "completion_time", "enqueue_time"]
+
+class TaskLogWriter:
+    def __init__(self, filename, log_format='csv', flush_rows=64, flush_interval=5.0):
+        if log_format not in ('csv', 'npz'):
+            raise ValueError(f"Unknown task log format: {log_format}")
+        self.filename_ = filename
+        self.format_ = log_format
+        self.flush_rows_ = flush_rows
+        self.flush_interval_ = flush_interval
+        self.buffer_ = []
+        # all rows as columns, kept only for npz
+        self.columns_ = [[] for _ in COLUMNS]
+        self.lock_ = threading.Lock()
+        # one flush at a time (writer thread or close)
+        self.write_lock_ = threading.Lock()
+        self.wake_ = threading.Event()
+        self.closed_ = False
+        if self.format_ == 'csv':
+            with open(self.filename_, mode='w', newline='') as file:
+                csv.writer(file).writerow(COLUMNS)
+        else:
+            self._write_npz()
+        self.thread_ = threading.Thread(target=self._run, daemon=True)
+        self.thread_.start()
+        # rows and npz file kept also when the caller never reaches close()
+        atexit.register(self.close)
+
+    # row as dict with COLUMNS keys, only buffered on caller thread
+    def write(self, row):
+        with self.lock_:
+            if self.closed_:
+                return
+            self.buffer_.append([row[column] for column in COLUMNS])
+            full = len(self.buffer_) >= self.flush_rows_
+        if full:
+            self.wake_.set()
+
+    def _run(self):
+        while not self.closed_:
+            self.wake_.wait(self.flush_interval_)
+            self.wake_.clear()
+            self.flush()
+
+    def flush(self):
+        with self.write_lock_:
+            with self.lock_:
+                rows, self.buffer_ = self.buffer_, []
+            if not rows:
+                return
+            if self.format_ == 'csv':
+                with open(self.filename_, mode='a', newline='') as file:
+                    csv.writer(file).writerows(rows)
+            else:
+                # no rewrite of whole archive per flush, file written in close
+                for column, values in zip(self.columns_, zip(*rows)):
+                    column.extend(values)
+
+    def _write_npz(self):
+        arrays = {}
+        for key, values in zip(NPZ_KEYS, self.columns_):
+            array = np.array(values)
+            # mixed numbers and text (e.g. 'N/A' times) end up as text column
+            arrays[key] = array if array.dtype != object else array.astype(str)
+        # written to temporary file first, readers never see a partial file
+        temporary = f"{self.filename_}.tmp.npz"
+        np.savez(temporary, **arrays)
+        os.replace(temporary, self.filename_)
+
+    # remaining rows are written, writer thread stopped
+    def close(self):
+        with self.lock_:
+            if self.closed_:
+                return
+            self.closed_ = True
+        atexit.unregister(self.close)
+        self.wake_.set()
+        self.thread_.join(timeout=5)
+        self.flush()
+        if self.format_ == 'npz':
+            with self.write_lock_:
+                self._write_npz()
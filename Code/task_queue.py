@@ -0,0 +1,125 @@
+import heapq
+import itertools
+import threading
+
+"""
+Kolejka zadań Centrali oparta na kopcu (heapq), kolejność jak dotąd: priorytet
+(mniejsza wartość = ważniejsze), przy równym priorytecie kolejność dodania.
+Indeksy pozwalają bez przeglądania całej kolejki sprawdzić, czy pole ma zadanie
+w kolejce (pole -> zadania), ile jest zadań danego typu oraz który łazik
+wykonuje zadanie dla pola (pole -> łazik).
+"""
+
+class TaskQueue:
+    def __init__(self):
+        self.heap_ = []
+        self.counter_ = itertools.count()
+        # task returned to front of its priority, before all tasks added so far
+        self.front_counter_ = itertools.count(-1, -1)
+        # field name -> {task id: task} for queued tasks
+        self.by_field_ = {}
+        # task type -> number of queued tasks
+        self.type_counts_ = {}
+        # field name -> rover id for assigned tasks
+        self.assigned_ = {}
+        self.lock_ = threading.RLock()
+
+    def __len__(self):
+        return len(self.heap_)
+
+    def __bool__(self):
+        return bool(self.heap_)
+
+    # tasks in order of execution
+    def __iter__(self):
+        with self.lock_:
+            return iter([task for _, _, task in sorted(self.heap_, key=lambda entry: entry[:2])])
+
+    def _index(self, task):
+        self.by_field_.setdefault(task['field_name'], {})[task['id']] = task
+        self.type_counts_[task['type']] = self.type_counts_.get(task['type'], 0) + 1
+
+    def _unindex(self, task):
+        tasks = self.by_field_.get(task['field_name'])
+        if tasks is not None:
+            tasks.pop(task['id'], None)
+            if not tasks:
+                del self.by_field_[task['field_name']]
+        self.type_counts_[task['type']] -= 1
+
+    def push(self, task):
+        with self.lock_:
+            heapq.heappush(self.heap_, (task.get('priority', 1), next(self.counter_), task))
+            self._index(task)
+
+    # task which could not be started goes back before tasks of same priority
+    def push_front(self, task):
+        with self.lock_:
+            heapq.heappush(self.heap_, (task.get('priority', 1), next(self.front_counter_), task))
+            self._index(task)
+
+    def pop(self):
+        with self.lock_:
+            if not self.heap_:
+                return None
+            _, _, task = heapq.heappop(self.heap_)
+            self._unindex(task)
+            return task
+
+    # up to count first tasks as heap entries, removed from queue until restore()
+    def take(self, count):
+        with self.lock_:
+            entries = [heapq.heappop(self.heap_) for _ in range(min(count, len(self.heap_)))]
+            for _, _, task in entries:
+                self._unindex(task)
+            return entries
+
+    # put back entries from take(), in their original order
+    def restore(self, entries):
+        with self.lock_:
+            for entry in entries:
+                heapq.heappush(self.heap_, entry)
+                self._index(entry[2])
+
+    def peek(self):
+        with self.lock_:
+            return self.heap_[0][2] if self.heap_ else None
+
+    # drop all queued tasks of given type, returns number of removed tasks
+    def remove_type(self, task_type):
+        with self.lock_:
+            kept = [entry for entry in self.heap_ if entry[2]['type'] != task_type]
+            removed = len(self.heap_) - len(kept)
+            if removed:
+                for _, _, task in self.heap_:
+                    if task['type'] == task_type:
+                        self._unindex(task)
+                heapq.heapify(kept)
+                self.heap_ = kept
+            return removed
+
+    def has_field(self, field_name, task_type=None):
+        tasks = self.by_field_.get(field_name)
+        if not tasks:
+            return False
+        if task_type is None:
+            return True
+        return any(task['type'] == task_type for task in tasks.values())
+
+    def count_type(self, task_type):
+        return self.type_counts_.get(task_type, 0)
+
+    def assign(self, field_name, rover_id):
+        self.assigned_[field_name] = rover_id
+
+    def release(self, field_name, rover_id=None):
+        if field_name is None:
+            return
+        if rover_id is None or self.assigned_.get(field_name) == rover_id:
+            self.assigned_.pop(field_name, None)
+
+    def is_assigned(self, field_name):
+        return field_name in self.assigned_
+
+    def assigned_rover(self, field_name):
+        return self.assigned_.get(field_name)
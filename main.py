@@ -6,9 +6,13 @@ import logging
 from pathlib import Path
 from coppeliasim_zmqremoteapi_client import RemoteAPIClient
 from Code.central import Centrala
+from Code.sim_clock import SimClock
 from Code.rover import Rover
 from Code.move_rover_to_goal import move_rover_to_goal
 from Code.duplicate_rover import duplicate_rover
+from Code.sim_batch import SimBatch
+from Code.fleet_scheduler import FleetScheduler
+from Code.planning_service import PlanningService
 
 def main():
     logging.basicConfig(
@@ -24,7 +28,9 @@ def main():
     sim.startSimulation()
 
     print("[Main] Starting Centrala...")
-    centrala = Centrala(client)
+    # simulation time clock, advanced once per sim.step()
+    clock = SimClock(sim)
+    centrala = Centrala(client, clock=clock)
 
     num_rovers = 3
 
@@ -37,17 +43,29 @@ def main():
     for i in range(1, num_rovers):
         duplicate_rover(sim, rover_name, sim_object_names[i], pos_x, pos_y+i, pos_z=0.375)
 
-    rover_names_list = [Rover(sim, sim_object_names[i], centrala)
+    batch = SimBatch(sim)
+    batch.install()
+    planning_service = PlanningService(sim)
+
+    rover_names_list = [Rover(sim, sim_object_names[i], centrala, batch, planning_service)
                         for i in range(num_rovers)]
+    scheduler = FleetScheduler(rover_names_list)
 
     try:
         while True:
-            for rover in rover_names_list:
-                rover.tick()
+            scheduler.tick()
+            centrala.tick()
+            batch.flush()
             sim.step()
+            clock.step()
     except KeyboardInterrupt:
         print("[Main] Stopping...")
+    finally:
+        # task log written on every exit, not only on ctrl+c
+        scheduler.shutdown()
+        planning_service.shutdown()
         centrala.stop()
+        batch.uninstall()
         sim.stopSimulation()
         print("[Main] Simulation stopped.")
 
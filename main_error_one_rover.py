@@ -60,6 +60,8 @@ def main():
 
     except KeyboardInterrupt:
         print("[Main] Stopping...")
+    finally:
+        # task log written on every exit, not only on ctrl+c
         centrala.stop()
         sim.stopSimulation()
         print("[Main] Simulation stopped.")
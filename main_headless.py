@@ -0,0 +1,78 @@
+import time
+import logging
+import argparse
+from Code.mock_sim import MockClient, create_scene
+from Code.central import Centrala
+from Code.sim_clock import SimClock
+from Code.rover import Rover
+from Code.duplicate_rover import duplicate_rover
+from Code.sim_batch import SimBatch
+from Code.fleet_scheduler import FleetScheduler
+from Code.planning_service import PlanningService
+
+"""
+Uruchomienie floty bez CoppeliaSim - scena w Code/mock_sim.py (MockSim), pętla jak w main.py.
+python main_headless.py --rovers 3 --steps 20000
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja floty bez CoppeliaSim")
+    parser.add_argument('--rovers', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--deterministic', action='store_true', help="czas oczekiwania na ścieżki niezależny od szybkości komputera")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="[%(asctime)s] [%(filename)s] %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    client = MockClient()
+    sim = client.require('sim')
+    create_scene(sim, rovers=1, seed=args.seed)
+
+    sim.setStepping(True)
+    sim.startSimulation()
+
+    print("[Main] Starting Centrala...")
+    # simulation time clock, advanced once per sim.step()
+    clock = SimClock(sim)
+    centrala = Centrala(client, clock=clock)
+
+    sim_object_names = [f"Rover{i}" for i in range(args.rovers)]
+    pos_x, pos_y = -4, -4
+    for i in range(1, args.rovers):
+        duplicate_rover(sim, "/Rover0", sim_object_names[i], pos_x, pos_y+i, pos_z=0.375)
+
+    batch = SimBatch(sim)
+    batch.install()
+    planning_service = PlanningService(sim)
+
+    rovers = [Rover(sim, sim_object_names[i], centrala, batch, planning_service)
+              for i in range(args.rovers)]
+    scheduler = FleetScheduler(rovers, deterministic=args.deterministic)
+
+    start = time.perf_counter()
+    try:
+        for _ in range(args.steps):
+            scheduler.tick()
+            centrala.tick()
+            batch.flush()
+            sim.step()
+            clock.step()
+    except KeyboardInterrupt:
+        print("[Main] Stopping...")
+    finally:
+        # task log written on every exit, not only on ctrl+c
+        elapsed = time.perf_counter() - start
+        print(f"[Main] {sim.steps_} kroków ({sim.getSimulationTime():.1f} s symulacji) w {elapsed:.1f} s, {sim.steps_ / max(elapsed, 1e-9):.0f} kroków/s.")
+        scheduler.shutdown()
+        planning_service.shutdown()
+        centrala.stop()
+        batch.uninstall()
+        sim.stopSimulation()
+
+if __name__ == "__main__":
+    main()
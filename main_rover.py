@@ -61,6 +61,8 @@ def main():
             sim.step()  # triggers next simulation step (by defalt step is 0.05 seconds)
     except KeyboardInterrupt:
         print("[Main] Stopping...")
+    finally:
+        # task log written on every exit, not only on ctrl+c
         centrala.stop()
         sim.stopSimulation()
         print("[Main] Simulation stopped.")
@@ -20,7 +20,7 @@ def main():
     start = [-6.1, 6.1]
     goal = [0.1, -2.1]
     obstacles = [[-1.1, 0.1, 1.0], [-2.1, 2.1, 0.5] ]
-    my_planer = RRTStar(start, goal, obstacles)
+    my_planer = RRTStar(sim, start, goal, obstacles)
     my_planer.plan()
     print(my_planer.path_)
 
@@ -21,7 +21,7 @@ def main():
     start = sim.getObjectPosition(rover_handle, -1)
     goal = [-2.0, -2.0]
     obstacles = [[-1.1, 0.1, 1.0], [-2.1, 2.1, 0.5] ]
-    my_planer = RRTStar(start, goal, obstacles)
+    my_planer = RRTStar(sim, start, goal, obstacles)
     my_planer.plan()
     print(my_planer.path_)
     print("[Main] Displaying path...")
@@ -0,0 +1,36 @@
+import math
+from Code.benchmark_planner import make_scenario, path_valid, run_scenario, FIELD_RADIUS, ROCK_RADIUS
+from Code.rrt_star import load_config
+
+"""
+Benchmark planera: powtarzalne scenariusze, sprawdzanie ścieżek i krótki przebieg.
+"""
+
+def test_scenarios_repeatable_for_seed():
+    for name in ('fields', 'rocks', 'exploration'):
+        assert make_scenario(name, 3) == make_scenario(name, 3)
+    assert make_scenario('rocks', 3) != make_scenario('rocks', 4)
+
+def test_rocks_do_not_overlap_static_obstacles():
+    obstacles, _ = make_scenario('rocks', 0, rocks=12)
+    rocks = [obstacle for obstacle in obstacles if obstacle[2] == ROCK_RADIUS]
+    assert len(rocks) == 12
+    for x, y, r in rocks:
+        for ox, oy, orad in obstacles:
+            if (ox, oy) != (x, y):
+                assert math.hypot(x - ox, y - oy) > r + orad
+
+def test_path_valid():
+    obstacles = [(0.0, 0.0, 0.5), (3.0, 0.0, FIELD_RADIUS)]
+    # goal inside field, like task on field
+    assert path_valid([[-2, 1], [3, 1], [3, 0]], (-2, 1), (3, 0), obstacles, 0.15)
+    assert not path_valid([[-2, 0], [3, 0]], (-2, 0), (3, 0), obstacles, 0.15)
+    assert not path_valid([[-2, 1], [2, 1]], (-2, 1), (3, 0), obstacles, 0.15)
+    assert not path_valid(None, (-2, 1), (3, 0), obstacles, 0.15)
+
+def test_short_run():
+    config = dict(load_config(), backend='array', sampling_seed=0)
+    result = run_scenario(config, 'fields', 0, goals=3)
+    assert result['queries'] == 3
+    assert result['success_rate'] == 1.0
+    assert result['path_length'] > 0
@@ -0,0 +1,70 @@
+import json
+from types import SimpleNamespace
+import pytest
+from Code.central import Centrala
+from Code.mock_sim import MockClient, create_scene
+from Code.sim_clock import SimClock
+
+"""
+Centrala na scenie z mock_sim: zwrot rezerwacji łazika, który przestał czekać na zadanie,
+zapis danych pola po pracy łazika i czas ostatniej wizyty.
+"""
+
+@pytest.fixture
+def centrala(tmp_path, monkeypatch):
+    # task log written to working directory
+    monkeypatch.chdir(tmp_path)
+    client = MockClient()
+    sim = client.require('sim')
+    create_scene(sim, rovers=0, seed=0)
+    clock = SimClock(sim)
+    centrala = Centrala(client, clock=clock)
+    yield centrala
+    centrala.stop()
+
+def _register(centrala, rover_id, position):
+    centrala.register_rover(rover_id, SimpleNamespace(current_task=None), None, position)
+
+def _assign(centrala, rover_id):
+    task = centrala.request_new_task_for_rover(rover_id)
+    centrala.rovers[rover_id]['object'].current_task = task
+    return task
+
+def _step(centrala, steps):
+    for _ in range(steps):
+        centrala.sim.step()
+        centrala.clock.step()
+
+def test_reservation_of_busy_rover_returns_to_queue(centrala):
+    _register(centrala, "Rover0", (-3.0, -3.0))
+    _register(centrala, "Rover1", (3.0, 3.0))
+    near_rover0 = centrala.add_task_to_queue("Field_0", 'visit_scan', {})
+    near_rover1 = centrala.add_task_to_queue("Field_7", 'visit_scan', {})
+    assert _assign(centrala, "Rover0")['id'] == near_rover0['id']
+    # Rover1 got reservation in the same assignment, then starts charging
+    assert centrala.reservations["Rover1"][2]['id'] == near_rover1['id']
+    centrala.rovers["Rover1"]['status'] = 'charging'
+    centrala.report_task_completed("Rover0", near_rover0['id'], "success", {'name': "Field_0"})
+    assert _assign(centrala, "Rover0")['id'] == near_rover1['id']
+    assert "Rover1" not in centrala.reservations
+
+def test_field_data_after_work_updates_field(centrala):
+    _register(centrala, "Rover0", (-3.0, -3.0))
+    task = centrala.add_task_to_queue("Field_0", 'adjust_pH', {'target_pH': 7.0})
+    _assign(centrala, "Rover0")
+    centrala.report_task_completed("Rover0", task['id'], "success", {'name': "Field_0", 'pH': 7.0})
+    field = centrala.fields["Field_0"]
+    assert field.pH == 7.0
+    soil_data = json.loads(centrala.sim.readCustomDataBlock(field.handle, "SoilData"))
+    assert soil_data['pH'] == 7.0
+
+def test_visit_scan_records_visit_time(centrala):
+    _register(centrala, "Rover0", (-3.0, -3.0))
+    task = centrala.add_task_to_queue("Field_0", 'visit_scan', {})
+    _assign(centrala, "Rover0")
+    _step(centrala, 100)
+    # visit_scan reports only field name
+    centrala.report_task_completed("Rover0", task['id'], "success", {'name': "Field_0"})
+    field = centrala.fields["Field_0"]
+    assert field.last_visited_time == pytest.approx(centrala.clock.now())
+    assert f"Last Visited: {centrala.clock.now():.1f} s" in str(field)
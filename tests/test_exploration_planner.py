@@ -0,0 +1,36 @@
+import numpy as np
+from Code.collision_checker import CollisionChecker
+from Code.exploration_planner import coverage_lanes, boustrophedon_route, plan_exploration_routes
+
+"""
+Trasy eksploracji: punkty pośrednie wzdłuż pasów, odcinki trasy na pasie są
+proste i omijają przeszkody.
+"""
+
+LB, UB = (-4.0, -4.0), (4.0, 4.0)
+COVER = (-0.3, 0.4)
+
+def test_route_points_along_lane_at_most_step_apart():
+    lanes = coverage_lanes(LB, UB, COVER)
+    route = boustrophedon_route(lanes, waypoint_step=1.0)
+    lane_ys = {y for y, _, _ in lanes}
+    assert {point[1] for point in route} == lane_ys
+    for a, b in zip(route[:-1], route[1:]):
+        if a[1] == b[1]:
+            assert abs(b[0] - a[0]) <= 1.0 + 1e-9
+    # lane ends kept
+    assert route[0][0] == LB[0] and route[-1][0] in (LB[0], UB[0])
+
+def test_no_step_keeps_only_segment_ends():
+    lanes = coverage_lanes(LB, UB, COVER)
+    assert len(boustrophedon_route(lanes)) == 2 * len(lanes)
+
+def test_lane_hops_avoid_obstacles():
+    obstacles = [(0.0, 0.0, 0.6), (-2.0, 2.0, 0.5)]
+    checker = CollisionChecker(obstacles)
+    routes = plan_exploration_routes([(-4, -4), (4, 4)], LB, UB, COVER, checker, waypoint_step=0.5)
+    for route in routes.values():
+        for a, b in zip(route[:-1], route[1:]):
+            # hops on one lane are driven straight, only lane changes and gaps are planned
+            if a[1] == b[1] and abs(b[0] - a[0]) <= 0.5 + 1e-9:
+                assert not checker.segments_collide(np.array([a[:2]]), np.array([b[:2]])).any()
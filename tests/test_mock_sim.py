@@ -0,0 +1,51 @@
+import json
+import pytest
+from Code.mock_sim import MockClient, MockSim, create_scene
+
+"""
+Zastępstwo symulatora: scena startowa, ścieżki obiektów, pozycje względem rodzica,
+czas symulacji i usuwanie obiektów.
+"""
+
+def _scene():
+    sim = MockClient().require('sim')
+    return create_scene(sim, rovers=2, rocks=[(2.0, -1.0)], seed=0)
+
+def test_scene_objects_and_paths():
+    sim = _scene()
+    assert sim.getObjectPosition(sim.getObject('/Centrala'), -1) == pytest.approx([0.0, 0.0, 0.5])
+    assert sim.getObjectPosition(sim.getObject('/Rover1'), -1) == pytest.approx([-4.0, -3.0, 0.375])
+    # descendants at any depth, like '/Rover0/ArmJoint1'
+    joint = sim.getObject('/Rover0/ArmJoint1')
+    assert sim.getObjectParent(joint) == sim.getObject('/Rover0')
+    assert sim.getObject('/Rock[0]') == sim.getObject('/Rock')
+    with pytest.raises(Exception):
+        sim.getObject('/Rover2')
+    soil_data = json.loads(sim.readCustomDataBlock(sim.getObjectHandle('Field_0'), "SoilData"))
+    assert soil_data['area'] == [-3.0, -3.0, 0.25]
+
+def test_scene_is_repeatable_for_seed():
+    data = [json.loads(sim.readCustomDataBlock(sim.getObjectHandle('Field_3'), "SoilData")) for sim in (_scene(), _scene())]
+    assert data[0] == data[1]
+
+def test_child_moves_with_parent():
+    sim = _scene()
+    rover, joint = sim.getObject('/Rover0'), sim.getObject('/Rover0/ArmJoint1')
+    offset = sim.getObjectPosition(joint, rover)
+    sim.setObjectPosition(rover, -1, [1.0, 2.0, 0.375])
+    assert sim.getObjectPosition(joint, rover) == pytest.approx(offset)
+    assert sim.getObjectPosition(joint, -1)[:2] == pytest.approx([1.0 + offset[0], 2.0 + offset[1]])
+
+def test_step_advances_simulation_time():
+    sim = MockSim(time_step=0.05)
+    for _ in range(20):
+        sim.step()
+    assert sim.getSimulationTime() == pytest.approx(1.0)
+    assert sim.getSimulationTimeStep() == 0.05
+
+def test_remove_object_removes_subtree():
+    sim = _scene()
+    rover, joint = sim.getObject('/Rover0'), sim.getObject('/Rover0/ArmJoint1')
+    sim.removeObject(rover)
+    assert not sim.isHandle(rover) and not sim.isHandle(joint)
+    assert sim.isHandle(sim.getObject('/Rover1'))
@@ -0,0 +1,75 @@
+import gc
+import threading
+from Code.collision_checker import CollisionChecker
+from Code.occupancy_map import OccupancyMap
+from Code.rrt_star import PathCache, static_signature
+
+"""
+Wspólna pamięć ścieżek: sygnatura mapy, sprawdzanie ścieżki przy ponownym użyciu,
+LRU i liczniki trafień przy wielu wątkach planowania.
+"""
+
+LB, UB = [-5, -5], [5, 5]
+PATH = [[-3.0, 0.0], [0.0, 3.0], [3.0, 0.0]]
+
+def test_signature_of_new_map_differs_from_collected_one():
+    signatures = set()
+    for _ in range(20):
+        # same obstacles and version, new object may get id() of a collected one
+        signatures.add(static_signature([], OccupancyMap([(0.0, 0.0, 0.5)], LB, UB)))
+        gc.collect()
+    assert len(signatures) == 20
+
+def test_signature_changes_with_map_version():
+    occupancy_map = OccupancyMap([(0.0, 0.0, 0.5)], LB, UB)
+    signature = static_signature([], occupancy_map)
+    occupancy_map.add_obstacle(2.0, 2.0, 0.3)
+    assert static_signature([], occupancy_map) != signature
+
+def test_cached_path_starts_at_query_start():
+    cache = PathCache()
+    key = cache.key(PATH[0], PATH[-1], ('list', 0))
+    cache.put(key, PATH)
+    start = [-2.9, 0.05]
+    path = cache.get(cache.key(start, PATH[-1], ('list', 0)), start, PATH[-1], CollisionChecker([]), 0.2)
+    assert path == [start] + PATH[1:]
+    assert (cache.hits_, cache.misses_) == (1, 0)
+
+def test_blocked_path_is_not_reused():
+    cache = PathCache()
+    key = cache.key(PATH[0], PATH[-1], ('list', 0))
+    cache.put(key, PATH)
+    # e.g. rover standing on the cached path
+    checker = CollisionChecker([(-1.5, 1.5, 0.3)])
+    assert cache.get(key, PATH[0], PATH[-1], checker, 0.2) is None
+    assert (cache.hits_, cache.misses_) == (0, 1)
+
+def test_least_recently_used_path_is_evicted():
+    cache = PathCache(capacity=2)
+    keys = [cache.key([i, 0], [i, 1], ('list', 0)) for i in range(3)]
+    cache.put(keys[0], [[0, 0], [0, 1]])
+    cache.put(keys[1], [[1, 0], [1, 1]])
+    assert cache.get(keys[0], [0, 0], [0, 1], CollisionChecker([]), 0.2) is not None
+    cache.put(keys[2], [[2, 0], [2, 1]])
+    assert cache.get(keys[1], [1, 0], [1, 1], CollisionChecker([]), 0.2) is None
+    assert cache.get(keys[0], [0, 0], [0, 1], CollisionChecker([]), 0.2) is not None
+
+def test_counters_from_many_threads():
+    cache = PathCache()
+    key = cache.key(PATH[0], PATH[-1], ('list', 0))
+    cache.put(key, PATH)
+    checker = CollisionChecker([])
+    threads_count, queries = 8, 200
+
+    def run():
+        for i in range(queries):
+            # every other query misses
+            goal = PATH[-1] if i % 2 else [0.0, -4.0]
+            cache.get(key, PATH[0], goal, checker, 0.2)
+
+    threads = [threading.Thread(target=run) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.hits_ == cache.misses_ == threads_count * queries // 2
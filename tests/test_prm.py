@@ -0,0 +1,44 @@
+import numpy as np
+from Code.prm import Roadmap, shared_roadmap
+from Code.collision_checker import CollisionChecker
+from Code.occupancy_map import OccupancyMap
+
+"""
+Wspólny graf PRM: ścieżki bez kolizji, usuwanie węzłów przy nowych przeszkodach
+i ograniczenie rozmiaru przy dogęszczaniu.
+"""
+
+LB, UB = [-5, -5], [5, 5]
+OBSTACLES = [(0.0, 0.0, 0.75), (2.0, 2.0, 0.7)]
+
+def _roadmap(**kwargs):
+    return Roadmap(CollisionChecker(OBSTACLES), LB, UB, nodes=400, seed=0, **kwargs)
+
+def test_query_path_is_collision_free():
+    roadmap = _roadmap()
+    checker = CollisionChecker(OBSTACLES)
+    path = roadmap.query([-3, -3], [3, 3], checker)
+    assert path is not None
+    assert path[0] == [-3, -3] and path[-1] == [3, 3]
+    points = np.array(path)
+    assert not checker.segments_collide(points[:-1], points[1:]).any()
+
+def test_expand_is_capped():
+    roadmap = _roadmap(max_nodes=500)
+    for _ in range(10):
+        roadmap.expand(100)
+    assert len(roadmap.coords_) <= 500
+    assert roadmap.expand(100) is False
+
+def test_new_map_obstacle_removes_nodes():
+    occupancy_map = OccupancyMap(OBSTACLES, LB, UB)
+    config = {'map_size_lb': LB, 'map_size_ub': UB, 'prm_nodes': 800, 'prm_seed': 0}
+    roadmap = shared_roadmap(occupancy_map, config)
+    occupancy_map.add_obstacle(-3, 3, 0.7)
+    assert shared_roadmap(occupancy_map, config) is roadmap
+    inside = np.hypot(roadmap.coords_[:, 0] + 3, roadmap.coords_[:, 1] - 3) <= 0.7
+    assert not roadmap.alive_[inside].any()
+    # nodes sampled later are checked against current map (MapChecker rebuilt on map change)
+    roadmap.expand(2000)
+    inside = np.hypot(roadmap.coords_[:, 0] + 3, roadmap.coords_[:, 1] - 3) <= 0.7
+    assert not roadmap.alive_[inside].any()
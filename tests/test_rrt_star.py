@@ -0,0 +1,31 @@
+import random
+import numpy as np
+import pytest
+from Code.rrt_star import load_config, create_planner, plan_with_retries
+from Code.collision_checker import CollisionChecker
+
+"""
+Planery RRT* (backend node i array): zwrócona ścieżka nie może przecinać przeszkód.
+"""
+
+# small obstacle between start and goal, goal reachable in few steps
+OBSTACLES = [(0.0, 0.0, 0.04)]
+START, GOAL = [-1.0, 0.0], [0.1, 0.0]
+
+def _planner(backend):
+    config = dict(load_config(), backend=backend, sampling_seed=None)
+    return create_planner(None, START, GOAL, OBSTACLES, config)
+
+def _segments_free(path, obstacles):
+    points = np.array(path, dtype=float)
+    return not CollisionChecker(obstacles).segments_collide(points[:-1], points[1:]).any()
+
+@pytest.mark.parametrize('backend', ['node', 'array'])
+def test_path_does_not_cross_obstacle(backend):
+    random.seed(0)
+    np.random.seed(0)
+    planner = _planner(backend)
+    for _ in range(50):
+        path = plan_with_retries(planner, START, GOAL, OBSTACLES, retries=3)
+        if path is not None:
+            assert _segments_free(path, OBSTACLES)
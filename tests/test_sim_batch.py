@@ -0,0 +1,41 @@
+from Code.mock_sim import MockSim
+from Code.sim_batch import SimBatch
+
+"""
+SimBatch: obiekt pomocniczy MiskBatch nie zostaje w scenie, a operacje bez skryptu
+są wysyłane pojedynczo.
+"""
+
+class ScriptSim(MockSim):
+    # script as object parented to dummy, like CoppeliaSim 4.6+
+    def createScript(self, script_type, code):
+        return self._create("Script", 'script')
+
+def _aliases(sim):
+    return [sim.getObjectAlias(handle) for handle in sim.getObjectsInTree(sim.handle_scene)]
+
+def test_helper_removed_on_uninstall():
+    sim = ScriptSim()
+    batch = SimBatch(sim)
+    assert batch.install()
+    assert SimBatch.HELPER_ALIAS in _aliases(sim)
+    batch.uninstall()
+    assert _aliases(sim) == []
+    # safe to call again, e.g. from finally after failed install
+    batch.uninstall()
+
+def test_failed_install_leaves_no_helper():
+    sim = MockSim()
+    batch = SimBatch(sim)
+    assert not batch.install()
+    assert SimBatch.HELPER_ALIAS not in _aliases(sim)
+
+def test_operations_without_script():
+    sim = MockSim()
+    batch = SimBatch(sim)
+    batch.install()
+    handle = sim.createDummy()
+    batch.set_object_position(handle, -1, [1.0, 2.0, 3.0])
+    result = batch.get_object_position(handle, -1)
+    batch.flush()
+    assert result.ready and list(result.value) == [1.0, 2.0, 3.0]
@@ -0,0 +1,49 @@
+import csv
+from Code.task_log_writer import TaskLogWriter, COLUMNS
+from Code.task_log_analysis import analyse, compare, print_comparison
+
+"""
+Analiza logu zadań: czas obsługi i czas w kolejce, starsze logi bez czasu dodania
+i porównanie z przebiegiem bez zadań.
+"""
+
+# (type, rover, enqueued, issued, completed)
+TASKS = [("visit_scan", "Rover0", 0.0, 2.0, 12.0), ("visit_scan", "Rover1", 1.0, 5.0, 10.0), ("pH_measurement", "Rover0", 4.0, 12.0, 30.0)]
+
+def _write_log(path, tasks, log_format='csv'):
+    writer = TaskLogWriter(str(path), log_format)
+    for number, (task_type, rover, enqueued, issued, completed) in enumerate(tasks):
+        writer.write(dict(zip(COLUMNS, [number, task_type, "Field1", rover, issued, completed, enqueued])))
+    writer.close()
+    return str(path)
+
+def test_service_and_queue_times(tmp_path):
+    summary = analyse(_write_log(tmp_path / "log.npz", TASKS, 'npz'))
+    assert summary['tasks'] == 3
+    assert summary['service']['visit_scan']['mean'] == 7.5
+    assert summary['queue']['visit_scan']['mean'] == 3.0
+    assert summary['queue']['pH_measurement']['p50'] == 8.0
+
+def test_log_without_enqueue_time(tmp_path):
+    # baseline scenarios and older logs have six columns
+    path = tmp_path / "Scenariusz.csv"
+    with open(path, 'w', newline='') as file:
+        rows = csv.writer(file)
+        rows.writerow(COLUMNS[:6])
+        rows.writerows([[number, task_type, "Field1", rover, issued, completed] for number, (task_type, rover, _, issued, completed) in enumerate(TASKS)])
+    baseline = analyse(str(path))
+    assert baseline['service']['all']['count'] == 3
+    assert baseline['queue']['all']['count'] == 0
+    run = analyse(_write_log(tmp_path / "log.csv", TASKS))
+    rows = {row[0]: row for row in compare(run, baseline)}
+    assert rows['queue p90 [s]'][3] is None
+    assert rows['service p90 [s]'][3] == 0.0
+
+def test_run_without_tasks_has_no_data(tmp_path, capsys):
+    baseline = analyse(_write_log(tmp_path / "base.csv", TASKS))
+    run = analyse(_write_log(tmp_path / "empty.csv", []))
+    rows = compare(run, baseline)
+    assert all(change is None and not regression for _, _, _, change, regression in rows)
+    print_comparison(run, baseline, rows)
+    output = capsys.readouterr().out
+    assert "brak danych" in output and "REGRESJA" not in output and "-100.0%" not in output
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import pytest
+from Code.task_log_writer import TaskLogWriter, COLUMNS
+from Code.task_log_analysis import read_task_log
+
+"""
+Log zadań: wiersze czekające w buforze trafiają do pliku przy zamknięciu, a gdy
+close() nie zostanie wywołane - przy wyjściu z interpretera.
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _row(number):
+    return dict(zip(COLUMNS, [number, "pH_measurement", "Field1", "Rover0", 1.0 * number, 2.0 * number, 0.5 * number]))
+
+@pytest.mark.parametrize("log_format", ["csv", "npz"])
+def test_buffered_rows_written_on_close(tmp_path, log_format):
+    path = str(tmp_path / f"log.{log_format}")
+    # no flush before close
+    writer = TaskLogWriter(path, log_format, flush_rows=1000, flush_interval=1000)
+    for number in range(3):
+        writer.write(_row(number))
+    writer.close()
+    rows = list(read_task_log(path))
+    assert [row[4:] for row in rows] == [(0.0, 0.0, 0.0), (1.0, 2.0, 0.5), (2.0, 4.0, 1.0)]
+    # rows after close are dropped, file is not broken
+    writer.write(_row(3))
+    writer.close()
+    assert len(list(read_task_log(path))) == 3
+
+@pytest.mark.parametrize("log_format", ["csv", "npz"])
+def test_rows_written_at_exit_without_close(tmp_path, log_format):
+    path = str(tmp_path / f"log.{log_format}")
+    script = (
+        "from Code.task_log_writer import TaskLogWriter, COLUMNS\n"
+        f"writer = TaskLogWriter({path!r}, {log_format!r}, flush_rows=1000, flush_interval=1000)\n"
+        "writer.write(dict(zip(COLUMNS, [1, 'visit_scan', 'Field1', 'Rover0', 1.0, 3.0, 0.5])))\n"
+        "raise SystemExit(1)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=False)
+    assert [row[4:] for row in read_task_log(path)] == [(1.0, 3.0, 0.5)]